@@ -1,5 +1,5 @@
 import uvicorn
-from fastapi import FastAPI, Request, Form, BackgroundTasks
+from fastapi import FastAPI, Request, Form, Header, Query
 from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
@@ -7,10 +7,16 @@ import os
 import logging
 import json
 import asyncio
-import time
-from queue import Queue
-from typing import Dict, List, Any, Optional, AsyncGenerator, Tuple
+import threading
+from typing import Dict, List, Any, Optional, AsyncGenerator, Iterator, Tuple
 from scraper import Scraper
+from build_store import get_build_store
+from tier_list import TierAggregate, TIER_THRESHOLDS
+from refresh_journal import RefreshJournal
+from scrape_pipeline import ScrapePipeline, DEFAULT_PARSE_PROCESSES
+from event_broadcast import EventBroadcaster, END_OF_STREAM, WAKEUP
+from log_buffer import RingBufferHandler, DEFAULT_LOG_BUFFER_SIZE
+from refresh_jobs import RefreshJob, RefreshJobManager, RefreshCancelled, STATUS_CANCELLED, STATUS_FAILED
 from contextlib import asynccontextmanager
 from item_translator import get_translator
 
@@ -21,32 +27,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create event queue for SSE
-event_queue = Queue()
-total_builds = 0
-current_build = 0
-refresh_in_progress = False
-refresh_mode: Optional[str] = None
-
-# Custom logger handler to capture logs for the web UI
-class QueueHandler(logging.Handler):
-    def __init__(self, queue):
-        super().__init__()
-        self.queue = queue
-        
-    def emit(self, record):
-        log_entry = self.format(record)
-        self.queue.put({
-            'type': 'log',
-            'message': log_entry,
-            'log_level': record.levelname.lower()
-        })
+# Broadcaster fanning refresh events out to every SSE connection
+event_broadcaster = EventBroadcaster()
+
+# Runs refreshes one at a time on a dedicated thread and keeps their status
+job_manager = RefreshJobManager()
 
-# Add queue handler to logger
-queue_handler = QueueHandler(event_queue)
-queue_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-queue_handler.setLevel(logging.WARNING)
-logger.addHandler(queue_handler)
+# Capture warnings for the web UI in a bounded ring buffer; open event
+# streams are woken up and format the records when they read them
+log_buffer_handler = RingBufferHandler(DEFAULT_LOG_BUFFER_SIZE)
+log_buffer_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+log_buffer_handler.setLevel(logging.WARNING)
+log_buffer_handler.add_listener(event_broadcaster.wake)
+logger.addHandler(log_buffer_handler)
+# Sequence number of the last captured log record before the current refresh
+refresh_log_seq = 0
 
 # Create FastAPI app
 app = FastAPI(title="Diablo 4 Build Search Tool")
@@ -57,8 +52,28 @@ os.makedirs("templates", exist_ok=True)
 # Set up templates
 templates = Jinja2Templates(directory="templates")
 
+# Load the builds dataset once; the store hot-reloads it when the file changes
+build_store = get_build_store()
+build_store.reload()
+
+# Journal of refresh progress, replayed to resume an interrupted refresh
+refresh_journal = RefreshJournal()
+
+# Number of build pages fetched concurrently during a refresh
+REFRESH_WORKERS = int(os.environ.get("REFRESH_WORKERS", "4"))
+
+# Number of processes extracting equipment during a refresh (0 extracts in threads)
+PARSE_PROCESSES = int(os.environ.get("PARSE_PROCESSES", str(DEFAULT_PARSE_PROCESSES)))
+
+# Seconds an idle SSE connection waits before a keep-alive comment
+SSE_KEEPALIVE_SECONDS = 15
+
+# Build discovery backend used by refreshes ("selenium" or "sitemap")
+DISCOVERY_BACKEND = os.environ.get("DISCOVERY_BACKEND", "selenium")
+
 # Initialize scraper
-scraper = Scraper()
+scraper = Scraper(build_store=build_store, max_workers=REFRESH_WORKERS, discovery=DISCOVERY_BACKEND,
+                  parse_processes=PARSE_PROCESSES)
 
 # Initialize item translator
 translator = get_translator()
@@ -140,15 +155,8 @@ async def view_build(request: Request, build_url: str):
     """
     logger.info(f"Viewing build details for: {build_url}")
     
-    # Load all builds
-    builds = scraper._load_builds()
-    
-    # Find the build with the matching URL
-    build = None
-    for b in builds:
-        if b["url"].endswith(build_url):
-            build = b
-            break
+    # Hash lookup by URL or slug, falling back to a suffix match for old links
+    build = build_store.snapshot().find_build(build_url)
     
     if not build:
         return templates.TemplateResponse("error.html", {
@@ -168,214 +176,556 @@ async def refresh_data_page(request: Request):
     return templates.TemplateResponse("refresh_data.html", {"request": request, "active_page": "refresh"})
 
 @app.get("/api/refresh-data")
-async def start_refresh_data(background_tasks: BackgroundTasks):
-    """Start the full data refresh process in the background."""
-    return _schedule_refresh(background_tasks, fake=False)
+async def start_refresh_data(incremental: bool = False):
+    """
+    Start the data refresh process as a background job.
+
+    Args:
+        incremental: Only fetch equipment for guides that are new or whose
+            "Last Updated" date changed; carry the rest forward.
+    """
+    return _schedule_refresh(fake=False, incremental=incremental)
 
 
 @app.get("/api/refresh-data-fake")
-async def start_fake_refresh(background_tasks: BackgroundTasks):
+async def start_fake_refresh():
     """Start the fake refresh process that mimics the real workflow."""
-    return _schedule_refresh(background_tasks, fake=True)
+    return _schedule_refresh(fake=True)
 
 
-def _schedule_refresh(background_tasks: BackgroundTasks, fake: bool) -> JSONResponse:
-    """Common logic for preparing a refresh job."""
-    global refresh_in_progress, total_builds, current_build, refresh_mode
+@app.get("/api/refresh-builds")
+async def start_partial_refresh(url: Optional[List[str]] = Query(None),
+                                build_class: Optional[str] = Query(None, alias="class")):
+    """
+    Re-scrape selected builds and merge them into the current data.
 
-    if refresh_in_progress:
-        return JSONResponse(
-            {"message": "Refresh already in progress", "in_progress": True},
-            status_code=409
-        )
+    Args:
+        url: Build URLs or slugs to re-scrape; repeat the parameter for several.
+        build_class: Re-scrape every build of this class.
+    """
+    if not url and not build_class:
+        return JSONResponse({"message": "Give at least one url or a class"}, status_code=400)
+    try:
+        builds = scraper.select_builds(build_store.snapshot(), urls=url, class_name=build_class)
+    except ValueError as exc:
+        return JSONResponse({"message": str(exc)}, status_code=400)
+    if not builds:
+        return JSONResponse({"message": f"No builds of class {build_class}"}, status_code=404)
+    return _schedule_refresh(fake=False, builds=builds)
 
-    while not event_queue.empty():
-        event_queue.get()
 
-    refresh_in_progress = True
-    total_builds = 0
-    current_build = 0
-    refresh_mode = "fake" if fake else "real"
+@app.get("/api/refresh/{job_id}")
+async def get_refresh_job(job_id: str):
+    """Return the status, progress, stage timings and ETA of a refresh job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse({"message": f"Unknown refresh job: {job_id}"}, status_code=404)
+    return JSONResponse(job.as_dict())
 
-    background_tasks.add_task(refresh_data_background, fake)
 
-    return JSONResponse({"message": "Refresh started", "mode": refresh_mode})
+@app.delete("/api/refresh/{job_id}")
+async def cancel_refresh_job(job_id: str):
+    """
+    Cancel a refresh job.
 
+    The fetch workers stop promptly and nothing is published, so the last good
+    snapshot stays in place; an interrupted real refresh resumes from its
+    journal the next time one is started. A job that is already publishing
+    its results can no longer be cancelled.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse({"message": f"Unknown refresh job: {job_id}"}, status_code=404)
+    if not job.cancel():
+        if job.finished:
+            message = "Refresh job already finished"
+        else:
+            message = "Refresh job is publishing its results and can no longer be cancelled"
+        return JSONResponse({"message": message, "job": job.as_dict()}, status_code=409)
+    return JSONResponse({"message": "Refresh cancelling", "job": job.as_dict()}, status_code=202)
+
+
+def _schedule_refresh(fake: bool, incremental: bool = False,
+                      builds: Optional[List[Dict[str, Any]]] = None) -> JSONResponse:
+    """Common logic for starting a refresh job."""
+    if fake:
+        mode = "fake"
+    elif builds is not None:
+        mode = "partial"
+    elif incremental:
+        mode = "incremental"
+    else:
+        mode = "real"
 
-def refresh_data_background(fake: bool = False):
-    """Background task to refresh the builds data."""
-    global refresh_in_progress, total_builds, current_build
+    job = job_manager.submit(
+        mode,
+        lambda job: refresh_data_background(job, fake, incremental, builds),
+        on_start=_start_refresh_events,
+        on_finish=_finish_refresh_events
+    )
+    if job is None:
+        active_job = job_manager.active_job
+        return JSONResponse(
+            {"message": "Refresh already in progress", "in_progress": True,
+             "job_id": active_job.id if active_job else None},
+            status_code=409
+        )
 
-    try:
-        mode_description = "Fake data refresh" if fake else "Data refresh"
-        logger.info("%s started", mode_description)
-        event_queue.put({
-            "type": "log",
-            "message": f"{mode_description} started",
-            "log_level": "info"
-        })
+    return JSONResponse({"message": "Refresh started", "mode": mode, "job_id": job.id})
 
-        if fake:
-            _run_fake_refresh()
-        else:
-            _run_real_refresh()
 
-    except Exception as exc:
-        logger.error("Error during refresh: %s", exc)
-        event_queue.put({"type": "error", "message": str(exc)})
-    finally:
-        refresh_in_progress = False
+def _start_refresh_events(job: RefreshJob) -> None:
+    """Open the job's event log before the start request returns, so the page's event stream follows it."""
+    global refresh_log_seq
 
+    event_broadcaster.start(job.id)
+    refresh_log_seq = log_buffer_handler.last_seq
 
-def _run_real_refresh() -> None:
-    """Execute the long-running refresh logic."""
-    global total_builds, current_build
 
-    if os.path.exists("all_builds.json"):
-        os.remove("all_builds.json")
-        logger.info("Removed existing all_builds.json file")
-        event_queue.put({
-            "type": "log",
-            "message": "Removed existing all_builds.json file",
-            "log_level": "info"
-        })
+def _finish_refresh_events(job: RefreshJob) -> None:
+    """Report how a refresh job ended and close its event stream."""
+    if job.status == STATUS_FAILED:
+        logger.error("Error during refresh: %s", job.error)
+        event_broadcaster.publish({"type": "error", "message": job.error})
+    elif job.status == STATUS_CANCELLED:
+        logger.info("Refresh job %s cancelled after %d builds", job.id, job.current)
+        event_broadcaster.publish({"type": "error", "message": "Refresh cancelled"})
+    event_broadcaster.finish()
+
 
-    logger.info("Fetching build list from MaxRoll.gg")
-    builds = scraper.get_build_list()
-    total_builds = len(builds)
-    current_build = 0
+def refresh_data_background(job: RefreshJob, fake: bool = False, incremental: bool = False,
+                            builds: Optional[List[Dict[str, Any]]] = None) -> int:
+    """
+    Run a refresh job on the job manager's executor.
 
-    event_queue.put({
+    Args:
+        job: The refresh job.
+        fake: Run the fake refresh.
+        incremental: Carry forward unchanged guides.
+        builds: Re-scrape just these builds and merge them into the current data.
+
+    Returns:
+        The number of builds in the new snapshot.
+    """
+    if fake:
+        mode_description = "Fake data refresh"
+    elif builds is not None:
+        mode_description = "Partial data refresh"
+    elif incremental:
+        mode_description = "Incremental data refresh"
+    else:
+        mode_description = "Data refresh"
+    logger.info("%s started (job %s)", mode_description, job.id)
+    event_broadcaster.publish({
         "type": "log",
-        "message": f"Found {total_builds} builds to process",
+        "message": f"{mode_description} started",
         "log_level": "info"
     })
-    event_queue.put({"type": "progress", "current": current_build, "total": total_builds})
 
-    with open("all_builds.json", "w", encoding="utf-8") as file:
-        json.dump([], file)
+    if fake:
+        return _run_fake_refresh(job)
+    if builds is not None:
+        return _run_partial_refresh(job, builds)
+    return _run_real_refresh(job, incremental)
+
+
+def _progress_event(job: RefreshJob, **extra: Any) -> Dict[str, Any]:
+    """Build a progress event from a job's counters."""
+    eta = job.eta_seconds()
+    event = {
+        "type": "progress",
+        "current": job.current,
+        "total": job.total,
+        "eta_seconds": round(eta, 1) if eta is not None else None,
+        "job_id": job.id
+    }
+    event.update(extra)
+    return event
 
-    processed_builds = []
 
-    for build_index, build in enumerate(builds, start=1):
-        build_url = build.get("url")
-        title = build.get("title", "Unknown build")
-        logger.info("Processing build %s/%s: %s", build_index, total_builds, title)
-
-        try:
-            equipment = scraper.get_build_equipment(build_url)
-            build["equipment"] = equipment
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.error("Error getting equipment for build %s: %s", title, exc)
-            event_queue.put({
+def _run_real_refresh(job: RefreshJob, incremental: bool = False) -> int:
+    """
+    Execute the long-running refresh logic.
+
+    Args:
+        job: The refresh job, which receives progress and stage timings.
+        incremental: Carry forward builds whose "Last Updated" date is unchanged
+            instead of fetching their equipment again.
+
+    Returns:
+        The number of builds published.
+
+    Raises:
+        RefreshCancelled: If the job was cancelled; nothing is published then.
+    """
+    # Finished builds are appended to the journal one line at a time;
+    # all_builds.json keeps serving the previous snapshot until the journal
+    # is compacted and published atomically at the end.
+    builds: List[Dict[str, Any]] = []
+    # URL -> index in builds, i.e. the build's position in the published dataset
+    position_by_url: Dict[str, int] = {}
+    processed_by_url: Dict[str, Dict[str, Any]] = {}
+    tier_aggregate = TierAggregate()
+    # Discovery records carried-forward builds while the writer records fetched ones
+    record_lock = threading.Lock()
+
+    def record_build(build: Dict[str, Any], journal: bool = True) -> None:
+        """Record a finished build and report progress."""
+        with record_lock:
+            processed_by_url[build.get("url")] = build
+            # Builds finish out of order; aggregate them at their place in the dataset
+            tier_aggregate.add_build(build, position_by_url.get(build.get("url")))
+            if journal:
+                refresh_journal.append(build)
+            job.current = len(processed_by_url)
+
+    def discover() -> Iterator[Dict[str, Any]]:
+        """Discovery stage of the pipeline: yield the builds that still need fetching.
+
+        Builds are yielded as the scraper discovers them, so the first pages are
+        fetched while the build list is still being scrolled; the job's total
+        grows as the list does.
+        """
+        job.start_stage("discovery")
+
+        # Resume an interrupted refresh from its journal, or start a new one
+        replayed = refresh_journal.replay()
+        if replayed is not None:
+            discovered, finished_builds, discovery_complete = replayed
+            logger.info("Resuming interrupted refresh from %s", refresh_journal.journal_file)
+            event_broadcaster.publish({
                 "type": "log",
-                "message": f"Failed to fetch equipment for {title}: {exc}",
-                "log_level": "warning"
+                "message": f"Resuming interrupted refresh: {len(finished_builds)} builds already processed",
+                "log_level": "info"
             })
-            build["equipment"] = []
-        finally:
-            current_build = build_index
-            log_message = f"Processed build {current_build}/{total_builds}: {title}"
-            event_queue.put({
-                "type": "progress",
-                "current": current_build,
-                "total": total_builds
+        else:
+            discovered, finished_builds, discovery_complete = [], [], False
+            refresh_journal.start()
+
+        seen_urls = set()
+        for build in discovered:
+            if build.get("url") not in seen_urls:
+                seen_urls.add(build.get("url"))
+                position_by_url[build.get("url")] = len(builds)
+                builds.append(build)
+        job.total = len(builds)
+        for build in finished_builds:
+            record_build(build, journal=False)
+        event_broadcaster.publish(_progress_event(job))
+
+        # Builds discovered before an interruption come first
+        for build in list(builds):
+            if build.get("url") not in processed_by_url:
+                yield build
+        if discovery_complete:
+            job.end_stage("discovery")
+            return
+
+        previous_by_url: Dict[str, Dict[str, Any]] = {}
+        if incremental:
+            previous_by_url = {build.get("url"): build for build in build_store.snapshot().builds}
+
+        logger.info("Fetching build list from MaxRoll.gg")
+        unchanged = 0
+        # Stop scrolling the listing once the job is cancelled
+        for build in scraper.iter_build_list(should_stop=lambda: job.cancel_requested):
+            if build.get("url") in seen_urls:
+                continue
+            seen_urls.add(build.get("url"))
+            position_by_url[build.get("url")] = len(builds)
+            builds.append(build)
+            job.total = len(builds)
+            refresh_journal.add_discovered(build)
+
+            carried = scraper.carry_forward_build(build, previous_by_url.get(build.get("url")))
+            if carried:
+                unchanged += 1
+                record_build(carried)
+                event_broadcaster.publish(_progress_event(job))
+                continue
+            event_broadcaster.publish(_progress_event(job))
+            yield build
+
+        if job.cancel_requested:
+            # Discovery was cut short; the next refresh resumes it from the journal
+            return
+        refresh_journal.finish_discovery()
+        job.end_stage("discovery")
+        event_broadcaster.publish({
+            "type": "log",
+            "message": f"Found {job.total} builds to process",
+            "log_level": "info"
+        })
+        if incremental:
+            event_broadcaster.publish({
+                "type": "log",
+                "message": f"{unchanged} builds unchanged since the last refresh",
+                "log_level": "info"
             })
-            event_queue.put({"type": "log", "message": log_message, "log_level": "info"})
 
-            processed_builds.append(build)
-            with open("all_builds.json", "w", encoding="utf-8") as file:
-                json.dump(processed_builds, file, indent=2)
+    def on_build_done(build: Dict[str, Any], error: Optional[Exception]) -> None:
+        """Writer stage of the pipeline: record a finished build."""
+        title = build.get("title", "Unknown build")
+        if error is not None:
+            _report_fetch_error(build, error)
 
-            time.sleep(1)
+        record_build(build)
+        job.fetched += 1
+        event_broadcaster.publish(_progress_event(job, stages=pipeline.stats.as_dict()))
+        event_broadcaster.publish({
+            "type": "log",
+            "message": f"Processed build {job.current}/{job.total}: {title}",
+            "log_level": "info"
+        })
 
-    event_queue.put({
+    # Discovery, fetching, parsing and writing run as concurrent pipeline
+    # stages; the scraper's shared rate limiter keeps the request rate polite
+    pipeline = ScrapePipeline(scraper, on_result=on_build_done)
+    # Cancelling the job stops the pipeline's workers between pages
+    job.on_cancel(pipeline.cancel)
+    job.start_stage("fetch")
+    pipeline.run_sync(discover)
+    job.end_stage("fetch")
+
+    if pipeline.cancelled:
+        # Keep the journal so the next refresh resumes where this one stopped
+        logger.info("Data refresh cancelled after %d builds", pipeline.stats.written)
+        event_broadcaster.publish({"type": "log", "message": "Data refresh cancelled", "log_level": "warning"})
+        raise RefreshCancelled(f"Refresh job {job.id} was cancelled")
+
+    event_broadcaster.publish({
         "type": "log",
         "message": "Completed fetching equipment data for all builds",
         "log_level": "info"
     })
 
-    with open("all_builds.json", "w", encoding="utf-8") as file:
-        json.dump(processed_builds, file, indent=2)
+    # Compact the journal into the final snapshot, in discovery order; from
+    # here on the job can no longer be cancelled
+    job.begin_publish()
+    job.start_stage("publish")
+    processed_builds = [processed_by_url[build.get("url")] for build in builds
+                        if build.get("url") in processed_by_url]
+    if len(processed_builds) != len(processed_by_url) or len(processed_builds) != len(builds):
+        # Positions only match the published list when every discovered build was recorded
+        tier_aggregate = TierAggregate(processed_builds)
+    build_store.publish(processed_builds, tier_aggregate)
+    refresh_journal.discard()
+    job.end_stage("publish")
 
     logger.info("Data refresh completed successfully. Found %s builds.", len(processed_builds))
-    event_queue.put({"type": "completed", "build_count": len(processed_builds)})
+    event_broadcaster.publish({"type": "completed", "build_count": len(processed_builds)})
+    return len(processed_builds)
 
 
-def _run_fake_refresh(total_steps: int = 20, delay_seconds: float = 1.0) -> None:
-    """Run a lightweight fake refresh for UI validation."""
-    global total_builds, current_build
+def _report_fetch_error(build: Dict[str, Any], error: Exception) -> None:
+    """Publish a failed fetch, keeping the build's equipment from the current data if it has any."""
+    message = f"Failed to fetch equipment for {build.get('title', 'Unknown build')}: {error}"
+    if scraper.keep_previous_equipment(build, build_store.snapshot().find_build(build.get("url"))):
+        message += " (keeping the equipment from the previous refresh)"
+    event_broadcaster.publish({"type": "log", "message": message, "log_level": "warning"})
+
+
+def _run_partial_refresh(job: RefreshJob, builds: List[Dict[str, Any]]) -> int:
+    """
+    Re-scrape selected builds and merge them into the current snapshot.
+
+    The journal is left alone, so an interrupted full refresh can still resume.
+
+    Args:
+        job: The refresh job, which receives progress and stage timings.
+        builds: The builds to re-scrape, as picked by Scraper.select_builds.
+
+    Returns:
+        The number of builds in the merged snapshot.
 
-    total_builds = total_steps
-    current_build = 0
+    Raises:
+        RefreshCancelled: If the job was cancelled; nothing is merged then.
+    """
+    job.total = len(builds)
+    event_broadcaster.publish(_progress_event(job))
+
+    def on_build_done(build: Dict[str, Any], error: Optional[Exception]) -> None:
+        """Writer stage of the pipeline: report a finished build."""
+        if error is not None:
+            _report_fetch_error(build, error)
+        job.current = job.fetched = job.fetched + 1
+        event_broadcaster.publish(_progress_event(job, stages=pipeline.stats.as_dict()))
+        event_broadcaster.publish({
+            "type": "log",
+            "message": f"Processed build {job.current}/{job.total}: {build.get('title', 'Unknown build')}",
+            "log_level": "info"
+        })
+
+    pipeline = ScrapePipeline(scraper, on_result=on_build_done)
+    job.on_cancel(pipeline.cancel)
+    job.start_stage("fetch")
+    pipeline.run_sync(lambda: builds)
+    job.end_stage("fetch")
+
+    if pipeline.cancelled:
+        event_broadcaster.publish({"type": "log", "message": "Partial data refresh cancelled", "log_level": "warning"})
+        raise RefreshCancelled(f"Refresh job {job.id} was cancelled")
+
+    # Replace just these builds; the index and tier aggregate are updated, not rebuilt
+    job.begin_publish()
+    job.start_stage("publish")
+    snapshot = build_store.merge(builds)
+    job.end_stage("publish")
 
-    event_queue.put({
+    logger.info("Partial data refresh completed. Re-scraped %d builds.", len(builds))
+    event_broadcaster.publish({"type": "completed", "build_count": len(snapshot)})
+    return len(snapshot)
+
+
+def _run_fake_refresh(job: RefreshJob, total_steps: int = 20, delay_seconds: float = 1.0) -> int:
+    """Run a lightweight fake refresh for UI validation."""
+    job.total = total_steps
+
+    event_broadcaster.publish({
         "type": "log",
         "message": f"Preparing {total_steps} fake builds for testing",
         "log_level": "info"
     })
-    event_queue.put({"type": "progress", "current": current_build, "total": total_builds})
+    event_broadcaster.publish(_progress_event(job))
 
     fake_builds = []
 
+    job.start_stage("fetch")
     for step in range(1, total_steps + 1):
-        time.sleep(delay_seconds)
-        current_build = step
+        # Wait for the next step, waking up at once if the job is cancelled
+        if job.wait_cancelled(delay_seconds):
+            job.check_cancelled()
+        job.current = job.fetched = step
         fake_title = f"Fake Build #{step}"
         fake_builds.append({"title": fake_title, "url": f"https://example.com/fake/{step}", "equipment": []})
 
-        event_queue.put({
-            "type": "progress",
-            "current": current_build,
-            "total": total_builds
-        })
-        event_queue.put({
+        event_broadcaster.publish(_progress_event(job))
+        event_broadcaster.publish({
             "type": "log",
             "message": f"Simulated progress for {fake_title}",
             "log_level": "info"
         })
+    job.end_stage("fetch")
 
-    event_queue.put({
+    event_broadcaster.publish({
         "type": "log",
         "message": "Fake refresh completed successfully",
         "log_level": "info"
     })
-    event_queue.put({"type": "completed", "build_count": len(fake_builds)})
+    event_broadcaster.publish({"type": "completed", "build_count": len(fake_builds)})
+    return len(fake_builds)
+
+def _parse_last_event_id(last_event_id: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Split a Last-Event-ID into its cursors.
+
+    Args:
+        last_event_id: The header value, "<event id>:<log sequence number>".
+
+    Returns:
+        A tuple of (event id, log sequence number), each None if missing or invalid.
+    """
+    if not last_event_id:
+        return None, None
+    parts = last_event_id.strip().split(":")
+    cursors = [int(part) if part.isdigit() else None for part in parts[:2]]
+    return cursors[0], cursors[1] if len(cursors) > 1 else None
+
 
 @app.get("/api/refresh-events")
-async def refresh_events():
-    """Server-sent events endpoint for refresh progress."""
+async def refresh_events(last_event_id: Optional[str] = Header(None),
+                         resume_id: Optional[str] = Query(None, alias="last_event_id")):
+    """
+    Server-sent events endpoint for refresh progress.
+
+    Event ids are "<event id>:<log sequence number>", the positions in the refresh
+    event log and in the captured log records.
+
+    Args:
+        last_event_id: The Last-Event-ID header a reconnecting EventSource sends;
+            only the events and log records after it are replayed.
+        resume_id: The same as a query parameter, for a page that opens a new
+            EventSource after the browser gave up reconnecting.
+    """
+    resume_from, log_cursor = _parse_last_event_id(last_event_id or resume_id)
+    if log_cursor is None or log_cursor > log_buffer_handler.last_seq:
+        # New connection, or a cursor from before a server restart
+        log_cursor = refresh_log_seq
+
     async def event_generator():
-        # Send an initial event to establish the connection
-        initial_event = {'type': 'log', 'message': 'Connected to event stream', 'log_level': 'info'}
-        yield f"data: {json.dumps(initial_event)}\n\n"
-
-        progress_event = {'type': 'progress', 'current': current_build, 'total': total_builds}
-        yield f"data: {json.dumps(progress_event)}\n\n"
-
-        while True:
-            try:
-                # If there are events in the queue, yield them
-                if not event_queue.empty():
-                    event = event_queue.get()
-                    yield f"data: {json.dumps(event)}\n\n"
-
-                # If refresh is not in progress and queue is empty, end the stream
-                elif not refresh_in_progress and event_queue.empty():
-                    final_event = {'type': 'log', 'message': 'Refresh process completed', 'log_level': 'info'}
-                    yield f"data: {json.dumps(final_event)}\n\n"
+        nonlocal log_cursor
+        event_cursor = resume_from or 0
+
+        if resume_from is None:
+            # Send an initial event to establish the connection
+            initial_event = {'type': 'log', 'message': 'Connected to event stream', 'log_level': 'info'}
+            yield f"data: {json.dumps(initial_event)}\n\n"
+
+            latest_job = job_manager.latest_job
+            if latest_job is not None:
+                progress_event = _progress_event(latest_job)
+            else:
+                progress_event = {'type': 'progress', 'current': 0, 'total': 0}
+            yield f"data: {json.dumps(progress_event)}\n\n"
+
+        with event_broadcaster.subscribe(resume_from) as subscription:
+            if subscription.missed:
+                missed_event = {
+                    'type': 'log',
+                    'message': 'Some earlier refresh events are no longer available',
+                    'log_level': 'warning'
+                }
+                yield f"data: {json.dumps(missed_event)}\n\n"
+
+            dropped = 0
+            item = WAKEUP
+            while True:
+                try:
+                    # Captured log records are formatted only now that they are read
+                    log_events, missed_logs = log_buffer_handler.read(log_cursor)
+                    if missed_logs:
+                        missed_event = {
+                            'type': 'log',
+                            'message': f'{missed_logs} log messages were dropped',
+                            'log_level': 'warning'
+                        }
+                        yield f"data: {json.dumps(missed_event)}\n\n"
+                    for log_cursor, log_event in log_events:
+                        yield f"id: {event_cursor}:{log_cursor}\ndata: {json.dumps(log_event)}\n\n"
+
+                    if subscription.dropped > dropped:
+                        warning_event = {
+                            'type': 'log',
+                            'message': f'{subscription.dropped - dropped} events were skipped because the connection fell behind',
+                            'log_level': 'warning'
+                        }
+                        dropped = subscription.dropped
+                        yield f"data: {json.dumps(warning_event)}\n\n"
+
+                    # The refresh finished and every event has been sent: end the stream
+                    if item is END_OF_STREAM:
+                        final_event = {'type': 'log', 'message': 'Refresh process completed', 'log_level': 'info'}
+                        yield f"data: {json.dumps(final_event)}\n\n"
+                        break
+
+                    if item is not WAKEUP:
+                        # The id lets a reconnecting EventSource resume with Last-Event-ID
+                        event_cursor, event = item
+                        yield f"id: {event_cursor}:{log_cursor}\ndata: {json.dumps(event)}\n\n"
+
+                    # Events are pushed as soon as they are published; only an idle
+                    # connection gets a keep-alive comment
+                    try:
+                        item = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        item = WAKEUP
+                        yield ": keep-alive\n\n"
+                except Exception as e:
+                    logger.error(f"Error in event stream: {e}")
+                    error_event = {'type': 'error', 'message': f'Error in event stream: {str(e)}', 'log_level': 'error'}
+                    yield f"data: {json.dumps(error_event)}\n\n"
                     break
 
-                # Otherwise, send a keep-alive comment and wait a bit
-                else:
-                    yield ": keep-alive\n\n"
-                    await asyncio.sleep(1)
-            except Exception as e:
-                logger.error(f"Error in event stream: {e}")
-                error_event = {'type': 'error', 'message': f'Error in event stream: {str(e)}', 'log_level': 'error'}
-                yield f"data: {json.dumps(error_event)}\n\n"
-                break
-
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
@@ -393,95 +743,15 @@ async def tier_list(request: Request):
     """
     logger.info("Generating equipment tier list")
     
-    # Load all builds
-    builds = scraper._load_builds()
-    
-    # Count how many builds use each equipment item
-    equipment_counts = {}
-    equipment_details = {}
-    
-    for build in builds:
-        for item in build.get('equipment', []):
-            item_name = item.get('name', '').strip()
-            if not item_name or item_name == 'Unknown':
-                continue
-                
-            # Only count unique/legendary items
-            if not item.get('is_unique', False) and not 'unique' in item.get('type', '').lower():
-                continue
-                
-            if item_name not in equipment_counts:
-                equipment_counts[item_name] = 0
-                equipment_details[item_name] = {
-                    'name': item_name,
-                    'type': item.get('type', 'Unknown'),
-                    'category': item.get('category', 'Unknown'),
-                    'description': item.get('description', ''),
-                    'is_unique': item.get('is_unique', False),
-                    'builds': []
-                }
-            
-            equipment_counts[item_name] += 1
-            
-            # Add build to the list if not already there
-            build_info = {
-                'title': build.get('title', ''),
-                'url': build.get('url', ''),
-                'class': build.get('class', 'Unknown')
-            }
-            
-            if build_info not in equipment_details[item_name]['builds']:
-                equipment_details[item_name]['builds'].append(build_info)
-    
-    # Sort equipment by count (descending)
-    sorted_equipment = sorted(
-        [(name, count, equipment_details[name]) for name, count in equipment_counts.items()],
-        key=lambda x: x[1],
-        reverse=True
-    )
-    
-    # Define tier thresholds
-    tier_thresholds = {
-        'S': 30,  # Items used in 30+ builds
-        'A': 20,  # Items used in 20-29 builds
-        'B': 10,  # Items used in 10-19 builds
-        'C': 5,   # Items used in 5-9 builds
-        'D': 1    # Items used in 1-4 builds
-    }
-    
-    # Group equipment by tiers
-    tiers = {
-        'S': [],
-        'A': [],
-        'B': [],
-        'C': [],
-        'D': []
-    }
-    
-    for name, count, details in sorted_equipment:
-        if count >= tier_thresholds['S']:
-            tier = 'S'
-        elif count >= tier_thresholds['A']:
-            tier = 'A'
-        elif count >= tier_thresholds['B']:
-            tier = 'B'
-        elif count >= tier_thresholds['C']:
-            tier = 'C'
-        else:
-            tier = 'D'
-        
-        tiers[tier].append({
-            'name': name,
-            'count': count,
-            'details': details
-        })
+    # The aggregate is computed once per dataset version; just render it
+    aggregate = build_store.snapshot().tier_aggregate
     
     # Return the template response with the tier list
     return templates.TemplateResponse("tier_list.html", {
         "request": request,
-        "tiers": tiers,
-        "tier_thresholds": tier_thresholds,
-        "total_items": len(sorted_equipment),
+        "tiers": aggregate.tiers(),
+        "tier_thresholds": TIER_THRESHOLDS,
+        "total_items": aggregate.total_items,
         "active_page": "tier-list"
     })
 
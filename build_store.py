@@ -0,0 +1,322 @@
+"""
+In-memory build dataset store.
+
+This module keeps the parsed contents of all_builds.json resident in memory
+so request handlers do not have to re-read and re-parse the whole file on
+every hit. The file is only parsed again when its modification time or size
+changes, or when a refresh explicitly asks for a reload.
+
+New datasets are written to a temporary file and moved into place with an
+atomic rename, and a missing or unreadable file never replaces a snapshot
+that loaded successfully, so readers always see a complete dataset. A
+partial refresh merges re-scraped builds into the current dataset instead of
+replacing it.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from equipment_index import EquipmentIndex
+from tier_list import TierAggregate
+
+logger = logging.getLogger(__name__)
+
+BUILDS_FILE = "all_builds.json"
+
+
+def build_slug(url: str) -> str:
+    """Return the last path segment of a build URL, e.g. 'penetrating-shot-rogue-guide'."""
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write JSON data to a file via a temporary file and an atomic rename.
+
+    Args:
+        path: Destination file path.
+        data: JSON-serializable data to write.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class BuildSnapshot:
+    """An immutable view of one version of the build dataset."""
+
+    def __init__(self, builds: List[Dict[str, Any]], version: int,
+                 signature: Optional[Tuple[float, int]] = None, loaded: bool = True,
+                 tier_aggregate: Optional[TierAggregate] = None,
+                 equipment_index: Optional[EquipmentIndex] = None):
+        """
+        Create a snapshot.
+
+        Args:
+            builds: The build dictionaries making up this dataset version.
+            version: Monotonically increasing dataset version number.
+            signature: (mtime, size) of the file the builds were read from,
+                or None if the file did not exist.
+            loaded: Whether the builds were successfully parsed from the file.
+            tier_aggregate: An aggregate already maintained for exactly these builds,
+                e.g. by a refresh. Computed from the builds when omitted.
+            equipment_index: An index already maintained for exactly these builds,
+                e.g. derived from the previous snapshot by a merge. Built from the
+                builds when omitted.
+        """
+        self._builds = tuple(builds)
+        self._version = version
+        self._signature = signature
+        self._loaded = loaded and signature is not None
+        self._loaded_at = time.time()
+        self._equipment_index = equipment_index or EquipmentIndex(self._builds)
+        self._tier_aggregate = tier_aggregate or TierAggregate(self._builds)
+        self._tier_aggregate.tiers()
+
+        # Full URL and slug lookups for the build detail page; the first build wins on collisions
+        self._by_url: Dict[str, Dict[str, Any]] = {}
+        self._by_slug: Dict[str, Dict[str, Any]] = {}
+        for build in self._builds:
+            url = build.get("url", "")
+            self._by_url.setdefault(url, build)
+            self._by_slug.setdefault(build_slug(url), build)
+
+    @property
+    def builds(self) -> Tuple[Dict[str, Any], ...]:
+        """The builds in this snapshot. Callers must treat them as read-only."""
+        return self._builds
+
+    @property
+    def version(self) -> int:
+        """The dataset version number of this snapshot."""
+        return self._version
+
+    @property
+    def equipment_index(self) -> EquipmentIndex:
+        """Inverted equipment-name index built for this dataset version."""
+        return self._equipment_index
+
+    @property
+    def tier_aggregate(self) -> TierAggregate:
+        """Equipment tier list aggregate for this dataset version."""
+        return self._tier_aggregate
+
+    def find_build(self, build_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a build by its full URL or slug.
+
+        Args:
+            build_url: A full build URL, its slug (last path segment), or any URL suffix.
+
+        Returns:
+            The matching build, or None if no build matches.
+        """
+        build = self._by_url.get(build_url) or self._by_slug.get(build_slug(build_url))
+        if build is not None and build.get("url", "").endswith(build_url):
+            return build
+
+        # Fall back to the historical suffix match so older links keep working
+        for build in self._builds:
+            if build["url"].endswith(build_url):
+                return build
+        return None
+
+    @property
+    def signature(self) -> Optional[Tuple[float, int]]:
+        """The (mtime, size) of the backing file when this snapshot was loaded."""
+        return self._signature
+
+    @property
+    def loaded_at(self) -> float:
+        """Unix timestamp of when this snapshot was created."""
+        return self._loaded_at
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether this snapshot was loaded from an existing builds file."""
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._builds)
+
+
+class BuildStore:
+    """Process-wide holder of the current build snapshot with hot reload."""
+
+    def __init__(self, builds_file: str = BUILDS_FILE):
+        """
+        Initialize the store. Nothing is read until the first snapshot request.
+
+        Args:
+            builds_file: Path to the JSON file containing the builds data.
+        """
+        self.builds_file = builds_file
+        self._lock = threading.Lock()
+        self._snapshot: Optional[BuildSnapshot] = None
+        self._version = 0
+        # Signature of a file state that failed to load while a good snapshot was
+        # being served; a missing file (None) is rejected from the start.
+        self._rejected_signature: Optional[Tuple[float, int]] = None
+
+    def _file_signature(self) -> Optional[Tuple[float, int]]:
+        """Return the (mtime, size) of the builds file, or None if it is missing."""
+        try:
+            stat = os.stat(self.builds_file)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def snapshot(self) -> BuildSnapshot:
+        """
+        Get the current snapshot, reloading it if the builds file changed.
+
+        Returns:
+            The current BuildSnapshot.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_current(snapshot, self._file_signature()):
+            return snapshot
+        return self.reload()
+
+    def _is_current(self, snapshot: BuildSnapshot, signature: Optional[Tuple[float, int]]) -> bool:
+        """Whether the given file signature needs no reload of the snapshot."""
+        if snapshot.signature == signature:
+            return True
+        return snapshot.is_loaded and signature == self._rejected_signature
+
+    def reload(self, force: bool = False) -> BuildSnapshot:
+        """
+        Re-read the builds file if it changed since the last load.
+
+        Args:
+            force: Re-parse the file even if its mtime and size are unchanged.
+
+        Returns:
+            The current BuildSnapshot after the reload.
+        """
+        with self._lock:
+            signature = self._file_signature()
+            current = self._snapshot
+            if current is not None and not force and self._is_current(current, signature):
+                return current
+
+            builds: List[Dict[str, Any]] = []
+            loaded = False
+            if signature is not None:
+                try:
+                    with open(self.builds_file, "r", encoding="utf-8") as f:
+                        builds = json.load(f)
+                    loaded = True
+                except (OSError, json.JSONDecodeError) as exc:
+                    logger.warning("Could not load %s: %s", self.builds_file, exc)
+
+            if not loaded and current is not None and current.is_loaded:
+                # Keep serving the last complete dataset
+                logger.warning(
+                    "Keeping previous builds snapshot (version %d)", current.version
+                )
+                self._rejected_signature = signature
+                return current
+
+            self._version += 1
+            self._snapshot = BuildSnapshot(builds, self._version, signature, loaded)
+            logger.info(
+                "Loaded %d builds from %s (version %d)",
+                len(builds), self.builds_file, self._version
+            )
+            return self._snapshot
+
+    def publish(self, builds: List[Dict[str, Any]],
+                tier_aggregate: Optional[TierAggregate] = None) -> BuildSnapshot:
+        """
+        Atomically replace the builds file and make it the current snapshot.
+
+        The data is written to a temporary file next to the builds file and
+        renamed over it, so the file is never observed missing or half-written.
+
+        Args:
+            builds: The complete list of builds to publish.
+            tier_aggregate: Tier aggregate maintained incrementally for these builds.
+
+        Returns:
+            The newly published BuildSnapshot.
+        """
+        with self._lock:
+            write_json_atomic(self.builds_file, builds)
+
+            self._version += 1
+            self._snapshot = BuildSnapshot(
+                builds, self._version, self._file_signature(), True, tier_aggregate
+            )
+            logger.info("Published %d builds (version %d)", len(builds), self._version)
+            return self._snapshot
+
+    def merge(self, builds: List[Dict[str, Any]]) -> BuildSnapshot:
+        """
+        Merge re-scraped builds into the current dataset and publish the result.
+
+        A build replaces the one with the same URL in place; builds with new URLs
+        are appended. The equipment index and tier aggregate are derived from the
+        current snapshot's by replacing just these builds instead of being rebuilt.
+
+        Args:
+            builds: The re-scraped builds.
+
+        Returns:
+            The newly published BuildSnapshot.
+        """
+        # Pick up changes to the file before merging into it
+        self.snapshot()
+        with self._lock:
+            current = self._snapshot
+            merged = list(current.builds)
+            position_by_url = {build.get("url"): position for position, build in enumerate(merged)}
+
+            # Position in the dataset -> the build's new version
+            changes: Dict[int, Dict[str, Any]] = {}
+            for build in builds:
+                position = position_by_url.get(build.get("url"))
+                if position is None:
+                    position = position_by_url[build.get("url")] = len(merged)
+                    merged.append(build)
+                merged[position] = build
+                changes[position] = build
+            replaced = [current.builds[position] for position in changes if position < len(current)]
+
+            write_json_atomic(self.builds_file, merged)
+
+            self._version += 1
+            self._snapshot = BuildSnapshot(
+                merged, self._version, self._file_signature(), True,
+                current.tier_aggregate.updated(replaced, changes),
+                current.equipment_index.updated(changes)
+            )
+            logger.info(
+                "Merged %d builds (%d new) into %d builds (version %d)",
+                len(changes), len(changes) - len(replaced), len(merged), self._version
+            )
+            return self._snapshot
+
+
+# Global singleton instance
+_store_instance: BuildStore = None
+
+
+def get_build_store() -> BuildStore:
+    """
+    Get the global BuildStore instance (singleton pattern).
+
+    Returns:
+        The global BuildStore instance.
+    """
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = BuildStore()
+    return _store_instance
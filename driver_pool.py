@@ -0,0 +1,155 @@
+"""
+Pool of reusable Selenium WebDrivers.
+
+Starting headless Chrome is by far the most expensive part of loading a
+guide page, so the scraper keeps a small pool of warm drivers. A driver is
+reset between pages (cookies, storage, about:blank) and recycled after a
+number of pages or once its page's JavaScript heap grows past a threshold.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Defaults for how long a driver may live before it is replaced
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_PAGES = 25
+DEFAULT_MAX_MEMORY_MB = 512
+
+
+class DriverPool:
+    """Hands out warm WebDrivers and recycles them after use."""
+
+    def __init__(self, factory: Callable[[], Any], max_size: int = DEFAULT_POOL_SIZE,
+                 max_pages: int = DEFAULT_MAX_PAGES, max_memory_mb: int = DEFAULT_MAX_MEMORY_MB):
+        """
+        Initialize the pool. Drivers are created lazily on first use.
+
+        Args:
+            factory: Callable that creates a new WebDriver, returning None on failure.
+            max_size: Maximum number of drivers alive at the same time.
+            max_pages: Number of pages a driver may load before it is recycled.
+            max_memory_mb: JavaScript heap size (in MB) above which a driver is recycled.
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: List[Any] = []
+        # id(driver) -> [pages loaded, pool generation the driver belongs to]
+        self._driver_stats: Dict[int, List[int]] = {}
+        self._generation = 0
+
+    def acquire(self) -> Any:
+        """
+        Take a driver from the pool, creating one if no warm driver is idle.
+
+        Blocks while `max_size` drivers are already in use.
+
+        Returns:
+            A WebDriver instance.
+        """
+        self._slots.acquire()
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+
+        if driver is None:
+            driver = self.factory()
+            if driver is None:
+                self._slots.release()
+                raise RuntimeError("Failed to initialize Selenium WebDriver")
+            with self._lock:
+                self._driver_stats[id(driver)] = [0, self._generation]
+        return driver
+
+    def release(self, driver: Any, discard: bool = False) -> None:
+        """
+        Return a driver to the pool after loading one page with it.
+
+        Args:
+            driver: The driver obtained from acquire().
+            discard: Quit the driver instead of reusing it, e.g. after an error.
+        """
+        try:
+            with self._lock:
+                stats = self._driver_stats.setdefault(id(driver), [0, self._generation])
+                stats[0] += 1
+                pages = stats[0]
+                stale = stats[1] != self._generation
+
+            if stale or discard or pages >= self.max_pages or self._over_memory_limit(driver):
+                self._quit(driver)
+                return
+
+            if not self._reset(driver):
+                self._quit(driver)
+                return
+
+            with self._lock:
+                stale = self._driver_stats[id(driver)][1] != self._generation
+                if not stale:
+                    self._idle.append(driver)
+            if stale:
+                self._quit(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self) -> Iterator[Any]:
+        """Context manager that acquires a driver and releases it afterwards."""
+        driver = self.acquire()
+        succeeded = False
+        try:
+            yield driver
+            succeeded = True
+        finally:
+            self.release(driver, discard=not succeeded)
+
+    def _over_memory_limit(self, driver: Any) -> bool:
+        """Whether the driver's current page uses more JavaScript heap than allowed."""
+        try:
+            used = driver.execute_script(
+                "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0"
+            )
+        except Exception as e:
+            logger.warning(f"Could not read WebDriver memory usage: {e}")
+            return False
+        return (used or 0) > self.max_memory_mb * 1024 * 1024
+
+    def _reset(self, driver: Any) -> bool:
+        """Clear cookies and storage and park the driver on about:blank."""
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.warning(f"Error resetting WebDriver, recycling it: {e}")
+            return False
+
+    def _quit(self, driver: Any) -> None:
+        """Quit a driver and forget its bookkeeping."""
+        with self._lock:
+            self._driver_stats.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error(f"Error closing WebDriver: {e}")
+
+    def close(self) -> None:
+        """
+        Tear down the pool by quitting all idle drivers.
+
+        Drivers still in use are quit when they are released. The pool can be
+        used again afterwards and will start fresh drivers.
+        """
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
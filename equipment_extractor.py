@@ -0,0 +1,412 @@
+"""
+Equipment extraction from build guide HTML.
+
+The extractor walks the parsed page once and classifies every section
+heading it meets (direct "Great Uniques for this build" markers, Great
+Uniques headings, Legendaries & Uniques headings and generic gear headings)
+instead of scanning the whole tree again for every kind of section. Only
+the short runs of siblings that follow a heading are visited afterwards.
+
+The functions here are plain module-level functions operating on strings so
+they can also run in worker processes.
+"""
+
+import bisect
+import logging
+import re
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
+
+from item_matcher import ItemMatcher, get_item_matcher
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Parser used by default. html.parser records source line numbers, which the
+# direct Great Uniques lookup relies on to find the list after its marker.
+DEFAULT_PARSER = "html.parser"
+
+# Marker text of the list of great unique items in a guide
+GREAT_UNIQUES_TEXT = "Great Uniques for this build"
+
+# Elements that delimit the container searched for the Great Uniques list
+CONTAINER_TAGS = ('article', 'section', 'div', 'body', 'html')
+
+# Keywords of the fallback equipment section headings
+EQUIPMENT_SECTION_KEYWORDS = ('gear', 'equipment', 'items', 'jackpot')
+
+INVISIBLE_CHARS_PATTERN = re.compile(r'[\u200B-\u200F\uFEFF]')
+LIST_ITEM_PATTERN = re.compile(r'(?:\d+\.\s+)?(.+)')
+NUMBERED_ITEM_PATTERN = re.compile(r'\d+\.\s+([A-Z][^\(\)\[\]\{\}\d\n]*?)(?:\s+\(|$|\s+\-)')
+FULL_ITEM_PATTERN = re.compile(r'([A-Z][a-z]+(?:\'s|\s+of|\s+the|\s+[A-Z][a-z]+){1,4})')
+CAPITALIZED_ITEM_PATTERN = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,4})')
+TRAILING_PUNCTUATION_PATTERN = re.compile(r'[\.,:;\s]+$')
+
+# Terms that look like item names but are not
+COMMON_TERMS = {"This", "The", "These", "Those", "That", "Each", "Every", "Some", "Your", "Their",
+                "Build", "Best", "Alternative", "Endgame", "Leveling", "Rock Splitter Thorns", "Thrash"}
+
+
+class _PageSections:
+    """Section headings of a page, collected in a single traversal."""
+
+    def __init__(self, root: Tag):
+        """
+        Walk the document once and classify its headings.
+
+        Args:
+            root: The parsed document.
+        """
+        # Elements whose text is exactly a "Great Uniques for this build" marker
+        self.great_uniques_markers: List[Tag] = []
+        # h3/h4/strong headings mentioning great uniques
+        self.great_uniques_headings: List[Tag] = []
+        # h2/h3 headings mentioning legendaries or uniques
+        self.priority_headings: List[Tag] = []
+        # h2/h3 headings mentioning gear, equipment, items or jackpots
+        self.equipment_headings: List[Tag] = []
+        # Ordered lists in document order, with their positions
+        self.ordered_lists: List[Tag] = []
+        self.ordered_list_positions: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+        for position, node in enumerate(root.descendants):
+            if isinstance(node, NavigableString):
+                if GREAT_UNIQUES_TEXT in node:
+                    self._add_markers(node)
+                continue
+
+            self.positions[id(node)] = position
+            name = node.name
+            if name == 'ol':
+                self.ordered_lists.append(node)
+                self.ordered_list_positions.append(position)
+            elif name in ('h2', 'h3', 'h4', 'strong'):
+                text = node.string
+                if not text:
+                    continue
+                text = text.lower()
+                if name != 'h2' and 'great uniques' in text:
+                    self.great_uniques_headings.append(node)
+                if name in ('h2', 'h3'):
+                    if 'legendaries' in text or 'uniques' in text:
+                        self.priority_headings.append(node)
+                    if any(keyword in text for keyword in EQUIPMENT_SECTION_KEYWORDS):
+                        self.equipment_headings.append(node)
+
+    def _add_markers(self, text: NavigableString) -> None:
+        """Record the elements whose .string is the given marker text, outermost first."""
+        chain = []
+        element = text.parent
+        while isinstance(element, Tag) and not isinstance(element, BeautifulSoup) and element.string is text:
+            chain.append(element)
+            element = element.parent
+        self.great_uniques_markers.extend(reversed(chain))
+
+    def first_list_after(self, marker: Tag, container: Tag) -> Optional[Tag]:
+        """
+        Find the first ordered list inside a container that follows a marker.
+
+        With line numbers available (html.parser), the list has to start on a
+        later source line than the marker; otherwise document order is used.
+
+        Args:
+            marker: The Great Uniques marker element.
+            container: The element the list must be part of.
+
+        Returns:
+            The ordered list, or None if there is none.
+        """
+        start = bisect.bisect_right(self.ordered_list_positions, self.positions[id(marker)])
+        for ol in self.ordered_lists[start:]:
+            if not _is_inside(ol, container):
+                continue
+            if marker.sourceline is not None and ol.sourceline is not None and ol.sourceline <= marker.sourceline:
+                continue
+            return ol
+        return None
+
+
+def _is_inside(element: Tag, container: Tag) -> bool:
+    """Whether an element is a descendant of the container."""
+    parent = element.parent
+    while parent is not None:
+        if parent is container:
+            return True
+        parent = parent.parent
+    return False
+
+
+def parse_page(page_source: str, parser: str = DEFAULT_PARSER, article_only: bool = False) -> BeautifulSoup:
+    """
+    Parse a build page.
+
+    Args:
+        page_source: The HTML of the build page.
+        parser: BeautifulSoup tree builder, e.g. "html.parser" or "lxml".
+        article_only: Only build the tree of the guide's <article> elements. Falls back
+            to the full page if it has none. This saves memory, not time: the whole
+            page is still tokenized, and on the benchmark pages it was slower.
+
+    Returns:
+        The parsed document.
+    """
+    if article_only:
+        soup = BeautifulSoup(page_source, parser, parse_only=SoupStrainer('article'))
+        if soup.find('article'):
+            return soup
+    return BeautifulSoup(page_source, parser)
+
+
+def extract_equipment(page_source: str, known_uniques: List[str], parser: str = DEFAULT_PARSER,
+                      article_only: bool = False) -> List[Dict[str, str]]:
+    """
+    Extract equipment information from the HTML of a build page.
+
+    Args:
+        page_source: The HTML of the build page.
+        known_uniques: List of known unique items to look for.
+        parser: BeautifulSoup tree builder, e.g. "html.parser" or "lxml".
+        article_only: Only parse the guide's <article> elements.
+
+    Returns:
+        A list of dictionaries containing equipment information.
+    """
+    soup = parse_page(page_source, parser, article_only)
+    sections = _PageSections(soup)
+    matcher = get_item_matcher(known_uniques)
+    equipment = []
+
+    # Most guides list their key items right after a "Great Uniques for this build" marker
+    if sections.great_uniques_markers:
+        logger.info(f"Found {len(sections.great_uniques_markers)} Great Uniques sections using direct search")
+
+        for section in sections.great_uniques_markers:
+            logger.info(f"Processing Great Uniques section: {section.text.strip()}")
+
+            # Find the container the marker belongs to
+            parent = section.parent
+            while parent and parent.name not in CONTAINER_TAGS:
+                parent = parent.parent
+            if not parent:
+                continue
+
+            # Only process the first ordered list after the marker
+            ol = sections.first_list_after(section, parent)
+            if ol is None:
+                continue
+            items = ol.find_all('li')
+            logger.info(f"Found ordered list with {len(items)} items")
+            for item in items:
+                _process_great_unique(item.text.strip(), equipment)
+
+    # If we didn't find any equipment using the direct approach, try the Great Uniques headings
+    if not equipment:
+        logger.info("Trying alternative approach to find Great Uniques")
+        if sections.great_uniques_headings:
+            logger.info(f"Found {len(sections.great_uniques_headings)} Great Uniques sections")
+
+        for section in sections.great_uniques_headings:
+            logger.info(f"Processing Great Uniques section: {section.text.strip()}")
+
+            # Find the next list element
+            current = section.next_sibling
+            while current and current.name not in ['ul', 'ol', 'h1', 'h2', 'h3']:
+                current = current.next_sibling
+
+            if current and current.name in ['ul', 'ol']:
+                items = current.find_all('li')
+                logger.info(f"Found list in Great Uniques section with {len(items)} items")
+                for item in items:
+                    _process_item(item.text.strip(), "Great Uniques", matcher, equipment)
+
+    # Next, the Legendaries & Uniques sections
+    if sections.priority_headings:
+        logger.info(f"Found {len(sections.priority_headings)} Legendaries & Uniques sections")
+    for section in sections.priority_headings:
+        section_title = section.text.strip()
+        logger.info(f"Processing priority section: {section_title}")
+        _process_section(section, section_title, ['h1', 'h2'], matcher, equipment)
+
+    # If we didn't find any equipment yet, look for other equipment sections
+    if not equipment:
+        logger.info("No equipment found in priority sections, looking for other equipment sections")
+        for section in sections.equipment_headings:
+            section_title = section.text.strip()
+            logger.info(f"Found equipment section: {section_title}")
+            _process_section(section, section_title, ['h1', 'h2', 'h3'], matcher, equipment)
+
+    return equipment
+
+
+def _process_section(section: Tag, section_title: str, stop_tags: List[str], matcher: ItemMatcher,
+                     equipment: List[Dict[str, str]]) -> None:
+    """
+    Process the lists and item paragraphs following a section heading.
+
+    Args:
+        section: The section heading.
+        section_title: The heading text.
+        stop_tags: Tags that end the section.
+        matcher: Matcher over the known unique items.
+        equipment: The equipment list to add to.
+    """
+    current = section.next_sibling
+    while current and current.name not in stop_tags:
+        if current.name in ['ul', 'ol']:
+            for item in current.find_all('li'):
+                _process_item(item.text.strip(), section_title, matcher, equipment)
+        elif current.name == 'p':
+            text = current.text
+            if current.find('strong') or matcher.contains_any(text):
+                _process_item(text.strip(), section_title, matcher, equipment)
+        current = current.next_sibling
+
+
+def _process_great_unique(item_text: str, equipment: List[Dict[str, str]]) -> None:
+    """
+    Add an entry of a "Great Uniques for this build" list.
+
+    Args:
+        item_text: The text of the list item, possibly numbered.
+        equipment: The equipment list to add to.
+    """
+    match = LIST_ITEM_PATTERN.match(item_text)
+    if not match:
+        return
+
+    item_name = match.group(1).strip()
+    # Remove any invisible characters that might be present
+    item_name = INVISIBLE_CHARS_PATTERN.sub('', item_name)
+
+    # Determine item type based on name
+    name_lower = item_name.lower()
+    item_type = "Unique"
+    if "rod" in name_lower:
+        item_type = "Weapon"
+    elif "harmony" in name_lower:
+        item_type = "Weapon"
+    elif "ring" in name_lower or "signet" in name_lower:
+        item_type = "Jewelry"
+    elif "mantle" in name_lower or "embrace" in name_lower:
+        item_type = "Armor"
+
+    if not any(e["name"] == item_name for e in equipment):
+        equipment.append({
+            "name": item_name,
+            "type": item_type,
+            "is_unique": True,
+            "category": "Great Uniques",
+            "description": item_text
+        })
+
+
+def process_equipment_item(item_text: str, section_title: str, known_uniques: List[str],
+                           equipment: List[Dict[str, str]]) -> None:
+    """
+    Process a potential equipment item text and add it to the equipment list if valid.
+
+    Args:
+        item_text: The text containing potential equipment information
+        section_title: The title of the section this item was found in
+        known_uniques: List of known unique items to check against
+        equipment: The equipment list to add to
+    """
+    _process_item(item_text, section_title, get_item_matcher(known_uniques), equipment)
+
+
+def _process_item(item_text: str, section_title: str, matcher: ItemMatcher,
+                  equipment: List[Dict[str, str]]) -> None:
+    """
+    Process a potential equipment item text, matching known uniques with a prebuilt matcher.
+
+    Args:
+        item_text: The text containing potential equipment information
+        section_title: The title of the section this item was found in
+        matcher: Matcher over the known unique items
+        equipment: The equipment list to add to
+    """
+    item_name = "Unknown"
+    item_type = "Unknown"
+    is_unique = False
+    text_lower = item_text.lower()
+    title_lower = section_title.lower()
+
+    # First check against the known uniques; when a line names several, the one
+    # listed earliest in the catalog wins
+    unique = matcher.first_in_catalog(item_text)
+    if unique:
+        item_name = unique
+        item_type = "Unique/Legendary"
+        is_unique = True
+    else:
+        # If we didn't find a known unique, try to extract the item name
+        # Check for numbered list format like "1. Item Name" or "1. Item Name (description)"
+        numbered_match = NUMBERED_ITEM_PATTERN.match(item_text)
+        if numbered_match:
+            item_name = numbered_match.group(1).strip()
+        else:
+            # Pattern 1: Full item name with prepositions (e.g., "Rod of Kepeleke", "Ring of the Midnight Sun")
+            full_item_match = FULL_ITEM_PATTERN.search(item_text)
+            if full_item_match:
+                item_name = full_item_match.group(1).strip()
+            else:
+                # Pattern 2: Simple capitalized item name (e.g., "Harmony of Ebewaka")
+                capitalized_match = CAPITALIZED_ITEM_PATTERN.search(item_text)
+                if capitalized_match:
+                    item_name = capitalized_match.group(1).strip()
+
+        # Clean up item name - remove trailing punctuation
+        if item_name != "Unknown":
+            item_name = TRAILING_PUNCTUATION_PATTERN.sub('', item_name)
+
+        # Try to determine item type based on context
+        if "aspect" in text_lower:
+            item_type = "Legendary Aspect"
+        elif "unique" in title_lower:
+            item_type = "Unique"
+            is_unique = True
+        elif any(weapon_type in text_lower for weapon_type in ["sword", "axe", "mace", "staff", "wand", "bow", "crossbow", "dagger", "rod"]):
+            item_type = "Weapon"
+        elif any(armor_type in text_lower for armor_type in ["helm", "chest", "gloves", "boots", "pants", "shoulders", "mantle"]):
+            item_type = "Armor"
+        elif any(jewelry_type in text_lower for jewelry_type in ["ring", "amulet", "necklace", "signet", "embrace"]):
+            item_type = "Jewelry"
+
+    # Determine category based on section title
+    if "must-have" in title_lower:
+        category = "Must Have"
+    elif "nice-to-have" in title_lower:
+        category = "Nice to Have"
+    elif "great uniques" in title_lower:
+        category = "Great Uniques"
+    elif "jackpot" in title_lower:
+        category = "Jackpot"
+    elif "build-defining" in title_lower:
+        category = "Build Defining"
+    elif "legendaries & uniques" in title_lower:
+        category = "Legendaries & Uniques"
+    else:
+        category = section_title
+
+    # Filter out common non-item terms that might be mistakenly extracted
+    if item_name in COMMON_TERMS:
+        return
+
+    # Filter out items that are too short or likely not actual items
+    if item_name != "Unknown" and len(item_name) > 3 and not item_name.startswith("In the") and not item_name.startswith("With the") and not item_name.startswith("Pit"):
+        # Check if this item is already in the equipment list to avoid duplicates
+        if not any(e["name"] == item_name for e in equipment):
+            equipment.append({
+                "name": item_name,
+                "type": item_type,
+                "is_unique": is_unique,
+                "category": category,
+                "description": item_text
+            })
@@ -0,0 +1,181 @@
+"""
+Inverted equipment index for build search.
+
+Maps normalized equipment names to the builds that use them, with a trigram
+index over the distinct names so substring queries such as "harlequin" only
+have to verify a handful of candidate names instead of every equipment entry
+of every build.
+
+A partial refresh derives the next version's index from the previous one,
+copying only the entries of the builds it replaced.
+"""
+
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+# Length of the n-grams used for substring lookups
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str) -> Set[str]:
+    """Return the set of character trigrams in a normalized string."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _item_names(build: Dict[str, Any]) -> Set[str]:
+    """Return the normalized names of a build's equipment items."""
+    return {item.get('name', '').lower() for item in build.get('equipment', [])}
+
+
+class EquipmentIndex:
+    """Substring-searchable index from equipment names to builds."""
+
+    def __init__(self, builds: Iterable[Dict[str, Any]] = ()):
+        """
+        Build the index.
+
+        Args:
+            builds: The builds to index. A build's id is its position in this sequence.
+        """
+        # normalized item name -> [(build_id, position of the item in the build's equipment)]
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        # trigram -> normalized item names containing it
+        self._ngram_index: Dict[str, Set[str]] = {}
+        self._builds: Dict[int, Dict[str, Any]] = {}
+
+        for build_id, build in enumerate(builds):
+            self.add_build(build_id, build)
+
+    def add_build(self, build_id: int, build: Dict[str, Any]) -> None:
+        """
+        Add a build's equipment to the index.
+
+        Args:
+            build_id: The id of the build within the dataset.
+            build: The build dictionary.
+        """
+        self._builds[build_id] = build
+        for position, item in enumerate(build.get('equipment', [])):
+            name = item.get('name', '').lower()
+            postings = self._postings.get(name)
+            if postings is None:
+                postings = self._postings[name] = []
+                for gram in _ngrams(name):
+                    self._ngram_index.setdefault(gram, set()).add(name)
+            postings.append((build_id, position))
+
+    def remove_build(self, build_id: int) -> None:
+        """
+        Remove a build's equipment from the index.
+
+        Args:
+            build_id: The id of the build within the dataset.
+        """
+        build = self._builds.pop(build_id, None)
+        if build is None:
+            return
+        for name in _item_names(build):
+            postings = [posting for posting in self._postings.get(name, ()) if posting[0] != build_id]
+            if postings:
+                self._postings[name] = postings
+                continue
+            self._postings.pop(name, None)
+            for gram in _ngrams(name):
+                names = self._ngram_index.get(gram)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del self._ngram_index[gram]
+
+    def updated(self, builds: Dict[int, Dict[str, Any]]) -> "EquipmentIndex":
+        """
+        Return a new index with some builds replaced or added.
+
+        Only the postings and trigram entries of those builds' items are copied;
+        everything else is shared with this index, which stays unchanged for
+        whoever is still searching it.
+
+        Args:
+            builds: Build id -> the build's new version. Ids past the end of the
+                dataset add builds.
+
+        Returns:
+            The updated index.
+        """
+        index = EquipmentIndex()
+        index._postings = dict(self._postings)
+        index._ngram_index = dict(self._ngram_index)
+        index._builds = dict(self._builds)
+
+        touched: Set[str] = set()
+        for build_id, build in builds.items():
+            touched |= _item_names(build)
+            if build_id in self._builds:
+                touched |= _item_names(self._builds[build_id])
+        for name in touched:
+            if name in self._postings:
+                index._postings[name] = list(self._postings[name])
+            for gram in _ngrams(name):
+                if gram in self._ngram_index:
+                    index._ngram_index[gram] = set(self._ngram_index[gram])
+
+        for build_id, build in builds.items():
+            index.remove_build(build_id)
+            index.add_build(build_id, build)
+        return index
+
+    def _candidate_names(self, query: str) -> Iterable[str]:
+        """Return the indexed names that could contain the normalized query."""
+        grams = _ngrams(query)
+        if not grams:
+            # Too short for trigrams; the distinct name set is still far smaller
+            # than the total number of equipment entries.
+            return self._postings.keys()
+
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self._ngram_index.get(g, ()))):
+            names = self._ngram_index.get(gram)
+            if not names:
+                return ()
+            candidates = set(names) if candidates is None else candidates & names
+            if not candidates:
+                return ()
+        return candidates
+
+    def search(self, equipment_name: str) -> List[Dict[str, Any]]:
+        """
+        Find builds that have an equipment item whose name contains the query.
+
+        Args:
+            equipment_name: The (English) equipment name or name fragment to search for.
+
+        Returns:
+            One result per matching build, in dataset order, describing the first
+            matching item of that build.
+        """
+        query = equipment_name.lower()
+
+        # build_id -> position of its first matching item
+        first_match: Dict[int, int] = {}
+        for name in self._candidate_names(query):
+            if query not in name:
+                continue
+            for build_id, position in self._postings[name]:
+                if build_id not in first_match or position < first_match[build_id]:
+                    first_match[build_id] = position
+
+        results = []
+        for build_id in sorted(first_match):
+            build = self._builds[build_id]
+            item = build['equipment'][first_match[build_id]]
+            results.append({
+                "title": build['title'],
+                "url": build['url'],
+                "class": build['class'],
+                "difficulty": build.get('difficulty', 'Unknown'),
+                "matched_item": item['name'],
+                "item_type": item.get('type', 'Unknown'),
+                "is_unique": item.get('is_unique', False),
+                "category": item.get('category', 'Unknown'),
+                "description": item.get('description', '')
+            })
+        return results
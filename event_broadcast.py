@@ -0,0 +1,289 @@
+"""
+Publish/subscribe broadcaster for refresh events.
+
+Every server-sent events connection subscribes with its own bounded asyncio
+queue, so all open tabs see every event and each event is pushed to them as
+soon as it is published instead of being polled. Refresh code runs in worker
+threads; publish() hands events over to the event loop thread-safely.
+
+Every event gets a monotonically increasing id and is kept in a bounded
+log of the refresh job it belongs to. A new connection is first sent the
+job's log so far and a reconnecting one (which sends the id it saw last as
+Last-Event-ID) exactly the events it missed. Progress events are coalesced
+in the log: only the latest one is kept, so a late joiner gets the current
+state instead of hundreds of stale ticks.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before the oldest ones are dropped
+DEFAULT_SUBSCRIBER_BUFFER = 1000
+
+# Events kept in the log of each refresh job
+DEFAULT_JOB_LOG_SIZE = 2000
+
+# Number of recent refresh jobs whose logs are kept
+DEFAULT_JOB_HISTORY = 5
+
+# Marks the end of a refresh's event stream
+END_OF_STREAM = object()
+
+# Tells a subscriber to check other sources (such as captured logs) for news
+WAKEUP = object()
+
+# Event types of which only the latest one is kept in a job log
+COALESCED_EVENT_TYPES = {"progress"}
+
+
+class JobEventLog:
+    """Bounded, id-ordered log of one refresh job's events."""
+
+    def __init__(self, job_id: str, maxsize: int, start_id: int):
+        """
+        Initialize the log.
+
+        Args:
+            job_id: The refresh job the events belong to.
+            maxsize: Number of events kept before the oldest ones are evicted.
+            start_id: The first event id the job can get.
+        """
+        self.job_id = job_id
+        self.maxsize = maxsize
+        self.start_id = start_id
+        # Last event id published while the job ran, once it finished
+        self.end_id: Optional[int] = None
+        self.finished = False
+        # Highest event id that was evicted because the log was full
+        self.evicted_through = 0
+        self._events: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        # Event type -> id of the latest event of a coalesced type
+        self._latest: Dict[str, int] = {}
+
+    def append(self, event_id: int, event: Dict[str, Any]) -> None:
+        """Add an event, replacing the previous one of a coalesced type."""
+        event_type = event.get("type")
+        if event_type in COALESCED_EVENT_TYPES:
+            previous = self._latest.pop(event_type, None)
+            if previous is not None:
+                self._events.pop(previous, None)
+            self._latest[event_type] = event_id
+        self._events[event_id] = event
+        while len(self._events) > self.maxsize:
+            evicted, evicted_event = self._events.popitem(last=False)
+            self.evicted_through = evicted
+            if self._latest.get(evicted_event.get("type")) == evicted:
+                del self._latest[evicted_event.get("type")]
+
+    def since(self, last_event_id: Optional[int]) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Return the events after an id.
+
+        Args:
+            last_event_id: The id the client saw last, or None for the whole log.
+
+        Returns:
+            A list of (id, event) in id order.
+        """
+        if last_event_id is None:
+            return list(self._events.items())
+        return [(event_id, event) for event_id, event in self._events.items() if event_id > last_event_id]
+
+    def covers(self, event_id: int) -> bool:
+        """Whether an event id was published while this job was running."""
+        return self.start_id <= event_id and (self.end_id is None or event_id <= self.end_id)
+
+
+class Subscription:
+    """One subscriber's bounded buffer of events."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        """
+        Initialize the subscription.
+
+        Args:
+            loop: The event loop the subscriber reads on.
+            maxsize: Number of events buffered before the oldest ones are dropped.
+        """
+        self.loop = loop
+        self.dropped = 0
+        self._wakeup_scheduled = False
+        # Events the client asked for that were no longer in the job log
+        self.missed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, item: Any) -> None:
+        """Add an (id, event) pair, dropping the oldest one if the subscriber is too slow. Runs on the loop."""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(item)
+
+    def wake(self) -> None:
+        """Schedule a WAKEUP unless one is already on its way. Safe to call from any thread."""
+        if self._wakeup_scheduled:
+            return
+        self._wakeup_scheduled = True
+        self.loop.call_soon_threadsafe(self._deliver_wakeup)
+
+    def _deliver_wakeup(self) -> None:
+        self._wakeup_scheduled = False
+        self.deliver(WAKEUP)
+
+    async def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait, or None to wait forever.
+
+        Returns:
+            The next (id, event) pair, WAKEUP, or END_OF_STREAM once the refresh finished.
+
+        Raises:
+            asyncio.TimeoutError: If no event arrived within the timeout.
+        """
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+
+class EventBroadcaster:
+    """Fans refresh events out to every subscribed event stream."""
+
+    def __init__(self, subscriber_buffer: int = DEFAULT_SUBSCRIBER_BUFFER,
+                 job_log_size: int = DEFAULT_JOB_LOG_SIZE, job_history: int = DEFAULT_JOB_HISTORY):
+        """
+        Initialize the broadcaster.
+
+        Args:
+            subscriber_buffer: Number of events buffered per subscriber.
+            job_log_size: Number of events kept in each job's log.
+            job_history: Number of recent jobs whose logs are kept.
+        """
+        self.subscriber_buffer = subscriber_buffer
+        self.job_log_size = job_log_size
+        self.job_history = max(1, job_history)
+        # Ids start at the current time in milliseconds, so ids handed out before a
+        # server restart never match events published after it
+        self._last_id = int(time.time() * 1000)
+        self._jobs: "OrderedDict[str, JobEventLog]" = OrderedDict()
+        self._job_count = 0
+        self._current: Optional[JobEventLog] = None
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Whether a refresh job is currently publishing events."""
+        current = self._current
+        return current is not None and not current.finished
+
+    def start(self, job_id: Optional[str] = None) -> str:
+        """
+        Begin a new refresh job's event log.
+
+        Args:
+            job_id: Id of the job, or None to number jobs automatically.
+
+        Returns:
+            The job id.
+        """
+        with self._lock:
+            self._job_count += 1
+            if job_id is None:
+                job_id = str(self._job_count)
+            self._current = self._jobs[job_id] = JobEventLog(job_id, self.job_log_size, self._last_id + 1)
+            while len(self._jobs) > self.job_history:
+                self._jobs.popitem(last=False)
+        return job_id
+
+    def finish(self) -> None:
+        """End the current refresh job's event stream."""
+        with self._lock:
+            if self._current is not None and not self._current.finished:
+                self._current.finished = True
+                self._current.end_id = self._last_id
+            self._send(END_OF_STREAM)
+
+    def publish(self, event: Dict[str, Any]) -> Optional[int]:
+        """
+        Send an event to every subscriber and record it in the current job's log.
+
+        Safe to call from any thread. Events published while no job is running
+        only go to live subscribers.
+
+        Args:
+            event: The JSON-serializable event.
+
+        Returns:
+            The event id.
+        """
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+            if self.active:
+                self._current.append(event_id, event)
+            self._send((event_id, event))
+        return event_id
+
+    def wake(self) -> None:
+        """Wake every subscriber without publishing an event. Cheap and safe to call from any thread."""
+        # Copying the set is atomic, so this never waits for the lock
+        for subscription in tuple(self._subscribers):
+            try:
+                subscription.wake()
+            except RuntimeError:
+                pass
+
+    def _send(self, item: Any) -> None:
+        """Schedule delivery of an item to every subscriber. Caller holds the lock."""
+        for subscription in self._subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, item)
+            except RuntimeError:
+                # The subscriber's loop is closed; it is about to unsubscribe
+                pass
+
+    def _find_job(self, last_event_id: Optional[int]) -> Optional[JobEventLog]:
+        """Find the job a reconnecting client was following. Caller holds the lock."""
+        if last_event_id is not None:
+            for job in reversed(self._jobs.values()):
+                if job.covers(last_event_id):
+                    return job
+        return self._current
+
+    @contextmanager
+    def subscribe(self, last_event_id: Optional[int] = None) -> Iterator[Subscription]:
+        """
+        Subscribe the calling event stream for the duration of the with block.
+
+        The subscription first receives the events of the job it follows that
+        come after last_event_id, then live events. Must be entered on the event
+        loop that reads the subscription.
+
+        Args:
+            last_event_id: The id of the last event the client received, if it is reconnecting.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.subscriber_buffer)
+        with self._lock:
+            job = self._find_job(last_event_id)
+            if job is not None:
+                if last_event_id is not None and last_event_id < job.evicted_through:
+                    subscription.missed = True
+                for item in job.since(last_event_id):
+                    subscription.deliver(item)
+            if job is None or job.finished:
+                # Nothing more will come for this job
+                subscription.deliver(END_OF_STREAM)
+            self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscription)
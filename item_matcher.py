@@ -0,0 +1,172 @@
+"""
+Multi-pattern matcher for known unique item names.
+
+An Aho-Corasick automaton over the lower-cased item catalog finds every
+known item in a block of text in a single scan, however many names the
+catalog holds. The automaton only consists of plain lists and dicts, so it
+can be shipped to worker processes along with the extractor.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class ItemMatcher:
+    """Aho-Corasick automaton over a list of item names."""
+
+    def __init__(self, names: Iterable[str]):
+        """
+        Build the automaton.
+
+        Args:
+            names: The item names to look for. Matching is case-insensitive; the
+                first spelling of a name is the one reported.
+        """
+        self.names: List[str] = []
+        self._lengths: List[int] = []
+        # Trie transitions, failure links and the name ids recognized in each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        seen = set()
+        for name in names:
+            key = name.strip().lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self._insert(key, len(self.names))
+            self.names.append(name.strip())
+            self._lengths.append(len(key))
+
+        self._max_length = max(self._lengths, default=0)
+        self._build_failure_links()
+
+    def _insert(self, key: str, name_id: int) -> None:
+        """Add one lower-cased name to the trie."""
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += (name_id,)
+
+    def _build_failure_links(self) -> None:
+        """Compute failure links breadth-first and merge the outputs along them."""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def _scan(self, text: str) -> Iterable[Tuple[int, int]]:
+        """Yield (end offset, name id) for every occurrence in the lower-cased text."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for position, char in enumerate(text.lower()):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for name_id in output[state]:
+                yield position + 1, name_id
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find every occurrence of a known name, overlapping ones included.
+
+        Args:
+            text: The text to scan.
+
+        Returns:
+            A list of (start, end, name) tuples ordered by end offset. Offsets refer
+            to the lower-cased text.
+        """
+        return [(end - self._lengths[name_id], end, self.names[name_id]) for end, name_id in self._scan(text)]
+
+    def first(self, text: str) -> Optional[str]:
+        """
+        Find the known name that occurs first in a text.
+
+        Args:
+            text: The text to scan.
+
+        Returns:
+            The leftmost occurring name (the longest one if several start there),
+            or None if the text contains no known name.
+        """
+        best = None
+        for end, name_id in self._scan(text):
+            # Matches come in order of their end offset, so once no name is long
+            # enough to reach back to the best start, nothing can beat it
+            if best is not None and end - self._max_length > best[0]:
+                break
+            start = end - self._lengths[name_id]
+            if best is None or start < best[0] or (start == best[0] and end > best[1]):
+                best = (start, end, name_id)
+        return self.names[best[2]] if best else None
+
+    def first_in_catalog(self, text: str) -> Optional[str]:
+        """
+        Find the known name that comes first in the catalog among those in a text.
+
+        This is what checking each name in turn would report, whichever
+        occurs first in the text.
+
+        Args:
+            text: The text to scan.
+
+        Returns:
+            The matching name listed earliest, or None if the text contains no known name.
+        """
+        best = None
+        for _, name_id in self._scan(text):
+            if best is None or name_id < best:
+                best = name_id
+                if best == 0:
+                    break
+        return self.names[best] if best is not None else None
+
+    def contains_any(self, text: str) -> bool:
+        """Whether the text contains at least one known name."""
+        for _ in self._scan(text):
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+_matchers: Dict[Tuple[str, ...], ItemMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_item_matcher(names: Iterable[str]) -> ItemMatcher:
+    """
+    Get the matcher for a list of names, building it on first use.
+
+    Args:
+        names: The item names to look for.
+
+    Returns:
+        A shared ItemMatcher for exactly these names.
+    """
+    key = tuple(names)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(key)
+            if matcher is None:
+                matcher = _matchers[key] = ItemMatcher(key)
+    return matcher
@@ -134,6 +134,15 @@ class ItemTranslator:
         canonical_name, _ = self.get_canonical_name(name)
         return canonical_name
     
+    def get_english_names(self) -> List[str]:
+        """
+        Get the English names of all known items.
+        
+        Returns:
+            The English item names in catalog order.
+        """
+        return [entry["english"] for entry in self.item_translations]
+    
     def get_all_translations(self) -> List[Dict[str, str]]:
         """
         Get all item translations.
@@ -0,0 +1,93 @@
+"""
+Bounded capture of log records for the web UI.
+
+Records are kept in a fixed-size ring buffer: when it is full the oldest
+record is dropped and counted, so an error storm can never grow memory. A
+record is only formatted when a reader (an open event stream) asks for it,
+and emitting one never blocks on readers: it appends to the ring and tells
+listeners that there is something new, which they coalesce into at most one
+pending wake-up per reader.
+"""
+
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+# Number of log records kept for the web UI
+DEFAULT_LOG_BUFFER_SIZE = 500
+
+
+class RingBufferHandler(logging.Handler):
+    """Logging handler that keeps the latest records in a bounded ring buffer."""
+
+    def __init__(self, capacity: int = DEFAULT_LOG_BUFFER_SIZE, level: int = logging.NOTSET):
+        """
+        Initialize the handler.
+
+        Args:
+            capacity: Number of records kept before the oldest ones are dropped.
+            level: Minimum level of captured records.
+        """
+        super().__init__(level)
+        self.capacity = max(1, capacity)
+        # Number of records dropped because the buffer was full
+        self.dropped = 0
+        self._records: Deque[Tuple[int, logging.LogRecord]] = deque(maxlen=self.capacity)
+        self._seq = 0
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest record; readers start after it to skip history."""
+        return self._seq
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callable invoked after a record is captured.
+
+        Listeners run in the logging thread, so they must be cheap and must not log.
+
+        Args:
+            listener: Callable taking no arguments.
+        """
+        self._listeners.append(listener)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Capture a record without formatting it. Called with the handler lock held."""
+        if len(self._records) == self.capacity:
+            self.dropped += 1
+        self._seq += 1
+        self._records.append((self._seq, record))
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception:
+                self.handleError(record)
+
+    def read(self, after_seq: int) -> Tuple[List[Tuple[int, Dict[str, Any]]], int]:
+        """
+        Format the records captured after a sequence number.
+
+        Args:
+            after_seq: The sequence number of the last record the reader has seen.
+
+        Returns:
+            A tuple of ((sequence number, log event) pairs in order, number of
+            records the reader missed because they were dropped from the buffer).
+        """
+        with self.lock:
+            records = [(seq, record) for seq, record in self._records if seq > after_seq]
+        missed = records[0][0] - after_seq - 1 if records else 0
+        return [(seq, self._to_event(record)) for seq, record in records], missed
+
+    def _to_event(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Format a record as a log event, once no matter how many readers ask for it."""
+        event = getattr(record, "_ui_event", None)
+        if event is None:
+            event = {
+                'type': 'log',
+                'message': self.format(record),
+                'log_level': record.levelname.lower()
+            }
+            record._ui_event = event
+        return event
@@ -0,0 +1,228 @@
+"""
+Content-addressed on-disk cache of guide page HTML.
+
+Page bodies are stored once per content hash under objects/, and a small
+metadata record per URL (and fetch method) points at the current body along
+with the ETag/Last-Modified validators needed for conditional requests and
+the equipment last extracted from that body. A refresh can therefore skip
+both the download (304 Not Modified) and the parse (unchanged hash), and an
+offline run can re-extract the whole corpus without touching the network.
+
+An extraction is only reused by the same extractor version with the same
+known-uniques catalog. The cache directory is created on the first write.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = ".page_cache"
+
+# How a build's equipment was fetched; pages are cached per fetch method
+FETCH_METHOD_HTTP = "http"
+FETCH_METHOD_SELENIUM = "selenium"
+FETCH_METHOD_CACHE = "cache"
+
+
+def content_hash(html: str) -> str:
+    """Return the SHA-256 hex digest of a page body."""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def catalog_hash(names: List[str]) -> str:
+    """Return a digest of the known-uniques catalog extraction results depend on."""
+    return hashlib.sha256("\n".join(names).encode("utf-8")).hexdigest()
+
+
+class CachedPage:
+    """Metadata of one cached page."""
+
+    def __init__(self, record: Dict[str, Any]):
+        """
+        Wrap a metadata record.
+
+        Args:
+            record: The metadata dictionary stored for the page.
+        """
+        self.record = record
+
+    @property
+    def url(self) -> str:
+        return self.record["url"]
+
+    @property
+    def content_hash(self) -> str:
+        return self.record["content_hash"]
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.record.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.record.get("last_modified")
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that revalidate this page with the server."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """On-disk page cache keyed by URL and fetch method."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Initialize the cache. Its directories are created on the first write.
+
+        Args:
+            cache_dir: Directory holding the cache.
+        """
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.pages_dir = os.path.join(cache_dir, "pages")
+        self._dirs_created = False
+        self._lock = threading.Lock()
+
+    def _ensure_dirs(self) -> None:
+        """Create the cache directories before the first write."""
+        if not self._dirs_created:
+            os.makedirs(self.objects_dir, exist_ok=True)
+            os.makedirs(self.pages_dir, exist_ok=True)
+            self._dirs_created = True
+
+    def _meta_path(self, url: str, method: str) -> str:
+        key = hashlib.sha256(f"{method}:{url}".encode("utf-8")).hexdigest()
+        return os.path.join(self.pages_dir, f"{key}.json")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, f"{digest}.html")
+
+    def _write_meta(self, path: str, record: Dict[str, Any]) -> None:
+        self._ensure_dirs()
+        tmp_path = f"{path}.tmp.{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+
+    def get(self, url: str, method: str) -> Optional[CachedPage]:
+        """
+        Look up the cached page for a URL.
+
+        Args:
+            url: The page URL.
+            method: The fetch method the page was cached for (e.g. "http").
+
+        Returns:
+            The CachedPage, or None if nothing usable is cached.
+        """
+        path = self._meta_path(url, method)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not os.path.exists(self._object_path(record.get("content_hash", ""))):
+            return None
+        return CachedPage(record)
+
+    def read_html(self, page: CachedPage) -> str:
+        """Read the body of a cached page."""
+        with open(self._object_path(page.content_hash), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def put(self, url: str, method: str, html: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> CachedPage:
+        """
+        Store a freshly fetched page.
+
+        Args:
+            url: The page URL.
+            method: The fetch method that produced the HTML.
+            html: The page body.
+            etag: The ETag response header, if any.
+            last_modified: The Last-Modified response header, if any.
+
+        Returns:
+            The CachedPage now stored for the URL. Extraction results are kept
+            when the content hash did not change.
+        """
+        digest = content_hash(html)
+        object_path = self._object_path(digest)
+        self._ensure_dirs()
+        if not os.path.exists(object_path):
+            tmp_path = f"{object_path}.tmp.{threading.get_ident()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp_path, object_path)
+
+        with self._lock:
+            previous = self.get(url, method)
+            record = {
+                "url": url,
+                "method": method,
+                "content_hash": digest,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": time.time(),
+            }
+            if previous and previous.content_hash == digest and "extraction" in previous.record:
+                record["extraction"] = previous.record["extraction"]
+            self._write_meta(self._meta_path(url, method), record)
+        return CachedPage(record)
+
+    def touch(self, page: CachedPage) -> None:
+        """Record that a cached page was successfully revalidated."""
+        with self._lock:
+            page.record["fetched_at"] = time.time()
+            self._write_meta(self._meta_path(page.url, page.record["method"]), page.record)
+
+    def get_extraction(self, page: CachedPage, extractor_version: int,
+                       catalog: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get equipment previously extracted from exactly this page body.
+
+        Args:
+            page: The cached page.
+            extractor_version: Version of the extractor that must have produced the result.
+            catalog: catalog_hash() of the known uniques the result must have been extracted with.
+
+        Returns:
+            The cached equipment list, or None if it has to be extracted again.
+        """
+        extraction = page.record.get("extraction")
+        if (not extraction or extraction.get("content_hash") != page.content_hash
+                or extraction.get("extractor_version") != extractor_version
+                or extraction.get("catalog_hash") != catalog):
+            return None
+        return extraction.get("equipment")
+
+    def put_extraction(self, page: CachedPage, extractor_version: int, catalog: str,
+                       equipment: List[Dict[str, Any]]) -> None:
+        """
+        Remember the equipment extracted from a page body.
+
+        Args:
+            page: The cached page the equipment was extracted from.
+            extractor_version: Version of the extractor that produced the result.
+            catalog: catalog_hash() of the known uniques it was extracted with.
+            equipment: The extracted equipment list.
+        """
+        with self._lock:
+            page.record["extraction"] = {
+                "content_hash": page.content_hash,
+                "extractor_version": extractor_version,
+                "catalog_hash": catalog,
+                "equipment": equipment,
+            }
+            self._write_meta(self._meta_path(page.url, page.record["method"]), page.record)
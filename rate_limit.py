@@ -0,0 +1,185 @@
+"""
+Request rate limiting for the scraper.
+
+A single token bucket is shared by every worker that talks to maxroll.gg, so
+the overall request rate stays polite no matter how many pages are being
+fetched concurrently, without wasting time on fixed sleeps.
+
+How many pages are fetched at once adapts to the server with AIMD
+(additive increase, multiplicative decrease): the concurrency limit grows by
+one slot per window of healthy requests and is halved on timeouts,
+throttling (429/5xx) or pages that come back without content.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Factor the concurrency limit is multiplied by on congestion
+DEFAULT_DECREASE_FACTOR = 0.5
+
+# Status codes that mean the server is throttling or struggling
+THROTTLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize the bucket. It starts full.
+
+        Args:
+            rate: Tokens added per second, i.e. the sustained request rate.
+            capacity: Maximum number of tokens, i.e. the allowed burst size.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last update. Caller holds the lock."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take tokens if they are available right now.
+
+        Args:
+            tokens: Number of tokens to take.
+
+        Returns:
+            True if the tokens were taken, False otherwise.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Block until tokens are available and take them.
+
+        Args:
+            tokens: Number of tokens to take.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """Thread-safe concurrency limit adjusted by AIMD on latency and errors."""
+
+    def __init__(self, name: str, initial: int, maximum: int, latency_target: float,
+                 minimum: int = 1, decrease_factor: float = DEFAULT_DECREASE_FACTOR):
+        """
+        Initialize the limit.
+
+        Args:
+            name: Name used in log messages, e.g. "http".
+            initial: Starting number of concurrent requests.
+            maximum: Upper bound of the limit.
+            latency_target: Request latency in seconds above which the server is
+                considered congested.
+            minimum: Lower bound of the limit.
+            decrease_factor: Factor the limit is multiplied by on congestion.
+        """
+        if latency_target <= 0:
+            raise ValueError("latency_target must be positive")
+        self.name = name
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self._limit = float(min(max(initial, self.minimum), self.maximum))
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed at the same time."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding a slot."""
+        return self._in_flight
+
+    def acquire(self) -> None:
+        """Block until a slot is free under the current limit and take it."""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """Give back a slot taken with acquire()."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a slot for the duration of the with block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record_success(self, latency: float) -> None:
+        """
+        Report a finished request. A slow one counts as congestion.
+
+        Args:
+            latency: Time the request took, in seconds.
+        """
+        if latency > self.latency_target:
+            self.record_congestion(f"latency {latency:.1f}s")
+            return
+        with self._condition:
+            previous = int(self._limit)
+            # +1 slot once a full window of requests succeeded
+            self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+            if int(self._limit) > previous:
+                logger.info("Raised %s concurrency to %d", self.name, int(self._limit))
+                self._condition.notify_all()
+
+    def record_congestion(self, reason: str) -> None:
+        """
+        Report a timeout, throttled response or empty page.
+
+        Requests that were already in flight when the limit was cut report the
+        same congestion, so the limit is cut at most once per latency target.
+
+        Args:
+            reason: Short description for the log.
+        """
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease < self.latency_target:
+                return
+            self._last_decrease = now
+            previous = int(self._limit)
+            self._limit = max(float(self.minimum), self._limit * self.decrease_factor)
+            if int(self._limit) < previous:
+                logger.warning("Lowered %s concurrency to %d (%s)", self.name, int(self._limit), reason)
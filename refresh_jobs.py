@@ -0,0 +1,314 @@
+"""
+Refresh jobs and the manager that runs them.
+
+Every data refresh is a RefreshJob with its own id, status, progress
+counters, per-stage timings and an ETA derived from the observed fetch
+throughput. Jobs run one at a time on a dedicated executor thread, so a long
+scrape never occupies the web server's request threadpool, and finished
+jobs stay queryable for a while.
+
+Cancelling a job sets its cancel flag and invokes the callbacks the job
+registered (e.g. stopping the scrape pipeline); the refresh then stops
+without publishing, so the last good snapshot stays in place. Once a job
+starts publishing its results it can no longer be cancelled.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job statuses
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+FINISHED_STATUSES = {STATUS_COMPLETED, STATUS_FAILED, STATUS_CANCELLED}
+
+# Number of finished jobs kept for status queries
+DEFAULT_JOB_HISTORY = 20
+
+
+class RefreshCancelled(Exception):
+    """Raised inside a refresh when its job was cancelled."""
+
+
+class RefreshJob:
+    """State of one data refresh."""
+
+    def __init__(self, mode: str):
+        """
+        Initialize the job.
+
+        Args:
+            mode: The kind of refresh, e.g. "real", "incremental" or "fake".
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.mode = mode
+        self.status = STATUS_PENDING
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.build_count: Optional[int] = None
+        # Builds finished so far (fetched or carried forward) out of those discovered
+        self.current = 0
+        self.total = 0
+        # Builds fetched by this job, which is what the ETA is based on
+        self.fetched = 0
+        # Stage name -> [start, end] in time.monotonic() seconds, end None while running
+        self._stages: "OrderedDict[str, List[Optional[float]]]" = OrderedDict()
+        self._cancel_event = threading.Event()
+        self._cancel_callbacks: List[Callable[[], None]] = []
+        # Cleared once the job publishes its results
+        self._cancellable = True
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job completed, failed or was cancelled."""
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Whether cancel() was called."""
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> bool:
+        """
+        Ask the job to stop. Safe to call from any thread.
+
+        Returns:
+            False if the job had already finished or is publishing its results.
+        """
+        with self._lock:
+            if self.finished or not self._cancellable:
+                return False
+            self._cancel_event.set()
+            callbacks = list(self._cancel_callbacks)
+        logger.info("Cancelling refresh job %s", self.id)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("Cancel callback of refresh job %s failed: %s", self.id, e)
+        return True
+
+    @property
+    def cancellable(self) -> bool:
+        """Whether cancel() can still stop the job."""
+        return self._cancellable and not self.finished
+
+    def begin_publish(self) -> None:
+        """
+        Stop accepting cancellation because the job is about to publish its results.
+
+        Raises:
+            RefreshCancelled: If the job was cancelled before it got here.
+        """
+        with self._lock:
+            self.check_cancelled()
+            self._cancellable = False
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callable that stops the job's work. It runs at once if the job was already cancelled.
+
+        Args:
+            callback: Callable taking no arguments; called from the cancelling thread.
+        """
+        with self._lock:
+            self._cancel_callbacks.append(callback)
+            cancelled = self._cancel_event.is_set()
+        if cancelled:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("Cancel callback of refresh job %s failed: %s", self.id, e)
+
+    def check_cancelled(self) -> None:
+        """
+        Raise RefreshCancelled if the job was cancelled.
+
+        Raises:
+            RefreshCancelled: If cancel() was called.
+        """
+        if self._cancel_event.is_set():
+            raise RefreshCancelled(f"Refresh job {self.id} was cancelled")
+
+    def wait_cancelled(self, timeout: float) -> bool:
+        """
+        Sleep until the job is cancelled or the timeout expires.
+
+        Returns:
+            True if the job was cancelled.
+        """
+        return self._cancel_event.wait(timeout)
+
+    def mark_finished(self, status: str, error: Optional[str] = None) -> None:
+        """
+        Record the job's final status, closing any stage that is still running.
+
+        Args:
+            status: One of the finished statuses.
+            error: The failure message, if the job failed.
+        """
+        for name in list(self._stages):
+            self.end_stage(name)
+        with self._lock:
+            self.error = error
+            self.finished_at = time.time()
+            self.status = status
+
+    def start_stage(self, name: str) -> None:
+        """Record that a stage started. Stages may overlap."""
+        self._stages[name] = [time.monotonic(), None]
+
+    def end_stage(self, name: str) -> None:
+        """Record that a stage finished."""
+        stage = self._stages.get(name)
+        if stage is not None and stage[1] is None:
+            stage[1] = time.monotonic()
+
+    def stage_seconds(self, name: str) -> Optional[float]:
+        """Time spent in a stage so far, or None if it never started."""
+        stage = self._stages.get(name)
+        if stage is None:
+            return None
+        return (stage[1] if stage[1] is not None else time.monotonic()) - stage[0]
+
+    def eta_seconds(self) -> Optional[float]:
+        """
+        Estimate the time left from the throughput of the fetch stage so far.
+
+        Returns:
+            Seconds until every discovered build is done, or None before the first
+            build was fetched. The estimate grows while discovery is still finding builds.
+        """
+        if self.finished:
+            return 0.0
+        elapsed = self.stage_seconds("fetch")
+        if not elapsed or self.fetched == 0:
+            return None
+        remaining = max(0, self.total - self.current)
+        return remaining * elapsed / self.fetched
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the job's state as a JSON-serializable dictionary."""
+        eta = self.eta_seconds()
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "status": self.status,
+            "cancel_requested": self.cancel_requested,
+            "cancellable": self.cancellable,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "current": self.current,
+            "total": self.total,
+            "fetched": self.fetched,
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "stages": {
+                name: {"seconds": round(self.stage_seconds(name), 3), "running": end is None}
+                for name, (_, end) in list(self._stages.items())
+            },
+            "build_count": self.build_count,
+            "error": self.error,
+        }
+
+
+class RefreshJobManager:
+    """Runs refresh jobs one at a time on a dedicated executor."""
+
+    def __init__(self, history: int = DEFAULT_JOB_HISTORY):
+        """
+        Initialize the manager.
+
+        Args:
+            history: Number of jobs kept for status queries.
+        """
+        self.history = max(1, history)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="refresh-job")
+        self._jobs: "OrderedDict[str, RefreshJob]" = OrderedDict()
+        self._active: Optional[RefreshJob] = None
+        self._lock = threading.Lock()
+
+    @property
+    def active_job(self) -> Optional[RefreshJob]:
+        """The job that is pending or running, if any."""
+        return self._active
+
+    @property
+    def latest_job(self) -> Optional[RefreshJob]:
+        """The most recently submitted job, if any."""
+        with self._lock:
+            return next(reversed(self._jobs.values()), None)
+
+    def get(self, job_id: str) -> Optional[RefreshJob]:
+        """Look up a job by id."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, mode: str, run: Callable[[RefreshJob], Optional[int]],
+               on_start: Optional[Callable[[RefreshJob], None]] = None,
+               on_finish: Optional[Callable[[RefreshJob], None]] = None) -> Optional[RefreshJob]:
+        """
+        Start a refresh job unless one is already active.
+
+        Args:
+            mode: The kind of refresh.
+            run: Called as run(job) on the executor thread; returns the number of
+                builds published. Raising RefreshCancelled (or returning after the job
+                was cancelled) marks the job cancelled; any other exception fails it.
+            on_start: Called as on_start(job) in the calling thread before the job
+                is queued, e.g. to set up where its events go.
+            on_finish: Called as on_finish(job) on the executor thread once the job
+                reached its final status.
+
+        Returns:
+            The new job, or None if a job is already active.
+        """
+        with self._lock:
+            if self._active is not None:
+                return None
+            job = RefreshJob(mode)
+            self._active = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                self._jobs.popitem(last=False)
+        if on_start:
+            on_start(job)
+        self._executor.submit(self._run, job, run, on_finish)
+        return job
+
+    def _run(self, job: RefreshJob, run: Callable[[RefreshJob], Optional[int]],
+             on_finish: Optional[Callable[[RefreshJob], None]]) -> None:
+        job.status = STATUS_RUNNING
+        job.started_at = time.time()
+        status, error = STATUS_COMPLETED, None
+        try:
+            job.check_cancelled()
+            job.build_count = run(job)
+            if job.cancel_requested:
+                status = STATUS_CANCELLED
+        except RefreshCancelled:
+            status = STATUS_CANCELLED
+        except Exception as e:
+            logger.error("Refresh job %s failed: %s", job.id, e)
+            status, error = STATUS_FAILED, str(e)
+        finally:
+            job.mark_finished(status, error)
+            try:
+                if on_finish:
+                    on_finish(job)
+            finally:
+                # Only now may the next job start, so it never sees this one's cleanup
+                with self._lock:
+                    self._active = None
@@ -0,0 +1,131 @@
+"""
+Append-only journal for refresh progress.
+
+A refresh records the discovered builds and then appends one JSON line per
+finished build, instead of re-serializing the whole dataset after every
+build. When discovery streams builds while equipment is already being
+fetched, each discovered build gets its own line and a final marker records
+that discovery completed. When the refresh completes, the journal is compacted into the
+published snapshot and removed. If the process stops mid-refresh, the next
+refresh replays the journal and only processes the builds that are missing.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = "all_builds.journal.jsonl"
+
+
+class RefreshJournal:
+    """JSON Lines journal of an in-progress refresh."""
+
+    def __init__(self, journal_file: str = JOURNAL_FILE):
+        """
+        Initialize the journal.
+
+        Args:
+            journal_file: Path of the JSON Lines journal file.
+        """
+        self.journal_file = journal_file
+
+    def exists(self) -> bool:
+        """Whether an unfinished refresh journal is present."""
+        return os.path.exists(self.journal_file)
+
+    def _append(self, record: Dict[str, Any], mode: str = "a") -> None:
+        """Write a single record as one line and flush it to disk."""
+        with open(self.journal_file, mode, encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def start(self, builds: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Start a new journal for a refresh.
+
+        Args:
+            builds: The discovered builds that the refresh will process, or None if
+                builds are recorded one by one with add_discovered() as discovery
+                streams them.
+        """
+        if builds is None:
+            self._append({"type": "start", "builds": [], "streaming": True}, mode="w")
+        else:
+            self._append({"type": "start", "builds": builds}, mode="w")
+
+    def add_discovered(self, build: Dict[str, Any]) -> None:
+        """
+        Record one build found by a streaming discovery.
+
+        Args:
+            build: The discovered build.
+        """
+        self._append({"type": "discovered", "build": build})
+
+    def finish_discovery(self) -> None:
+        """Record that a streaming discovery found every build."""
+        self._append({"type": "discovery_done"})
+
+    def append(self, build: Dict[str, Any]) -> None:
+        """
+        Record one finished build.
+
+        Args:
+            build: The build including its equipment.
+        """
+        self._append({"type": "build", "build": build})
+
+    def replay(self) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool]]:
+        """
+        Read back an unfinished refresh.
+
+        A truncated final line (from a crash mid-write) is ignored.
+
+        Returns:
+            A tuple of (discovered builds, finished builds in completion order,
+            whether discovery completed), or None if there is no usable journal.
+        """
+        if not self.exists():
+            return None
+
+        discovered: Optional[List[Dict[str, Any]]] = None
+        discovery_complete = False
+        finished: Dict[str, Dict[str, Any]] = {}
+
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Ignoring unreadable journal line %d", line_number)
+                    continue
+
+                if record.get("type") == "start":
+                    discovered = record.get("builds", [])
+                    discovery_complete = not record.get("streaming", False)
+                    finished = {}
+                elif record.get("type") == "discovered" and discovered is not None:
+                    discovered.append(record.get("build", {}))
+                elif record.get("type") == "discovery_done":
+                    discovery_complete = True
+                elif record.get("type") == "build":
+                    build = record.get("build", {})
+                    finished[build.get("url")] = build
+
+        if discovered is None:
+            logger.warning("Journal %s has no start record, ignoring it", self.journal_file)
+            return None
+
+        return discovered, list(finished.values()), discovery_complete
+
+    def discard(self) -> None:
+        """Remove the journal after its contents have been published."""
+        if self.exists():
+            os.remove(self.journal_file)
@@ -0,0 +1,527 @@
+"""
+Asynchronous producer/consumer pipeline for fetching build equipment.
+
+A refresh is split into stages connected by queues:
+
+    discovery -> [fetch queue] -> HTTP fetchers -> [parse queue] -> parsers -> [result queue] -> writer
+                                       |                              |
+                                       +--> [browser queue] <---------+
+                                                 |
+                                          browser fetchers -> [parse queue]
+
+Discovery yields builds into a bounded queue, so it can never run far ahead
+of the fetchers. A build is fetched over plain HTTP first; when that fails or
+its HTML holds no equipment, it is handed to the pooled headless browsers.
+Parsing runs in its own stage, so fetchers go on to the next page instead of
+waiting for BeautifulSoup. A single writer records every finished build, so
+result handling never needs locking. The blocking scraper calls run in
+executors; the event loop only coordinates the stages.
+
+Extraction is CPU-bound, so by default it runs in a pool of worker
+processes: page sources go in, plain equipment dicts come back, and neither
+the fetchers nor the web process compete with BeautifulSoup for the GIL.
+Page-cache lookups stay in this process, so an unchanged page is never sent
+to a worker at all. The process pool is shared by all runs and lives as long
+as this process: spawned workers re-import the main module (the web app or
+the scraper CLI) when they start, which is paid once rather than per refresh.
+
+A fetch that fails with a timeout or a throttled response is retried after
+a jittered exponential backoff, so retries from many workers do not hit the
+server in lockstep. A build that still fails is written with a `fetch_error`
+instead of an empty equipment list, so callers can keep its previous data.
+
+Progress is exposed through PipelineStats counters, and cancel() stops a run
+from any thread. Discovery stops asking for builds once the run is
+cancelled, and run() waits for its thread before returning, so a cancelled
+run never leaves discovery driving the scraper's browser.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from equipment_extractor import extract_equipment
+from page_cache import CachedPage, FETCH_METHOD_CACHE, FETCH_METHOD_HTTP, FETCH_METHOD_SELENIUM
+from rate_limit import THROTTLE_STATUS_CODES
+
+logger = logging.getLogger(__name__)
+
+# Number of parse workers when extraction runs in threads
+DEFAULT_PARSE_WORKERS = 2
+
+# Number of extraction processes; 0 extracts in threads of this process
+DEFAULT_PARSE_PROCESSES = min(4, os.cpu_count() or 1)
+
+# Extraction process pool shared by every run, see get_parse_pool()
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_size = 0
+_parse_pool_lock = threading.Lock()
+
+# Retries of a failed fetch per fetch method, and their backoff in seconds
+DEFAULT_MAX_RETRIES = 2
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 60.0
+
+# Marks the end of the discovered builds
+_END = object()
+
+ResultCallback = Callable[[Dict[str, Any], Optional[Exception]], None]
+
+
+class PipelineStats:
+    """Counters describing the progress of a pipeline run."""
+
+    def __init__(self):
+        self.discovered = 0
+        self.discovery_done = False
+        self.fetched = 0
+        self.escalated = 0
+        self.retried = 0
+        self.parsed = 0
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Builds discovered but not yet written."""
+        return self.discovered - self.written
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a dictionary."""
+        return {
+            "discovered": self.discovered,
+            "discovery_done": self.discovery_done,
+            "fetched": self.fetched,
+            "escalated": self.escalated,
+            "retried": self.retried,
+            "parsed": self.parsed,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+
+def get_parse_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    Get the shared extraction process pool, starting it on first use.
+
+    Args:
+        processes: Number of worker processes. A pool of another size is replaced.
+
+    Returns:
+        The pool. Callers must not shut it down; use discard_parse_pool() if it broke.
+    """
+    global _parse_pool, _parse_pool_size
+    with _parse_pool_lock:
+        if _parse_pool is not None and _parse_pool_size != processes:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+        if _parse_pool is None:
+            # Spawned workers do not inherit the locks of this process's threads
+            _parse_pool = ProcessPoolExecutor(max_workers=processes,
+                                              mp_context=multiprocessing.get_context("spawn"))
+            _parse_pool_size = processes
+        return _parse_pool
+
+
+def discard_parse_pool(pool: Executor) -> None:
+    """
+    Shut down a broken extraction pool so the next run starts a fresh one.
+
+    Args:
+        pool: The pool returned by get_parse_pool().
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False)
+
+
+class ScrapePipeline:
+    """Runs discovery, fetching, parsing and writing as concurrent stages."""
+
+    def __init__(self, scraper: Any, on_result: Optional[ResultCallback] = None,
+                 http_workers: Optional[int] = None, browser_workers: Optional[int] = None,
+                 parse_workers: Optional[int] = None, parse_processes: Optional[int] = None,
+                 queue_size: Optional[int] = None, max_retries: int = DEFAULT_MAX_RETRIES):
+        """
+        Initialize the pipeline.
+
+        Args:
+            scraper: The Scraper whose fetch and extraction methods do the work.
+            on_result: Called as on_result(build, error) by the writer for every
+                finished build. Calls are serialized.
+            http_workers: Number of HTTP fetchers. Defaults to the maximum of the scraper's
+                adaptive HTTP concurrency, which decides how many of them run at once.
+            browser_workers: Number of browser fetchers. Defaults to the driver pool size.
+            parse_workers: Number of concurrent parsers. Defaults to one per extraction
+                process, or DEFAULT_PARSE_WORKERS when extracting in threads.
+            parse_processes: Number of extraction processes, 0 to extract in threads.
+                Defaults to the scraper's setting.
+            queue_size: Capacity of the fetch queue, i.e. how far discovery may run
+                ahead of the fetchers. Defaults to twice the number of HTTP fetchers.
+            max_retries: Number of times a failed fetch is retried per fetch method.
+        """
+        self.scraper = scraper
+        self.on_result = on_result
+        self.http_workers = max(1, http_workers or scraper.http_concurrency.maximum)
+        self.browser_workers = max(1, browser_workers or scraper.browser_concurrency.maximum)
+        if parse_processes is None:
+            parse_processes = getattr(scraper, "parse_processes", DEFAULT_PARSE_PROCESSES)
+        self.parse_processes = max(0, parse_processes)
+        self.parse_workers = max(1, parse_workers or self.parse_processes or DEFAULT_PARSE_WORKERS)
+        self.queue_size = queue_size or 2 * self.http_workers
+        self.max_retries = max(0, max_retries)
+        self.stats = PipelineStats()
+        self.cancelled = False
+        self.results: List[Dict[str, Any]] = []
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._main_task: Optional[asyncio.Task] = None
+        self._cancel_requested = threading.Event()
+        # (url, fetch method) -> retries so far
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        self._retry_tasks = set()
+        self._builds: Optional[Iterator[Dict[str, Any]]] = None
+
+    def run_sync(self, discover: Callable[[], Iterable[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Run the pipeline to completion on a new event loop in the calling thread.
+
+        Args:
+            discover: Callable returning the builds to process. It may return a
+                lazy iterator; builds are fed to the fetchers as they are produced.
+
+        Returns:
+            The finished builds in completion order.
+        """
+        return asyncio.run(self.run(discover))
+
+    def cancel(self) -> None:
+        """Stop the run. Safe to call from any thread; builds already written are kept."""
+        if self._cancel_requested.is_set():
+            return
+        self._cancel_requested.set()
+        loop, task = self._loop, self._main_task
+        if loop is None or task is None or loop.is_closed():
+            # Not started yet (run() checks the flag) or already over
+            return
+        try:
+            loop.call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            # The loop closed in the meantime
+            pass
+
+    async def run(self, discover: Callable[[], Iterable[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Run the pipeline until every discovered build has been written.
+
+        Args:
+            discover: Callable returning the builds to process.
+
+        Returns:
+            The finished builds in completion order. If the run was cancelled,
+            `cancelled` is set and only the builds written so far are returned.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._main_task = asyncio.current_task()
+        if self._cancel_requested.is_set():
+            self.cancelled = True
+            return self.results
+
+        self._fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._parse_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.parse_workers)
+        # Unbounded: escalations come from the parsers, which must never block on the browsers
+        self._browser_queue: asyncio.Queue = asyncio.Queue()
+        self._result_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._finished = asyncio.Event()
+
+        executors = {
+            "discovery": ThreadPoolExecutor(max_workers=1, thread_name_prefix="discovery"),
+            "http": ThreadPoolExecutor(max_workers=self.http_workers, thread_name_prefix="http-fetch"),
+            "browser": ThreadPoolExecutor(max_workers=self.browser_workers, thread_name_prefix="browser-fetch"),
+            "parse": self._create_parse_executor(),
+            # Page-cache reads and writes around the extraction processes
+            "cache": ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix="page-cache"),
+            "writer": ThreadPoolExecutor(max_workers=1, thread_name_prefix="writer"),
+        }
+        self._executors = executors
+
+        tasks = [asyncio.create_task(self._discover(discover), name="discovery")]
+        tasks += [asyncio.create_task(self._http_fetcher(), name=f"http-{i}") for i in range(self.http_workers)]
+        tasks += [asyncio.create_task(self._browser_fetcher(), name=f"browser-{i}") for i in range(self.browser_workers)]
+        tasks += [asyncio.create_task(self._parser(), name=f"parse-{i}") for i in range(self.parse_workers)]
+        tasks.append(asyncio.create_task(self._writer(), name="writer"))
+        finished_waiter = asyncio.create_task(self._finished.wait())
+
+        try:
+            pending = set(tasks)
+            while not self._finished.is_set():
+                done, pending = await asyncio.wait(pending | {finished_waiter},
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is not finished_waiter and task.exception() is not None:
+                        raise task.exception()
+                pending.discard(finished_waiter)
+        except asyncio.CancelledError:
+            if not self._cancel_requested.is_set():
+                raise
+            self.cancelled = True
+            logger.info("Pipeline cancelled after %d of %d builds", self.stats.written, self.stats.discovered)
+        finally:
+            retry_tasks = list(self._retry_tasks)
+            for task in tasks + retry_tasks + [finished_waiter]:
+                task.cancel()
+            await asyncio.gather(*tasks, *retry_tasks, finished_waiter, return_exceptions=True)
+            for name, executor in executors.items():
+                # The shared process pool outlives the run; its queued calls were
+                # cancelled together with the tasks waiting for them
+                if name != "discovery" and executor is not _parse_pool:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            # Discovery may be driving the scraper's browser; it must not outlive the run
+            await self._loop.run_in_executor(None, self._close_discovery)
+
+        return self.results
+
+    def _create_parse_executor(self) -> Executor:
+        """Create the executor that runs equipment extraction."""
+        if self.parse_processes:
+            return get_parse_pool(self.parse_processes)
+        return ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix="parse")
+
+    async def _call(self, executor: str, func: Callable, *args: Any) -> Any:
+        """Run a blocking call in one of the pipeline's executors."""
+        return await self._loop.run_in_executor(self._executors[executor], func, *args)
+
+    def _next_build(self, builds: Iterator[Dict[str, Any]]) -> Any:
+        """Get the next discovered build in the discovery thread, or _END once discovery is over or cancelled."""
+        if self._cancel_requested.is_set():
+            return _END
+        return next(builds, _END)
+
+    def _close_discovery(self) -> None:
+        """Wait for the discovery thread to finish its current step, then close the discovery iterator."""
+        self._executors["discovery"].shutdown(wait=True, cancel_futures=True)
+        close = getattr(self._builds, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                logger.warning("Closing build discovery failed: %s", e)
+
+    def _check_finished(self) -> None:
+        """Signal completion once discovery is over and every build has been written."""
+        if self.stats.discovery_done and self.stats.in_flight == 0:
+            self._finished.set()
+
+    async def _discover(self, discover: Callable[[], Iterable[Dict[str, Any]]]) -> None:
+        """Producer: feed discovered builds into the bounded fetch queue."""
+        builds = self._builds = iter(await self._call("discovery", discover))
+        while True:
+            build = await self._call("discovery", self._next_build, builds)
+            if build is _END:
+                break
+            self.stats.discovered += 1
+            # Blocks while the fetchers are behind
+            await self._fetch_queue.put(build)
+        self.stats.discovery_done = True
+        logger.info("Discovery finished with %d builds", self.stats.discovered)
+        self._check_finished()
+
+    async def _http_fetcher(self) -> None:
+        """Fetch pages over HTTP, escalating failures to the browser fetchers."""
+        while True:
+            build = await self._fetch_queue.get()
+            url = build['url']
+
+            if self.scraper.offline:
+                # Offline extraction reads the page cache; there is nothing to fetch
+                try:
+                    equipment, method = await self._call("cache", self.scraper.fetch_build_equipment, url)
+                    await self._result_queue.put((build, equipment, method, None))
+                except Exception as e:
+                    await self._result_queue.put((build, [], FETCH_METHOD_CACHE, e))
+                continue
+
+            try:
+                page, html = await self._call("http", self.scraper.fetch_page, url, FETCH_METHOD_HTTP)
+            except Exception as e:
+                if _is_transient(e) and self._retry(self._fetch_queue, build, FETCH_METHOD_HTTP, e):
+                    continue
+                logger.warning(f"HTTP fetch failed, falling back to Selenium: {e}")
+                self._escalate(build)
+                continue
+            self.stats.fetched += 1
+            await self._parse_queue.put((build, FETCH_METHOD_HTTP, page, html))
+
+    async def _browser_fetcher(self) -> None:
+        """Load pages in the pooled headless browsers."""
+        while True:
+            build = await self._browser_queue.get()
+            try:
+                page, html = await self._call("browser", self.scraper.fetch_page, build['url'], FETCH_METHOD_SELENIUM)
+            except Exception as e:
+                if self._retry(self._browser_queue, build, FETCH_METHOD_SELENIUM, e):
+                    continue
+                logger.error(f"Error fetching build equipment with Selenium: {e}")
+                await self._result_queue.put((build, [], FETCH_METHOD_SELENIUM, e))
+                continue
+            self.stats.fetched += 1
+            await self._parse_queue.put((build, FETCH_METHOD_SELENIUM, page, html))
+
+    def _escalate(self, build: Dict[str, Any]) -> None:
+        """Hand a build to the browser fetchers."""
+        self.stats.escalated += 1
+        self._browser_queue.put_nowait(build)
+
+    def _retry(self, queue: asyncio.Queue, build: Dict[str, Any], method: str, error: Exception) -> bool:
+        """
+        Put a build back on a fetch queue after a backoff, unless it ran out of retries.
+
+        Args:
+            queue: The queue of the fetchers that failed.
+            build: The build to fetch again.
+            method: The fetch method that failed.
+            error: The failure.
+
+        Returns:
+            True if a retry was scheduled.
+        """
+        key = (build['url'], method)
+        attempt = self._attempts.get(key, 0) + 1
+        if attempt > self.max_retries:
+            return False
+        self._attempts[key] = attempt
+        self.stats.retried += 1
+
+        delay = _backoff_delay(attempt, error)
+        logger.warning(f"Retrying {build['url']} over {method} in {delay:.1f}s "
+                       f"(attempt {attempt} of {self.max_retries}): {error}")
+        task = asyncio.create_task(self._requeue(queue, build, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+        return True
+
+    async def _requeue(self, queue: asyncio.Queue, build: Dict[str, Any], delay: float) -> None:
+        await asyncio.sleep(delay)
+        await queue.put(build)
+
+    async def _parser(self) -> None:
+        """Extract equipment from fetched pages."""
+        while True:
+            build, method, page, html = await self._parse_queue.get()
+            try:
+                equipment = await self._extract(page, html)
+            except Exception as e:
+                if method == FETCH_METHOD_HTTP:
+                    logger.warning(f"HTTP fetch failed, falling back to Selenium: {e}")
+                    self._escalate(build)
+                else:
+                    logger.error(f"Error fetching build equipment with Selenium: {e}")
+                    await self._result_queue.put((build, [], method, e))
+                continue
+            self.stats.parsed += 1
+
+            if not equipment and method == FETCH_METHOD_HTTP:
+                # Expected for client-rendered guides, so not a sign of congestion
+                logger.info(f"No equipment found in server-rendered HTML, falling back to Selenium: {build['url']}")
+                self._escalate(build)
+                continue
+            if not equipment:
+                # A rendered page without equipment is usually a throttled or half-loaded one
+                self.scraper.browser_concurrency.record_congestion("empty page")
+                error = RuntimeError(f"No equipment found on {build['url']}")
+                if not self._retry(self._browser_queue, build, method, error):
+                    await self._result_queue.put((build, [], method, error))
+                continue
+            await self._result_queue.put((build, equipment, method, None))
+
+    async def _extract(self, page: Optional[CachedPage], html: Optional[str]) -> List[Dict[str, str]]:
+        """Extract equipment from a fetched page, reusing the cached result if its content is unchanged."""
+        if not self.parse_processes:
+            return await self._call("parse", self.scraper.extract_page, page, html)
+
+        if page is not None:
+            equipment = await self._call("cache", self.scraper.get_cached_extraction, page)
+            if equipment is not None:
+                return equipment
+            if html is None:
+                html = await self._call("cache", self.scraper.page_cache.read_html, page)
+
+        try:
+            equipment = await self._call("parse", extract_equipment, html, self.scraper.known_uniques)
+        except BrokenProcessPool:
+            # A worker died; extract the rest of the run in threads
+            if self.parse_processes:
+                logger.error("Extraction process pool broke, extracting in threads from now on")
+                self.parse_processes = 0
+                discard_parse_pool(self._executors["parse"])
+                self._executors["parse"] = ThreadPoolExecutor(max_workers=self.parse_workers,
+                                                              thread_name_prefix="parse")
+            return await self._call("parse", self.scraper.extract_page, page, html)
+
+        if page is not None:
+            await self._call("cache", self.scraper.store_extraction, page, equipment)
+        return equipment
+
+    async def _writer(self) -> None:
+        """Single writer: record each finished build and report it."""
+        while True:
+            build, equipment, method, error = await self._result_queue.get()
+            if error is not None:
+                # Keep any equipment the build already has rather than storing an empty list
+                build.setdefault('equipment', [])
+                build['fetch_error'] = str(error).strip()
+                self.stats.failed += 1
+                logger.error(f"Error getting equipment for build {build.get('title')}: {error}")
+            else:
+                build['equipment'] = equipment
+                build['fetch_method'] = method
+                build.pop('fetch_error', None)
+                logger.info(f"Found {len(equipment)} equipment items for build: {build.get('title')}")
+
+            self.stats.written += 1
+            self.results.append(build)
+            if self.on_result:
+                await self._call("writer", self.on_result, build, error)
+            self._check_finished()
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether an HTTP fetch failure is worth retrying: a timeout, dropped connection or throttled response."""
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in THROTTLE_STATUS_CODES
+
+
+def _backoff_delay(attempt: int, error: Exception) -> float:
+    """
+    Compute the delay before a retry: exponential backoff with jitter.
+
+    Half of the delay is fixed and half is random, so workers that failed
+    together spread out. A Retry-After header sent by the server is honored.
+
+    Args:
+        attempt: The retry number, starting at 1.
+        error: The failure being retried.
+
+    Returns:
+        The delay in seconds.
+    """
+    ceiling = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.strip().isdigit():
+        delay = max(delay, min(RETRY_MAX_DELAY, float(retry_after)))
+    return delay
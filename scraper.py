@@ -6,8 +6,20 @@ import os
 import time
 import argparse
 import re
-from typing import Dict, List, Any, Optional
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+from requests.adapters import HTTPAdapter
 from item_translator import ItemTranslator
+from build_store import BuildSnapshot, BuildStore, get_build_store
+from driver_pool import DriverPool
+from rate_limit import AdaptiveConcurrency, TokenBucket, THROTTLE_STATUS_CODES
+from page_cache import (CachedPage, PageCache, DEFAULT_CACHE_DIR, FETCH_METHOD_CACHE, FETCH_METHOD_HTTP,
+                        FETCH_METHOD_SELENIUM, catalog_hash)
+from scrape_pipeline import ScrapePipeline, DEFAULT_PARSE_PROCESSES
+from equipment_extractor import extract_equipment, process_equipment_item
+from item_matcher import get_item_matcher
+from tag_engine import TagEngine
 
 # Platform detection for ChromeDriver path
 import platform
@@ -50,6 +62,82 @@ SEASON_TAGS = {
     "season 8": ["season 8", "belial's return"]
 }
 
+# All tag vocabularies compiled into one matcher
+TAG_ENGINE = TagEngine(D4_CLASSES, BUILD_TYPES, SKILL_TAGS, SEASON_TAGS)
+
+# "Last Updated: September 25, 2025" as shown on build guide cards
+LAST_UPDATED_PATTERN = re.compile(r'Last Updated:\s*([A-Z][a-z]+\s+\d{1,2},\s*\d{4})')
+
+# CSS selectors for build cards on the build guides page, in order of preference
+BUILD_CARD_SELECTORS = ["article", ".d4-build-card", ".build-card", ".guide-card", ".guide-item", ".content-card"]
+
+# Build discovery backends
+DISCOVERY_SELENIUM = "selenium"
+DISCOVERY_SITEMAP = "sitemap"
+DISCOVERY_BACKENDS = [DISCOVERY_SELENIUM, DISCOVERY_SITEMAP]
+
+# Build guide URLs in the sitemap, e.g. https://maxroll.gg/d4/build-guides/penetrating-shot-rogue-guide
+BUILD_GUIDE_URL_PATTERN = re.compile(r'/d4/build-guides/([^/?#]+)/?$')
+
+# Infinite scroll: how long the card count may stay unchanged before the list is
+# considered complete, and the overall time limit for loading the build list
+SCROLL_IDLE_TIMEOUT = 3.0
+SCROLL_DEADLINE = 120.0
+
+CARD_COUNT_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+
+# Returns the outer HTML of the build cards after the first arguments[1] ones
+NEW_CARDS_HTML_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).slice(arguments[1]).map(function (card) {
+    return card.outerHTML;
+});
+"""
+
+# Scrolls to the bottom and resolves as soon as more cards than `previous` exist,
+# or with the unchanged count once no new card appeared for `idleMs`.
+WAIT_FOR_MORE_CARDS_SCRIPT = """
+const [selector, previous, idleMs, done] = arguments;
+const count = () => document.querySelectorAll(selector).length;
+let timer = null;
+const observer = new MutationObserver(() => {
+    const current = count();
+    if (current > previous) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(current);
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(() => { observer.disconnect(); done(count()); }, idleMs);
+window.scrollTo(0, document.body.scrollHeight);
+if (count() > previous) {
+    observer.disconnect();
+    clearTimeout(timer);
+    done(count());
+}
+"""
+
+# Defaults for concurrent equipment scraping
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+DEFAULT_REQUEST_BURST = 2
+
+# Upper bound of the adaptive number of concurrent HTTP page requests
+DEFAULT_MAX_CONCURRENCY = 16
+
+# Timeout in seconds for plain HTTP page requests
+HTTP_TIMEOUT = 15
+
+# Timeout in seconds for a guide page to render in the browser
+SELENIUM_PAGE_TIMEOUT = 10
+
+# Page latency in seconds above which the server is treated as congested
+HTTP_LATENCY_TARGET = 5.0
+SELENIUM_LATENCY_TARGET = 20.0
+
+# Bump whenever the equipment extractor changes so cached extraction results are redone
+EXTRACTOR_VERSION = 4
+
 # Known unique items in Diablo 4
 KNOWN_UNIQUES = [
     # Weapons
@@ -88,27 +176,109 @@ from webdriver_manager.chrome import ChromeDriverManager
 # End of imports
 logger = logging.getLogger(__name__)
 
+def parse_last_updated(text: str) -> Optional[str]:
+    """
+    Extract the "Last Updated" date from a build card title.
+    
+    Args:
+        text: Card text such as "... Build GuideBy mattias | Last Updated: September 25, 2025Endgame".
+        
+    Returns:
+        The date in ISO format (e.g. "2025-09-25"), or None if no date was found.
+    """
+    match = LAST_UPDATED_PATTERN.search(text or "")
+    if not match:
+        return None
+    try:
+        return datetime.strptime(re.sub(r'\s+', ' ', match.group(1)), "%B %d, %Y").date().isoformat()
+    except ValueError:
+        return None
+
+def build_last_updated(build: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the "Last Updated" date of a build, deriving it from the title for older data.
+    
+    Args:
+        build: A build dictionary.
+        
+    Returns:
+        The date in ISO format, or None if it is unknown.
+    """
+    return build.get("last_updated") or parse_last_updated(build.get("title", ""))
+
 class Scraper:
     """A scraper to extract Diablo 4 build data from MaxRoll.gg."""
     
-    def __init__(self, base_url: str = "https://maxroll.gg"):
+    def __init__(self, base_url: str = "https://maxroll.gg", build_store: Optional[BuildStore] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, offline: bool = False,
+                 discovery: str = DISCOVERY_SELENIUM, parse_processes: int = DEFAULT_PARSE_PROCESSES):
         """
         Initialize the scraper.
         
         Args:
             base_url: The base URL for the MaxRoll website.
+            build_store: Store holding the resident builds dataset. Defaults to the global store.
+            max_workers: Number of build pages fetched concurrently at first. The
+                number adapts to the server's latency and errors, up to
+                DEFAULT_MAX_CONCURRENCY over HTTP and the driver pool size in the browser.
+            requests_per_second: Sustained page request rate shared by all workers.
+            cache_dir: Directory of the on-disk page cache, or None to disable caching.
+            offline: Extract equipment purely from the page cache without any network access.
+            discovery: Build discovery backend, DISCOVERY_SELENIUM (infinite-scroll listing page)
+                or DISCOVERY_SITEMAP (plain HTTP sitemap, falling back to Selenium).
+            parse_processes: Number of worker processes extracting equipment during a
+                refresh, or 0 to extract in threads of this process.
         """
         self.base_url = base_url
         self.builds_url = f"{base_url}/d4/build-guides"
+        self.sitemap_url = f"{base_url}/sitemap.xml"
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
         # Internal cache file for the scraper (different from the app's all_builds.json output file)
         self.builds_data_file = "scraper_cache.json"
         self.driver = None
+        self.max_workers = max(1, max_workers)
+        # One rate limiter shared by all workers replaces fixed sleeps between pages
+        self.rate_limiter = TokenBucket(requests_per_second, DEFAULT_REQUEST_BURST)
+        # Warm WebDrivers reused across build pages, one per worker
+        self.driver_pool = DriverPool(self._init_selenium_driver, max_size=self.max_workers)
+        # Concurrency limits that back off when the server struggles (AIMD)
+        self.http_concurrency = AdaptiveConcurrency(
+            "http", initial=self.max_workers, maximum=max(self.max_workers, DEFAULT_MAX_CONCURRENCY),
+            latency_target=HTTP_LATENCY_TARGET
+        )
+        self.browser_concurrency = AdaptiveConcurrency(
+            "browser", initial=self.driver_pool.max_size, maximum=self.driver_pool.max_size,
+            latency_target=SELENIUM_LATENCY_TARGET
+        )
+        # Keep-alive HTTP session for server-rendered pages, one pooled connection per worker
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.http_concurrency.maximum)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # On-disk page cache used for conditional requests and offline extraction
+        self.page_cache = PageCache(cache_dir) if cache_dir else None
+        self.offline = offline
+        if offline and not self.page_cache:
+            raise ValueError("Offline mode requires a page cache")
+        if discovery not in DISCOVERY_BACKENDS:
+            raise ValueError(f"Unknown discovery backend: {discovery}")
+        self.discovery = discovery
+        self.parse_processes = max(0, parse_processes)
+        self.build_store = build_store or get_build_store()
         
         # Initialize item translator for Chinese name support
         self.translator = ItemTranslator()
+        # Full unique item catalog: the hand-picked names first, then every translated item
+        self.known_uniques = KNOWN_UNIQUES + self.translator.get_english_names()
+        self.item_matcher = get_item_matcher(self.known_uniques)
+        # Cached extractions are only reused with the catalog they were made with
+        self.catalog_hash = catalog_hash(self.known_uniques)
     
     def __del__(self):
         """
@@ -118,9 +288,15 @@ class Scraper:
     
     def close(self):
         """
-        Close the Selenium WebDriver and clean up resources.
+        Close the Selenium WebDrivers and clean up resources.
         """
-        if self.driver:
+        driver_pool = getattr(self, "driver_pool", None)
+        if driver_pool:
+            driver_pool.close()
+        session = getattr(self, "session", None)
+        if session:
+            session.close()
+        if getattr(self, "driver", None):
             try:
                 self.driver.quit()
             except Exception as e:
@@ -172,10 +348,44 @@ class Scraper:
         Returns:
             A list of dictionaries containing build information.
         """
+        return list(self.iter_build_list())
+    
+    def iter_build_list(self, should_stop: Optional[Callable[[], bool]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Discover builds, yielding each one as soon as it is found.
+        
+        With the Selenium backend new cards are yielded after every scroll step,
+        so equipment fetching can start while the page is still loading more.
+        
+        Args:
+            should_stop: Called between scroll steps; discovery ends early once it
+                returns True, e.g. because the refresh was cancelled.
+        
+        Yields:
+            Dictionaries containing build information, without duplicate URLs.
+        """
         logger.info(f"Fetching build list from {self.builds_url}")
         
+        if self.offline:
+            raise RuntimeError("Build discovery is not available in offline mode")
+        
+        seen_urls = set()
+        if self.discovery == DISCOVERY_SITEMAP:
+            try:
+                for build in self._iter_build_list_sitemap():
+                    seen_urls.add(build["url"])
+                    yield build
+                if seen_urls:
+                    return
+                logger.warning("Sitemap listed no build guides, falling back to Selenium")
+            except Exception as e:
+                logger.warning(f"Sitemap discovery failed, falling back to Selenium: {e}")
+        
         try:
-            return self._get_build_list_selenium()
+            for build in self._iter_build_list_selenium(should_stop):
+                if build["url"] not in seen_urls:
+                    seen_urls.add(build["url"])
+                    yield build
         except Exception as e:
             logger.error(f"Error fetching build list: {e}")
             raise RuntimeError(f"Failed to fetch build list: {e}")
@@ -187,8 +397,27 @@ class Scraper:
         Returns:
             A list of dictionaries containing build information.
         """
+        return list(self._iter_build_list_selenium())
+    
+    def _iter_build_list_selenium(self, should_stop: Optional[Callable[[], bool]] = None
+                                  ) -> Iterator[Dict[str, Any]]:
+        """
+        Discover builds using Selenium, yielding the cards of each scroll step as they load.
+        
+        Only the HTML of cards that appeared since the previous step is pulled from
+        the browser and parsed. A final parse of the whole page picks up anything
+        the incremental passes missed.
+        
+        Args:
+            should_stop: Called before every scroll step; returning True stops
+                scrolling and yields nothing more.
+        
+        Yields:
+            Dictionaries containing build information.
+        """
         logger.info("Using Selenium to fetch build list")
         
+        seen_urls = set()
         try:
             # Initialize the driver if not already done
             if not self.driver:
@@ -203,7 +432,7 @@ class Scraper:
             logger.info("Page requested, waiting for build cards to appear...")
             
             # Try 'article' selector first, then fallback to others if needed
-            selectors = ["article", ".d4-build-card", ".build-card", ".guide-card", ".guide-item", ".content-card"]
+            selectors = BUILD_CARD_SELECTORS
             wait = WebDriverWait(self.driver, 10)
             found_selector = None
 
@@ -230,137 +459,288 @@ class Scraper:
             else:
                 logger.info(f"Proceeding to parse page source using selector: {found_selector}")
 
-            # Scroll to the bottom of the page to load all builds (infinite scroll)
+            # Scroll to the bottom of the page to load all builds (infinite scroll).
+            # Each step waits for the card count to grow (via a MutationObserver)
+            # instead of sleeping a fixed time, and stops once it stays idle.
+            # The cards loaded by each step are parsed and yielded right away.
             logger.info("Scrolling to load all builds...")
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            card_selector = found_selector or "article"
+            self.driver.set_script_timeout(SCROLL_IDLE_TIMEOUT + 5)
+            card_count = self.driver.execute_script(CARD_COUNT_SCRIPT, card_selector)
+            parsed_cards = 0
+            deadline = time.monotonic() + SCROLL_DEADLINE
             scroll_attempt = 1
             while True:
-                logger.info(f"Scroll attempt {scroll_attempt}: Scrolling to bottom...")
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)  # Wait for new builds to load
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
+                builds, parsed_cards = self._parse_new_cards(card_selector, parsed_cards, seen_urls)
+                yield from builds
+                
+                if should_stop and should_stop():
+                    logger.info(f"Build discovery stopped after {len(seen_urls)} builds")
+                    return
+                logger.info(f"Scroll attempt {scroll_attempt}: {card_count} build cards loaded, scrolling to bottom...")
+                new_count = self.driver.execute_async_script(
+                    WAIT_FOR_MORE_CARDS_SCRIPT, card_selector, card_count, int(SCROLL_IDLE_TIMEOUT * 1000)
+                )
+                if new_count <= card_count:
                     logger.info("No more content loaded after scrolling. Assuming all builds are loaded.")
                     break
-                last_height = new_height
+                card_count = new_count
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Stopped scrolling after {SCROLL_DEADLINE} seconds with {card_count} build cards loaded")
+                    break
                 scroll_attempt += 1
+            builds, parsed_cards = self._parse_new_cards(card_selector, parsed_cards, seen_urls)
+            yield from builds
+            
             logger.info("Fetching page source and parsing with BeautifulSoup...")
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Try to find build cards with various selectors
-            builds = []
-            for selector in selectors:
-                build_cards = soup.select(selector)
-                if build_cards:
-                    logger.info(f"Found {len(build_cards)} build cards with selector: {selector}")
-                    
-                    # Save a sample build card HTML to a file for inspection
-                    if len(build_cards) > 0:
-                        with open("sample_build_card.html", "w", encoding="utf-8") as f:
-                            f.write(str(build_cards[0]))
-                        logger.info("Saved sample build card HTML to sample_build_card.html")
-                    for card in build_cards:
-                        # Try to extract title and link (several possible selectors)
-                        title_elem = card.select_one(".title, h2, h3, .card-title, .guide-title, a")
-                        if not title_elem:
-                            logger.info("Skipping card: No title element found")
-                            continue
-                        
-                        title = title_elem.text.strip()
-                        # Skip if title is too short
-                        if len(title) < 5:
-                            logger.info(f"Skipping card: Title too short: '{title}'")
-                            continue
-                            
-                        # Check if it looks like a build guide title
-                        if not any(class_name in title.lower() for class_name in D4_CLASSES_LOWER):
-                            logger.info(f"Skipping card: No class name in title: '{title}'")
-                            continue
-                        
-                        link_elem = card.select_one("a")
-                        if not link_elem:
-                            logger.info(f"Skipping card with title '{title}': No link element found")
-                            continue
-                        
-                        link = link_elem.get("href")
-                        if not link:
-                            logger.info(f"Skipping card with title '{title}': Empty link")
-                            continue
-                            
-                        if not "/d4/build-guides/" in link:
-                            logger.info(f"Skipping card with title '{title}': Not a build guide link: {link}")
-                            continue
-                            
-                        full_url = f"{self.base_url}{link}" if link.startswith("/") else link
-                        
-                        # Extract class name from the title or dedicated element
-                        class_elem = card.select_one(".class, .character-class, .build-class")
-                        class_name = class_elem.text.strip() if class_elem else "Unknown"
-                        
-                        # If class name is unknown, try to extract it from the title
-                        if class_name == "Unknown":
-                            for c in D4_CLASSES:
-                                if c.lower() in title.lower():
-                                    class_name = c
-                                    break
-                        
-                        # Extract difficulty
-                        difficulty_elem = card.select_one(".difficulty, .build-difficulty")
-                        difficulty_text = difficulty_elem.text.strip() if difficulty_elem else "Medium"
-                        
-                        # Extract tags from the title since MaxRoll doesn't have explicit tag elements
-                        title_lower = title.lower()
-                        tags = []
-                        
-                        # Extract build type tag (Endgame or Leveling)
-                        for build_type in BUILD_TYPES:
-                            if build_type in title_lower:
-                                tags.append(build_type)
-                                break
-                        
-                        # Extract class tag
-                        for class_tag in D4_CLASSES_LOWER:
-                            if class_tag in title_lower:
-                                tags.append(class_tag)
-                        
-                        # Extract skill/build type tags
-                        for skill_tag in SKILL_TAGS:
-                            if skill_tag in title_lower:
-                                tags.append(skill_tag)
-                        
-                        # Add Season tags
-                        for season_key, season_values in SEASON_TAGS.items():
-                            if season_key in title_lower or any(tag in title_lower for tag in season_values):
-                                for tag in season_values:
-                                    tags.append(tag)
-                        
-                        # Create a build entry
-                        build_data = {
-                            "title": title,
-                            "url": full_url,
-                            "class": class_name,
-                            "difficulty": difficulty_text,
-                            "tags": tags,
-                            "equipment": []  # Will be populated later
-                        }
-                        
-                        # Avoid duplicates
-                        if any(b["url"] == full_url for b in builds):
-                            logger.info(f"Skipping duplicate build: {title} ({full_url})")
-                        else:
-                            builds.append(build_data)
-                    
-                    # If we found builds with this selector, we can break
-                    if builds:
-                        break
+            for build in self._parse_build_cards(self.driver.page_source, save_sample=not seen_urls):
+                if build["url"] not in seen_urls:
+                    seen_urls.add(build["url"])
+                    yield build
             
-            logger.info(f"Found {len(builds)} builds using Selenium")
-            return builds if builds else self._get_build_list_fallback()
+            logger.info(f"Found {len(seen_urls)} builds using Selenium")
             
         except Exception as e:
             logger.error(f"Error fetching build list with Selenium: {e}")
-            return self._get_build_list_fallback()
+        
+        if not seen_urls:
+            yield from self._get_build_list_fallback()
+    
+    def _parse_new_cards(self, card_selector: str, parsed_cards: int, seen_urls: set
+                         ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Parse the build cards that appeared in the browser since the last call.
+        
+        Args:
+            card_selector: CSS selector of the build cards.
+            parsed_cards: Number of cards already parsed.
+            seen_urls: URLs already yielded; updated with the new builds.
+            
+        Returns:
+            A tuple of (new builds, number of cards parsed so far).
+        """
+        cards_html = self.driver.execute_script(NEW_CARDS_HTML_SCRIPT, card_selector, parsed_cards)
+        if not isinstance(cards_html, list) or not cards_html:
+            return [], parsed_cards
+        
+        if parsed_cards == 0:
+            # Save a sample build card HTML to a file for inspection
+            with open("sample_build_card.html", "w", encoding="utf-8") as f:
+                f.write(cards_html[0])
+            logger.info("Saved sample build card HTML to sample_build_card.html")
+        
+        builds = []
+        for card_html in cards_html:
+            card = BeautifulSoup(card_html, 'html.parser').find()
+            build_data = self._parse_card(card) if card else None
+            if not build_data:
+                continue
+            if build_data["url"] in seen_urls:
+                logger.info(f"Skipping duplicate build: {build_data['title']} ({build_data['url']})")
+                continue
+            seen_urls.add(build_data["url"])
+            builds.append(build_data)
+        
+        logger.info(f"Parsed {len(cards_html)} new build cards, {len(builds)} new builds")
+        return builds, parsed_cards + len(cards_html)
+    
+    def _iter_build_list_sitemap(self) -> Iterator[Dict[str, Any]]:
+        """
+        Discover builds from the site's XML sitemap using plain HTTP.
+        
+        Sitemap indexes are followed into the child sitemaps that cover Diablo 4.
+        The builds of each sitemap are yielded as soon as it is parsed.
+        
+        Yields:
+            Dictionaries containing build information.
+        """
+        logger.info(f"Using sitemap to fetch build list: {self.sitemap_url}")
+        
+        seen_urls = set()
+        pending_sitemaps = [self.sitemap_url]
+        visited_sitemaps = set()
+        while pending_sitemaps:
+            sitemap_url = pending_sitemaps.pop(0)
+            if sitemap_url in visited_sitemaps:
+                continue
+            visited_sitemaps.add(sitemap_url)
+            
+            self.rate_limiter.acquire()
+            response = self.session.get(sitemap_url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            
+            sitemap_builds, child_sitemaps = self._parse_sitemap(response.text)
+            for build in sitemap_builds:
+                if build["url"] not in seen_urls:
+                    seen_urls.add(build["url"])
+                    yield build
+            pending_sitemaps.extend(url for url in child_sitemaps if "d4" in url or "build" in url)
+        
+        logger.info(f"Found {len(seen_urls)} builds using the sitemap")
+    
+    def _parse_sitemap(self, xml_text: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Parse a sitemap or sitemap index.
+        
+        Guide titles are derived from the URL slug (e.g. "penetrating-shot-rogue-guide"
+        becomes "Penetrating Shot Rogue Guide") and go through the same entry and tag
+        logic as build cards. The <lastmod> date is used as the "Last Updated" date.
+        
+        Args:
+            xml_text: The sitemap XML.
+            
+        Returns:
+            A tuple of (builds found in a urlset, child sitemap URLs of a sitemap index).
+        """
+        root = ET.fromstring(xml_text)
+        
+        if root.tag.endswith("sitemapindex"):
+            child_sitemaps = [loc.text.strip() for loc in root.iter() if loc.tag.endswith("loc") and loc.text]
+            return [], child_sitemaps
+        
+        builds = []
+        for url_elem in root:
+            loc = next((child.text for child in url_elem if child.tag.endswith("loc")), None)
+            lastmod = next((child.text for child in url_elem if child.tag.endswith("lastmod")), None)
+            match = BUILD_GUIDE_URL_PATTERN.search((loc or "").strip())
+            if not match:
+                continue
+            
+            title = match.group(1).replace("-", " ").title()
+            last_updated = lastmod.strip()[:10] if lastmod else None
+            build_data = self._make_build_entry(title, loc.strip(), last_updated=last_updated)
+            if build_data:
+                builds.append(build_data)
+        return builds, []
+    
+    def _parse_build_cards(self, page_source: str, save_sample: bool = False) -> List[Dict[str, Any]]:
+        """
+        Parse build cards from the HTML of the build guides page.
+        
+        Args:
+            page_source: The fully loaded HTML of the build guides page.
+            save_sample: Save the first card's HTML to sample_build_card.html for inspection.
+            
+        Returns:
+            A list of dictionaries containing build information.
+        """
+        soup = BeautifulSoup(page_source, 'html.parser')
+        
+        # Try to find build cards with various selectors
+        builds = []
+        seen_urls = set()
+        for selector in BUILD_CARD_SELECTORS:
+            build_cards = soup.select(selector)
+            if build_cards:
+                logger.info(f"Found {len(build_cards)} build cards with selector: {selector}")
+                
+                # Save a sample build card HTML to a file for inspection
+                if save_sample:
+                    with open("sample_build_card.html", "w", encoding="utf-8") as f:
+                        f.write(str(build_cards[0]))
+                    logger.info("Saved sample build card HTML to sample_build_card.html")
+                for card in build_cards:
+                    build_data = self._parse_card(card)
+                    if not build_data:
+                        continue
+                    
+                    # Avoid duplicates
+                    if build_data["url"] in seen_urls:
+                        logger.info(f"Skipping duplicate build: {build_data['title']} ({build_data['url']})")
+                    else:
+                        seen_urls.add(build_data["url"])
+                        builds.append(build_data)
+                
+                # If we found builds with this selector, we can break
+                if builds:
+                    break
+        
+        return builds
+    
+    def _parse_card(self, card: Any) -> Optional[Dict[str, Any]]:
+        """
+        Turn one build card element into a build entry.
+        
+        Args:
+            card: The BeautifulSoup element of the card.
+            
+        Returns:
+            The build dictionary, or None if the card is not a build guide.
+        """
+        # Try to extract title and link (several possible selectors)
+        title_elem = card.select_one(".title, h2, h3, .card-title, .guide-title, a")
+        if not title_elem:
+            logger.info("Skipping card: No title element found")
+            return None
+        
+        title = title_elem.text.strip()
+        link_elem = card.select_one("a")
+        link = link_elem.get("href") if link_elem else None
+        
+        # Extract class name from a dedicated element if present
+        class_elem = card.select_one(".class, .character-class, .build-class")
+        class_name = class_elem.text.strip() if class_elem else "Unknown"
+        
+        # Extract difficulty
+        difficulty_elem = card.select_one(".difficulty, .build-difficulty")
+        difficulty_text = difficulty_elem.text.strip() if difficulty_elem else "Medium"
+        
+        return self._make_build_entry(title, link, class_name, difficulty_text)
+    
+    def _make_build_entry(self, title: str, link: Optional[str], class_name: str = "Unknown",
+                          difficulty_text: str = "Medium", last_updated: Optional[str] = None
+                          ) -> Optional[Dict[str, Any]]:
+        """
+        Validate a discovered guide and turn it into a build entry with tags.
+        
+        Shared by every discovery backend so they produce identical entries.
+        
+        Args:
+            title: The guide title (card text or a title derived from the URL).
+            link: The guide link, absolute or relative to the base URL.
+            class_name: The class if known from a dedicated element, else "Unknown".
+            difficulty_text: The difficulty label.
+            last_updated: ISO date of the last guide update if known; otherwise it is
+                parsed from the title.
+            
+        Returns:
+            The build dictionary, or None if this does not look like a build guide.
+        """
+        # Skip if title is too short
+        if len(title) < 5:
+            logger.info(f"Skipping card: Title too short: '{title}'")
+            return None
+            
+        # Tag the title in one pass; a build guide title names a class
+        title_classes, tags = TAG_ENGINE.analyze(title)
+        if not title_classes:
+            logger.info(f"Skipping card: No class name in title: '{title}'")
+            return None
+        
+        if not link:
+            logger.info(f"Skipping card with title '{title}': No link found")
+            return None
+            
+        if not "/d4/build-guides/" in link:
+            logger.info(f"Skipping card with title '{title}': Not a build guide link: {link}")
+            return None
+            
+        full_url = f"{self.base_url}{link}" if link.startswith("/") else link
+        
+        # If class name is unknown, take it from the title
+        if class_name == "Unknown":
+            class_name = title_classes[0]
+        
+        # Create a build entry
+        return {
+            "title": title,
+            "url": full_url,
+            "class": class_name,
+            "difficulty": difficulty_text,
+            "tags": tags,
+            "last_updated": last_updated or parse_last_updated(title),
+            "equipment": []  # Will be populated later
+        }
     
     # BeautifulSoup method removed as we're focusing solely on Selenium implementation
     
@@ -406,195 +786,311 @@ class Scraper:
         Returns:
             A list of dictionaries containing equipment information.
         """
+        equipment, _ = self.fetch_build_equipment(build_url)
+        return equipment
+    
+    def fetch_build_equipment(self, build_url: str) -> Tuple[List[Dict[str, str]], str]:
+        """
+        Extract equipment information from a build page, preferring plain HTTP.
+        
+        The server-rendered HTML is fetched with the pooled HTTP session first.
+        The page is only loaded in a headless browser when that HTML yields no
+        equipment or the request fails.
+        
+        Args:
+            build_url: The URL of the build page.
+            
+        Returns:
+            A tuple of (equipment list, fetch method), where the fetch method is
+            FETCH_METHOD_HTTP or FETCH_METHOD_SELENIUM.
+        """
         logger.info(f"Fetching equipment from {build_url}")
         
+        if self.offline:
+            return self._get_build_equipment_offline(build_url, self.known_uniques), FETCH_METHOD_CACHE
+        
+        try:
+            equipment = self._get_build_equipment_http(build_url, self.known_uniques)
+            if equipment:
+                return equipment, FETCH_METHOD_HTTP
+            logger.info(f"No equipment found in server-rendered HTML, falling back to Selenium: {build_url}")
+        except Exception as e:
+            logger.warning(f"HTTP fetch failed, falling back to Selenium: {e}")
+        
         try:
-            return self._get_build_equipment_selenium(build_url, KNOWN_UNIQUES)
+            return self._get_build_equipment_selenium(build_url, self.known_uniques), FETCH_METHOD_SELENIUM
         except Exception as e:
             logger.error(f"Error fetching build equipment: {e}")
-            return []
+            return [], FETCH_METHOD_SELENIUM
     
-    def _get_build_equipment_selenium(self, build_url: str, known_uniques: List[str] = None) -> List[Dict[str, str]]:
+    def _get_build_equipment_http(self, build_url: str, known_uniques: List[str] = None) -> List[Dict[str, str]]:
         """
-        Extract equipment information from a build page using Selenium.
+        Extract equipment information from a build page's server-rendered HTML.
         
         Args:
             build_url: The URL of the build page.
-            known_uniques: Optional list of known unique items to look for. If None, uses the global KNOWN_UNIQUES list.
+            known_uniques: Optional list of known unique items to look for. If None, uses the full unique item catalog.
             
         Returns:
             A list of dictionaries containing equipment information.
         """
-        # Use the global KNOWN_UNIQUES list if none provided
         if known_uniques is None:
-            known_uniques = KNOWN_UNIQUES
-        logger.info(f"Using Selenium to fetch equipment from {build_url}")
+            known_uniques = self.known_uniques
         
-        try:
-            # Initialize WebDriver
-            driver = self._init_selenium_driver()
-            if not driver:
-                return []
-                
-            # Navigate to the build page
-            driver.get(build_url)
+        page, html = self._fetch_page_http(build_url)
+        equipment = self._extract_page(page, html, known_uniques)
+        logger.info(f"Found {len(equipment)} equipment items using HTTP")
+        return equipment
+    
+    def _fetch_page_http(self, build_url: str) -> Tuple[Optional[CachedPage], Optional[str]]:
+        """
+        Fetch a build page's server-rendered HTML, revalidating the cached copy if there is one.
+        
+        Args:
+            build_url: The URL of the build page.
+            
+        Returns:
+            A tuple of (cache entry or None if caching is disabled, HTML or None
+            if the cached copy is still current).
+        """
+        logger.info(f"Using HTTP to fetch equipment from {build_url}")
+        
+        # Revalidate a cached copy instead of downloading it again
+        cached = self.page_cache.get(build_url, FETCH_METHOD_HTTP) if self.page_cache else None
+        headers = cached.conditional_headers() if cached else {}
+        
+        with self.http_concurrency.slot():
+            # Be nice to the server
+            self.rate_limiter.acquire()
             
-            # Wait for the page to load
+            started = time.monotonic()
             try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "h1"))
-                )
-            except TimeoutException:
-                logger.error(f"Timeout waiting for page to load: {build_url}")
-                driver.quit()
-                return []
+                response = self.session.get(build_url, headers=headers, timeout=HTTP_TIMEOUT)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self.http_concurrency.record_congestion(type(e).__name__)
+                raise
+            if response.status_code in THROTTLE_STATUS_CODES:
+                self.http_concurrency.record_congestion(f"HTTP {response.status_code}")
+            else:
+                self.http_concurrency.record_success(time.monotonic() - started)
+        
+        if cached and response.status_code == 304:
+            logger.info(f"Page not modified since last fetch: {build_url}")
+            self.page_cache.touch(cached)
+            return cached, None
+        
+        response.raise_for_status()
+        html = response.text
+        page = None
+        if self.page_cache:
+            page = self.page_cache.put(
+                build_url, FETCH_METHOD_HTTP, html,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        return page, html
+    
+    def _get_build_equipment_offline(self, build_url: str, known_uniques: List[str] = None) -> List[Dict[str, str]]:
+        """
+        Extract equipment information from the cached copies of a build page.
+        
+        The extractor always runs again, so changes to it can be applied to the
+        whole cached corpus without network access.
+        
+        Args:
+            build_url: The URL of the build page.
+            known_uniques: Optional list of known unique items to look for. If None, uses the full unique item catalog.
             
-            # Get the page source and parse with BeautifulSoup
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+        Returns:
+            A list of dictionaries containing equipment information.
+        """
+        if known_uniques is None:
+            known_uniques = self.known_uniques
+        
+        equipment = []
+        for method in (FETCH_METHOD_HTTP, FETCH_METHOD_SELENIUM):
+            page = self.page_cache.get(build_url, method)
+            if not page:
+                continue
+            equipment = self._extract_equipment(self.page_cache.read_html(page), known_uniques)
+            self.store_extraction(page, equipment, known_uniques)
+            if equipment:
+                break
+        
+        if not equipment:
+            logger.warning(f"No cached page with equipment for {build_url}")
+        
+        logger.info(f"Found {len(equipment)} equipment items in the page cache")
+        return equipment
+    
+    def _extract_page(self, page: Optional[CachedPage], html: Optional[str],
+                      known_uniques: List[str]) -> List[Dict[str, str]]:
+        """
+        Extract equipment from a page, reusing the cached result if its content is unchanged.
+        
+        Args:
+            page: The cache entry of the page, or None when caching is disabled.
+            html: The page body, or None to read it from the cache if needed.
+            known_uniques: List of known unique items to look for.
             
-            # Initialize equipment list
-            equipment = []
+        Returns:
+            A list of dictionaries containing equipment information.
+        """
+        if page is not None:
+            equipment = self.get_cached_extraction(page, known_uniques)
+            if equipment is not None:
+                return equipment
+            if html is None:
+                html = self.page_cache.read_html(page)
+        
+        equipment = self._extract_equipment(html, known_uniques)
+        if page is not None:
+            self.store_extraction(page, equipment, known_uniques)
+        return equipment
+    
+    def _catalog_hash(self, known_uniques: Optional[List[str]]) -> str:
+        """Return the catalog hash of a known uniques list, defaulting to the scraper's catalog."""
+        if known_uniques is None or known_uniques is self.known_uniques:
+            return self.catalog_hash
+        return catalog_hash(known_uniques)
+    
+    def get_cached_extraction(self, page: CachedPage, known_uniques: Optional[List[str]] = None
+                              ) -> Optional[List[Dict[str, str]]]:
+        """
+        Get the equipment previously extracted from a cached page, if its content is unchanged.
+        
+        Args:
+            page: The cache entry of the page.
+            known_uniques: The catalog the equipment must have been extracted with.
+                Defaults to the scraper's.
+            
+        Returns:
+            The cached equipment, or None if the page has to be extracted.
+        """
+        equipment = self.page_cache.get_extraction(page, EXTRACTOR_VERSION, self._catalog_hash(known_uniques))
+        if equipment is not None:
+            logger.info(f"Page content unchanged, reusing extracted equipment: {page.url}")
+        return equipment
+    
+    def store_extraction(self, page: CachedPage, equipment: List[Dict[str, str]],
+                         known_uniques: Optional[List[str]] = None) -> None:
+        """
+        Remember the equipment extracted from a cached page.
+        
+        Args:
+            page: The cache entry of the page.
+            equipment: The extracted equipment.
+            known_uniques: The catalog it was extracted with. Defaults to the scraper's.
+        """
+        self.page_cache.put_extraction(page, EXTRACTOR_VERSION, self._catalog_hash(known_uniques), equipment)
+    
+    def _get_build_equipment_selenium(self, build_url: str, known_uniques: List[str] = None) -> List[Dict[str, str]]:
+        """
+        Extract equipment information from a build page using Selenium.
+        
+        Args:
+            build_url: The URL of the build page.
+            known_uniques: Optional list of known unique items to look for. If None, uses the full unique item catalog.
+            
+        Returns:
+            A list of dictionaries containing equipment information.
+        """
+        # Use the full unique item catalog if none provided
+        if known_uniques is None:
+            known_uniques = self.known_uniques
+        
+        page, page_source = self._fetch_page_selenium(build_url)
+        
+        # Parse after the driver went back to the pool
+        equipment = self._extract_page(page, page_source, known_uniques)
+        logger.info(f"Found {len(equipment)} equipment items using Selenium")
+        return equipment
+    
+    def _fetch_page_selenium(self, build_url: str) -> Tuple[Optional[CachedPage], Optional[str]]:
+        """
+        Load a build page in a pooled headless browser.
+        
+        Args:
+            build_url: The URL of the build page.
             
-            # Try a more direct approach to find the unique items in the Great Uniques section
-            # This is based on the HTML structure seen in the screenshot
-            great_uniques_text = "Great Uniques for this build"
+        Returns:
+            A tuple of (cache entry or None if caching is disabled, rendered HTML).
             
-            # Look for the exact text in any element
-            great_uniques_elements = [elem for elem in soup.find_all() if elem.string and great_uniques_text in elem.string]
+        Raises:
+            TimeoutException: If the page did not finish loading.
+        """
+        logger.info(f"Using Selenium to fetch equipment from {build_url}")
+        
+        with self.browser_concurrency.slot():
+            # Be nice to the server
+            self.rate_limiter.acquire()
             
-            if great_uniques_elements:
-                logger.info(f"Found {len(great_uniques_elements)} Great Uniques sections using direct search")
+            started = time.monotonic()
+            page_source = None
+            # Borrow a warm WebDriver from the pool; it is reset and returned afterwards
+            with self.driver_pool.driver() as driver:
+                # Navigate to the build page
+                driver.get(build_url)
                 
-                for section in great_uniques_elements:
-                    logger.info(f"Processing Great Uniques section: {section.text.strip()}")
-                    
-                    # Try to find the ordered list that follows this section
-                    # First, look at parent elements to find the container
-                    parent = section.parent
-                    while parent and parent.name not in ['article', 'section', 'div', 'body', 'html']:
-                        parent = parent.parent
-                    
-                    if parent:
-                        # Look for all ordered lists in this container
-                        ordered_lists = parent.find_all('ol')
-                        for ol in ordered_lists:
-                            # Check if this list is after our section
-                            if ol.sourceline > section.sourceline:
-                                logger.info(f"Found ordered list with {len(ol.find_all('li'))} items")
-                                for item in ol.find_all('li'):
-                                    # Extract the item text and clean it up
-                                    item_text = item.text.strip()
-                                    logger.info(f"Processing list item: {item_text}")
-                                    
-                                    # For these specific items, we know they're unique items
-                                    # So we can directly create equipment entries
-                                    # The item text might not have the number prefix if it's extracted directly from the HTML
-                                    # So we'll handle both cases
-                                    match = re.match(r'(?:\d+\.\s+)?(.+)', item_text)
-                                    if match:
-                                        item_name = match.group(1).strip()
-                                        # Remove any invisible characters that might be present
-                                        item_name = re.sub(r'[\u200B-\u200F\uFEFF]', '', item_name)
-                                        # Determine item type based on name
-                                        item_type = "Unique"
-                                        if "rod" in item_name.lower():
-                                            item_type = "Weapon"
-                                        elif "harmony" in item_name.lower():
-                                            item_type = "Weapon"
-                                        elif "ring" in item_name.lower() or "signet" in item_name.lower():
-                                            item_type = "Jewelry"
-                                        elif "mantle" in item_name.lower() or "embrace" in item_name.lower():
-                                            item_type = "Armor"
-                                            
-                                        # Check if this item is already in the equipment list to avoid duplicates
-                                        if not any(e["name"] == item_name for e in equipment):
-                                            equipment_item = {
-                                                "name": item_name,
-                                                "type": item_type,
-                                                "is_unique": True,
-                                                "category": "Great Uniques",
-                                                "description": item_text
-                                            }
-                                            equipment.append(equipment_item)
-                                break  # Only process the first ordered list after our section
-            
-            # If we didn't find any equipment using the direct approach, try the more general approach
-            if not equipment:
-                logger.info("Trying alternative approach to find Great Uniques")
-                great_uniques_sections = soup.find_all(['h3', 'h4', 'strong'], string=lambda text: text and 'great uniques' in text.lower())
-                
-                # If we found Great Uniques sections, prioritize those
-                if great_uniques_sections:
-                    logger.info(f"Found {len(great_uniques_sections)} Great Uniques sections")
-                    
-                    for section in great_uniques_sections:
-                        section_title = section.text.strip()
-                        logger.info(f"Processing Great Uniques section: {section_title}")
-                        
-                        # Process the Great Uniques section
-                        current = getattr(section, 'next_sibling', None)
-                        
-                        # Find the next list element
-                        while current and current.name not in ['ul', 'ol', 'h1', 'h2', 'h3']:
-                            current = getattr(current, 'next_sibling', None)
-                        
-                        # Process the list if found
-                        if current and current.name in ['ul', 'ol']:
-                            logger.info(f"Found list in Great Uniques section with {len(current.find_all('li'))} items")
-                            for item in current.find_all('li'):
-                                self._process_equipment_item(item.text.strip(), "Great Uniques", known_uniques, equipment)
-            
-            # Next, look for Legendaries & Uniques sections
-            legendaries_uniques_sections = soup.find_all(['h2', 'h3'], string=lambda text: text and ('legendaries' in text.lower() or 'uniques' in text.lower()))
-            
-            # If we found Legendaries & Uniques sections, process those
-            if legendaries_uniques_sections:
-                logger.info(f"Found {len(legendaries_uniques_sections)} Legendaries & Uniques sections")
-                
-                for section in legendaries_uniques_sections:
-                    section_title = section.text.strip()
-                    logger.info(f"Processing priority section: {section_title}")
-                    
-                    # Process the main Legendaries & Uniques section
-                    current = getattr(section, 'next_sibling', None)
-                    while current and current.name not in ['h1', 'h2']:
-                        if current.name in ['ul', 'ol']:
-                            for item in current.find_all('li'):
-                                self._process_equipment_item(item.text.strip(), section_title, known_uniques, equipment)
-                        elif current.name == 'p' and (current.find('strong') or any(unique.lower() in current.text.lower() for unique in known_uniques)):
-                            self._process_equipment_item(current.text.strip(), section_title, known_uniques, equipment)
-                        current = getattr(current, 'next_sibling', None)
-            
-            # If we didn't find any equipment yet, look for other equipment sections
-            if not equipment:
-                logger.info("No equipment found in priority sections, looking for other equipment sections")
-                equipment_sections = soup.find_all(['h2', 'h3'], string=lambda text: text and any(keyword in text.lower() for keyword in ['gear', 'equipment', 'items', 'jackpot']))
-                
-                for section in equipment_sections:
-                    section_title = section.text.strip()
-                    logger.info(f"Found equipment section: {section_title}")
-                    
-                    # Get the content following this section header
-                    current = getattr(section, 'next_sibling', None)
-                    
-                    # Collect elements until we hit another header or run out of siblings
-                    while current and current.name not in ['h1', 'h2', 'h3']:
-                        if current.name in ['ul', 'ol']:
-                            for item in current.find_all('li'):
-                                self._process_equipment_item(item.text.strip(), section_title, known_uniques, equipment)
-                        elif current.name == 'p' and (current.find('strong') or any(unique.lower() in current.text.lower() for unique in known_uniques)):
-                            self._process_equipment_item(current.text.strip(), section_title, known_uniques, equipment)
-                        current = getattr(current, 'next_sibling', None)
+                # Wait for the page to load
+                try:
+                    WebDriverWait(driver, SELENIUM_PAGE_TIMEOUT).until(
+                        EC.presence_of_element_located((By.TAG_NAME, "h1"))
+                    )
+                    page_source = driver.page_source
+                except TimeoutException:
+                    pass
             
-            # Clean up
-            driver.quit()
+            # Raised outside the pool's context so the driver is kept
+            if page_source is None:
+                self.browser_concurrency.record_congestion("page load timeout")
+                raise TimeoutException(f"Timeout waiting for page to load: {build_url}")
+            self.browser_concurrency.record_success(time.monotonic() - started)
+        
+        page = self.page_cache.put(build_url, FETCH_METHOD_SELENIUM, page_source) if self.page_cache else None
+        return page, page_source
+    
+    def fetch_page(self, build_url: str, method: str) -> Tuple[Optional[CachedPage], Optional[str]]:
+        """
+        Fetch a build page without extracting its equipment.
+        
+        Args:
+            build_url: The URL of the build page.
+            method: FETCH_METHOD_HTTP or FETCH_METHOD_SELENIUM.
             
-            logger.info(f"Found {len(equipment)} equipment items using Selenium")
-            return equipment
+        Returns:
+            A tuple of (cache entry or None, HTML or None). None HTML means the
+            cached copy fetched over HTTP is still current.
+        """
+        if method == FETCH_METHOD_SELENIUM:
+            return self._fetch_page_selenium(build_url)
+        return self._fetch_page_http(build_url)
+    
+    def extract_page(self, page: Optional[CachedPage], html: Optional[str]) -> List[Dict[str, str]]:
+        """
+        Extract equipment from a page returned by fetch_page().
         
-        except Exception as e:
-            logger.error(f"Error fetching build equipment with Selenium: {e}")
-            return []
+        Args:
+            page: The cache entry of the page, or None when caching is disabled.
+            html: The page body, or None to read it from the cache.
+            
+        Returns:
+            A list of dictionaries containing equipment information.
+        """
+        return self._extract_page(page, html, self.known_uniques)
+            
+    def _extract_equipment(self, page_source: str, known_uniques: List[str]) -> List[Dict[str, str]]:
+        """
+        Extract equipment information from the HTML of a build page.
+        
+        Args:
+            page_source: The HTML of the build page.
+            known_uniques: List of known unique items to look for.
+            
+        Returns:
+            A list of dictionaries containing equipment information.
+        """
+        return extract_equipment(page_source, known_uniques)
             
     def _process_equipment_item(self, item_text: str, section_title: str, known_uniques: List[str], equipment: List[Dict[str, str]]) -> None:
         """
@@ -606,90 +1102,7 @@ class Scraper:
             known_uniques: List of known unique items to check against
             equipment: The equipment list to add to
         """
-        # Check if this contains a known unique item
-        item_name = "Unknown"
-        item_type = "Unknown"
-        is_unique = False
-        
-        # First check against our known uniques list
-        for unique in known_uniques:
-            if unique.lower() in item_text.lower():
-                item_name = unique
-                item_type = "Unique/Legendary"
-                is_unique = True
-                break
-        
-        # If we didn't find a known unique, try to extract the item name
-        if item_name == "Unknown":
-            # Check for numbered list format like "1. Item Name" or "1. Item Name (description)"
-            # This pattern is common in the "Great Uniques for this build" section
-            numbered_match = re.match(r'\d+\.\s+([A-Z][^\(\)\[\]\{\}\d\n]*?)(?:\s+\(|$|\s+\-)', item_text)
-            if numbered_match:
-                item_name = numbered_match.group(1).strip()
-            else:
-                # Look for specific item name patterns
-                # Pattern 1: Full item name with prepositions (e.g., "Rod of Kepeleke", "Ring of the Midnight Sun")
-                full_item_match = re.search(r'([A-Z][a-z]+(?:\'s|\s+of|\s+the|\s+[A-Z][a-z]+){1,4})', item_text)
-                if full_item_match:
-                    item_name = full_item_match.group(1).strip()
-                else:
-                    # Pattern 2: Simple capitalized item name (e.g., "Harmony of Ebewaka")
-                    capitalized_match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,4})', item_text)
-                    if capitalized_match:
-                        item_name = capitalized_match.group(1).strip()
-            
-            # Clean up item name - remove trailing punctuation
-            if item_name != "Unknown":
-                item_name = re.sub(r'[\.,:;\s]+$', '', item_name)
-            
-            # Try to determine item type based on context
-            if "aspect" in item_text.lower() or "aspect's" in item_text.lower():
-                item_type = "Legendary Aspect"
-            elif "unique" in section_title.lower() or "uniques" in section_title.lower() or "great uniques" in section_title.lower():
-                item_type = "Unique"
-                is_unique = True
-            elif any(weapon_type in item_text.lower() for weapon_type in ["sword", "axe", "mace", "staff", "wand", "bow", "crossbow", "dagger", "rod"]):
-                item_type = "Weapon"
-            elif any(armor_type in item_text.lower() for armor_type in ["helm", "chest", "gloves", "boots", "pants", "shoulders", "mantle"]):
-                item_type = "Armor"
-            elif any(jewelry_type in item_text.lower() for jewelry_type in ["ring", "amulet", "necklace", "signet", "embrace"]):
-                item_type = "Jewelry"
-        
-        # Determine category based on section title
-        category = "Unknown"
-        if "must-have" in section_title.lower():
-            category = "Must Have"
-        elif "nice-to-have" in section_title.lower():
-            category = "Nice to Have"
-        elif "great uniques" in section_title.lower():
-            category = "Great Uniques"
-        elif "jackpot" in section_title.lower():
-            category = "Jackpot"
-        elif "build-defining" in section_title.lower():
-            category = "Build Defining"
-        elif "legendaries & uniques" in section_title.lower():
-            category = "Legendaries & Uniques"
-        else:
-            category = section_title
-        
-        # Filter out common non-item terms that might be mistakenly extracted
-        common_terms = ["This", "The", "These", "Those", "That", "Each", "Every", "Some", "Your", "Their", 
-                      "Build", "Best", "Alternative", "Endgame", "Leveling", "Rock Splitter Thorns", "Thrash"]
-        if item_name in common_terms:
-            return
-        
-        # Filter out items that are too short or likely not actual items
-        if item_name != "Unknown" and len(item_name) > 3 and not item_name.startswith("In the") and not item_name.startswith("With the") and not item_name.startswith("Pit"):
-            # Check if this item is already in the equipment list to avoid duplicates
-            if not any(e["name"] == item_name for e in equipment):
-                equipment_item = {
-                    "name": item_name,
-                    "type": item_type,
-                    "is_unique": is_unique,
-                    "category": category,
-                    "description": item_text
-                }
-                equipment.append(equipment_item)
+        process_equipment_item(item_text, section_title, known_uniques, equipment)
 
     def scrape_all_builds(self) -> List[Dict[str, Any]]:
         """
@@ -711,13 +1124,8 @@ class Scraper:
         # Fetch new data
         builds = self.get_build_list()
         
-        # For each build, get its equipment
-        for i, build in enumerate(builds):
-            logger.info(f"Processing build {i+1}/{len(builds)}: {build['title']}")
-            build['equipment'] = self.get_build_equipment(build['url'])
-            
-            # Be nice to the server
-            time.sleep(1)
+        # Fetch equipment for all builds concurrently
+        builds = self.get_equipment_for_builds(builds)
         
         # Save to cache
         try:
@@ -729,12 +1137,22 @@ class Scraper:
         
         return builds
 
-    def get_equipment_for_builds(self, builds: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def get_equipment_for_builds(self, builds: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                                 progress_callback: Optional[Callable[[Dict[str, Any], Optional[Exception]], None]] = None
+                                 ) -> List[Dict[str, Any]]:
         """
         Get equipment data for a list of builds.
         
+        Builds go through the scrape pipeline: HTTP fetchers, browser fetchers
+        and parsers run as concurrent stages, and the shared rate limiter keeps
+        the overall request rate polite.
+        
         Args:
             builds: A list of build dictionaries.
+            max_workers: Number of concurrent HTTP fetchers. Defaults to the scraper's setting.
+            progress_callback: Called as callback(build, error) after each build
+                finishes, with error set if fetching its equipment failed. Calls are
+                serialized, so the callback may update shared state without locking.
             
         Returns:
             The same list of builds with equipment data added.
@@ -742,79 +1160,231 @@ class Scraper:
         total_builds = len(builds)
         logger.info(f"Getting equipment for {total_builds} builds")
         
-        for i, build in enumerate(builds):
-            build_url = build['url']
-            logger.info(f"Processing build {i+1}/{total_builds}: {build['title']}")
+        def on_result(build: Dict[str, Any], error: Optional[Exception]) -> None:
+            logger.info(f"Processed build {pipeline.stats.written}/{total_builds}: {build['title']}")
+            if progress_callback:
+                progress_callback(build, error)
+        
+        pipeline = ScrapePipeline(self, on_result=on_result, http_workers=max_workers)
+        pipeline.run_sync(lambda: builds)
+        return builds
+    
+    def retag_builds(self, builds: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Recompute the tags of existing builds from their titles, without scraping.
+        
+        Args:
+            builds: The builds to re-tag. They are not modified.
             
-            try:
-                # Get equipment for this build
-                equipment = self.get_build_equipment(build_url)
-                build['equipment'] = equipment
-                logger.info(f"Found {len(equipment)} equipment items for build: {build['title']}")
-                
-                # Sleep briefly to avoid overloading the server
-                time.sleep(1)
-            except Exception as e:
-                logger.error(f"Error getting equipment for build {build['title']}: {e}")
-                build['equipment'] = []
+        Returns:
+            Copies of the builds with fresh tags, and a class taken from the title
+            where it was unknown.
+        """
+        retagged = []
+        changed = 0
+        for build in builds:
+            build = dict(build)
+            title_classes, tags = TAG_ENGINE.analyze(build.get('title', ''))
+            if build.get('class', 'Unknown') == 'Unknown' and title_classes:
+                build['class'] = title_classes[0]
+            if tags != build.get('tags'):
+                changed += 1
+            build['tags'] = tags
+            retagged.append(build)
+        logger.info(f"Re-tagged {len(retagged)} builds, {changed} with changed tags")
+        return retagged
+    
+    def carry_forward_build(self, build: Dict[str, Any], previous: Optional[Dict[str, Any]]
+                            ) -> Optional[Dict[str, Any]]:
+        """
+        Carry a build's equipment forward from the previous dataset if its guide is unchanged.
+        
+        Args:
+            build: A freshly discovered build.
+            previous: The same build in the previous dataset, if it has it.
+            
+        Returns:
+            The carried-forward build (fresh card metadata with the previous
+            equipment), or None if the build needs fetching.
+        """
+        last_updated = build_last_updated(build)
+        if not (previous and previous.get("equipment") and last_updated
+                and build_last_updated(previous) == last_updated):
+            return None
+        if previous.get("fetch_error"):
+            # Its equipment is left over from an earlier refresh; try again
+            return None
+        carried = dict(build)
+        carried["equipment"] = previous["equipment"]
+        if "fetch_method" in previous:
+            carried["fetch_method"] = previous["fetch_method"]
+        return carried
+    
+    def keep_previous_equipment(self, build: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> bool:
+        """
+        Fill in a build whose fetch failed with its equipment from the previous dataset.
+        
+        The build keeps its fetch_error, so the next incremental refresh fetches it again.
+        
+        Args:
+            build: A build written with a fetch_error.
+            previous: The same build in the previous dataset, if it has it.
+            
+        Returns:
+            True if previous equipment was kept.
+        """
+        if not (build.get("fetch_error") and previous and previous.get("equipment")):
+            return False
+        build["equipment"] = previous["equipment"]
+        if "fetch_method" in previous:
+            build["fetch_method"] = previous["fetch_method"]
+        return True
+    
+    def split_unchanged_builds(self, builds: List[Dict[str, Any]], previous_builds: List[Dict[str, Any]]
+                               ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split discovered builds into those that need fetching and those that can be carried forward.
+        
+        A build is carried forward when the previous dataset has it with equipment
+        and the same "Last Updated" date. Carried builds keep their previous
+        equipment but take the freshly scraped card metadata.
+        
+        Args:
+            builds: Builds freshly discovered from the build guides page.
+            previous_builds: Builds of the previous dataset.
+            
+        Returns:
+            A tuple of (builds to fetch, carried-forward builds).
+        """
+        previous_by_url = {build.get("url"): build for build in previous_builds}
+        changed, unchanged = [], []
+        for build in builds:
+            carried = self.carry_forward_build(build, previous_by_url.get(build.get("url")))
+            if carried:
+                unchanged.append(carried)
+            else:
+                changed.append(build)
+        
+        logger.info(f"{len(changed)} builds are new or updated, {len(unchanged)} unchanged")
+        return changed, unchanged
+    
+    def build_entry_for_url(self, build_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Create a build entry for a guide URL that was never discovered.
+        
+        The title is derived from the URL slug, as for sitemap discovery.
+        
+        Args:
+            build_url: The guide URL, absolute or relative to the base URL.
+            
+        Returns:
+            The build dictionary, or None if this is not a build guide URL.
+        """
+        match = BUILD_GUIDE_URL_PATTERN.search(build_url.strip())
+        if not match:
+            return None
+        title = match.group(1).replace("-", " ").title()
+        return self._make_build_entry(title, build_url.strip())
+    
+    def select_builds(self, snapshot: BuildSnapshot, urls: Optional[List[str]] = None,
+                      class_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Pick the builds a partial refresh re-scrapes.
+        
+        Builds of the dataset keep their card metadata; only their equipment is
+        fetched again. Guide URLs the dataset does not have yet become new builds.
         
+        Args:
+            snapshot: The current build dataset.
+            urls: Build URLs, slugs or URL suffixes to re-scrape.
+            class_name: Re-scrape every build of this class in the dataset.
+            
+        Returns:
+            Copies of the selected builds with their equipment cleared, ready to fetch.
+            
+        Raises:
+            ValueError: If a URL is neither in the dataset nor a build guide URL.
+        """
+        selected = []
+        for url in urls or []:
+            build = snapshot.find_build(url) or self.build_entry_for_url(url)
+            if build is None:
+                raise ValueError(f"Not a known build or build guide URL: {url}")
+            selected.append(build)
+        if class_name:
+            selected.extend(build for build in snapshot.builds
+                            if build.get("class", "").lower() == class_name.lower())
+        
+        builds = []
+        seen_urls = set()
+        for build in selected:
+            if build["url"] in seen_urls:
+                continue
+            seen_urls.add(build["url"])
+            build = dict(build)
+            build["equipment"] = []
+            build.pop("fetch_error", None)
+            builds.append(build)
+        logger.info(f"Selected {len(builds)} builds to re-scrape")
         return builds
     
     def _load_builds(self) -> List[Dict[str, Any]]:
-        """Load builds from the JSON file.
+        """Load builds from the resident build store.
+        
+        The store only re-parses all_builds.json when the file changed since
+        the last load, so repeated calls are cheap.
         
         Returns:
             A list of builds.
         """
-        try:
-            with open("all_builds.json", 'r') as f:
-                builds = json.load(f)
-            logger.info(f"Loaded {len(builds)} builds from all_builds.json")
-            return builds
-        except (FileNotFoundError, json.JSONDecodeError):
-            logger.info("No existing builds file found, fetching builds first")
-            builds = self.get_build_list()
-            return builds
-    
-    def search_builds_by_equipment(self, equipment_name: str) -> List[Dict[str, Any]]:
+        snapshot = self.build_store.snapshot()
+        if snapshot.is_loaded:
+            return list(snapshot.builds)
+
+        logger.info("No existing builds file found, fetching builds first")
+        builds = self.get_build_list()
+        return builds
+    
+    def search_builds_by_equipment(self, equipment_name: str, fetch_if_missing: bool = False) -> List[Dict[str, Any]]:
         """Search for builds that use a specific equipment item.
         
         Supports both English and Chinese (Simplified/Traditional) equipment names.
         
         Args:
             equipment_name: The name of the equipment item to search for.
+            fetch_if_missing: Scrape builds and equipment when no equipment data is
+                available yet. Only meant for the CLI; web requests must never
+                start a scrape and instead search the current snapshot.
             
         Returns:
             A list of builds that use the specified equipment item.
         """
-        builds = self._load_builds()
-        if not any('equipment' in build and build['equipment'] for build in builds):
-            logger.info("Builds don't have equipment data, fetching equipment first")
-            builds = self.get_equipment_for_builds(builds)
-            # Save the updated builds data
-            with open("all_builds.json", 'w') as f:
-                json.dump(builds, f, indent=2)
+        if fetch_if_missing:
+            builds = self._load_builds()
+            if not any('equipment' in build and build['equipment'] for build in builds):
+                logger.info("Builds don't have equipment data, fetching equipment first")
+                # Work on copies so the shared snapshot is never mutated
+                builds = self.get_equipment_for_builds([dict(build) for build in builds])
+                # Save the updated builds data and make it the current snapshot
+                self.build_store.publish(builds)
         
         # Translate Chinese name to English if needed
         equipment_name = self.translator.translate_to_english(equipment_name)
         equipment_name = equipment_name.lower()
         
-        matching_builds = []
-        for build in builds:
-            for item in build.get('equipment', []):
-                if equipment_name in item.get('name', '').lower():
-                    matching_builds.append({
-                        "title": build['title'],
-                        "url": build['url'],
-                        "class": build['class'],
-                        "difficulty": build.get('difficulty', 'Unknown'),
-                        "matched_item": item['name'],
-                        "item_type": item.get('type', 'Unknown'),
-                        "is_unique": item.get('is_unique', False),
-                        "category": item.get('category', 'Unknown'),
-                        "description": item.get('description', '')
-                    })
-                    break  # Only add each build once
+        # Resolve the query through the snapshot's inverted index instead of
+        # scanning every equipment entry of every build
+        equipment_index = self.build_store.snapshot().equipment_index
+        matching_builds = equipment_index.search(equipment_name)
+        
+        # A query that wraps a known item name in other words ("harlequin crest helm")
+        # matches no stored name as a substring; search for the item itself instead
+        if not matching_builds:
+            known_item = self.item_matcher.first(equipment_name)
+            if known_item and known_item.lower() != equipment_name:
+                logger.info(f"No builds match '{equipment_name}', searching for known item '{known_item}'")
+                equipment_name = known_item.lower()
+                matching_builds = equipment_index.search(equipment_name)
         
         logger.info(f"Found {len(matching_builds)} builds matching '{equipment_name}'")
         return matching_builds
@@ -846,16 +1416,57 @@ if __name__ == "__main__":
         parser.add_argument("--get-all-builds", action="store_true", help="Get all builds from MaxRoll")
         parser.add_argument("--output", type=str, default="all_builds.json", help="Output file for builds data")
         parser.add_argument("--search", type=str, help="Search for builds that use a specific piece of equipment")
-        parser.add_argument("--class", type=str, dest="class_filter", help="Filter builds by class (e.g., Barbarian, Rogue)")
+        parser.add_argument("--class", type=str, dest="class_filter", help="Filter builds by class (e.g., Barbarian, Rogue); with --refresh-builds, re-scrape every build of the class")
         parser.add_argument("--tags", type=str, help="Filter builds by tags (comma-separated, e.g., endgame,hardcore)")
         parser.add_argument("--get-equipment", action="store_true", help="Get equipment for all builds")
-        parser.add_argument("--build-url", type=str, help="URL of a specific build to get equipment for")
+        parser.add_argument("--incremental", action="store_true", help="With --get-all-builds, only fetch equipment for new or updated guides")
+        parser.add_argument("--build-url", type=str, action="append", help="URL of a specific build to get equipment for (repeatable)")
+        parser.add_argument("--refresh-builds", action="store_true", help="Re-scrape the builds given by --build-url and/or --class and merge them into the output file")
+        parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Number of build pages to fetch concurrently")
+        parser.add_argument("--rate", type=float, default=DEFAULT_REQUESTS_PER_SECOND, help="Maximum page requests per second")
+        parser.add_argument("--offline", action="store_true", help="Extract equipment from the page cache only, without network access")
+        parser.add_argument("--no-cache", action="store_true", help="Do not use the on-disk page cache")
+        parser.add_argument("--retag", action="store_true", help="Recompute the tags of the builds in the output file without scraping")
+        parser.add_argument("--discovery", choices=DISCOVERY_BACKENDS, default=DISCOVERY_SELENIUM, help="Backend used to discover the build list")
+        parser.add_argument("--parse-processes", type=int, default=DEFAULT_PARSE_PROCESSES, help="Number of processes extracting equipment (0 extracts in threads)")
         
         args = parser.parse_args()
         
-        scraper = Scraper()
+        scraper = Scraper(
+            max_workers=args.workers,
+            requests_per_second=args.rate,
+            cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR,
+            offline=args.offline,
+            discovery=args.discovery,
+            parse_processes=args.parse_processes
+        )
         
-        if args.get_all_builds:
+        if args.get_all_builds and args.incremental:
+            # Re-fetch equipment only for guides whose "Last Updated" date changed
+            try:
+                with open(args.output, 'r') as f:
+                    previous_builds = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                previous_builds = []
+            builds = scraper.get_build_list()
+            changed, unchanged = scraper.split_unchanged_builds(builds, previous_builds)
+            scraper.get_equipment_for_builds(changed)
+            previous_by_url = {b['url']: b for b in previous_builds}
+            for build in changed:
+                scraper.keep_previous_equipment(build, previous_by_url.get(build['url']))
+            refreshed = {b['url']: b for b in changed + unchanged}
+            builds = [refreshed[b['url']] for b in builds]
+            with open(args.output, 'w') as f:
+                json.dump(builds, f, indent=2)
+            print(f"Refreshed {len(changed)} of {len(builds)} builds and saved to {args.output}")
+        elif args.retag:
+            with open(args.output, 'r', encoding='utf-8') as f:
+                builds = json.load(f)
+            builds = scraper.retag_builds(builds)
+            with open(args.output, 'w') as f:
+                json.dump(builds, f, indent=2)
+            print(f"Re-tagged {len(builds)} builds and saved to {args.output}")
+        elif args.get_all_builds:
             builds = scraper.get_build_list()
             with open(args.output, 'w') as f:
                 json.dump(builds, f, indent=2)
@@ -874,14 +1485,28 @@ if __name__ == "__main__":
             with open(args.output, 'w') as f:
                 json.dump(builds_with_equipment, f, indent=2)
             print(f"Updated {len(builds_with_equipment)} builds with equipment data and saved to {args.output}")
+        elif args.refresh_builds:
+            # Re-scrape selected builds and merge them into the existing dataset
+            build_store = BuildStore(args.output)
+            snapshot = build_store.snapshot()
+            builds = scraper.select_builds(snapshot, urls=args.build_url, class_name=args.class_filter)
+            if not builds:
+                parser.error("--refresh-builds needs --build-url or --class matching at least one build")
+            scraper.get_equipment_for_builds(builds)
+            for build in builds:
+                scraper.keep_previous_equipment(build, snapshot.find_build(build['url']))
+            merged = build_store.merge(builds)
+            failed = sum(1 for build in builds if build.get('fetch_error'))
+            print(f"Refreshed {len(builds)} builds ({failed} failed) and merged them into {args.output} ({len(merged)} builds)")
         elif args.build_url:
-            # Get equipment for a specific build URL
-            equipment = scraper.get_build_equipment(args.build_url)
-            print(f"Found {len(equipment)} equipment items for {args.build_url}:")
-            for item in equipment:
-                print(f"- {item['name']} ({item['type']}) - {item['category']}")
+            # Get equipment for specific build URLs
+            for build_url in args.build_url:
+                equipment, fetch_method = scraper.fetch_build_equipment(build_url)
+                print(f"Found {len(equipment)} equipment items for {build_url} (via {fetch_method}):")
+                for item in equipment:
+                    print(f"- {item['name']} ({item['type']}) - {item['category']}")
         elif args.search:
-            matching_builds = scraper.search_builds_by_equipment(args.search)
+            matching_builds = scraper.search_builds_by_equipment(args.search, fetch_if_missing=True)
             
             # Apply class filter if specified
             if args.class_filter:
@@ -0,0 +1,67 @@
+"""
+Benchmark the build discovery backends against locally recorded fixtures.
+
+Record the fully scrolled build guides page (e.g. driver.page_source after the
+Selenium discovery) and the sitemap XML once, then compare how long each
+backend takes to turn them into build entries and whether they agree:
+
+    python scripts/bench_discovery.py --listing listing.html --sitemap sitemap.xml
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import Scraper
+
+
+def bench(label, parse, runs):
+    """Run a parser several times and print the average time per run."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        builds = parse()
+    elapsed = (time.perf_counter() - start) / runs
+    print(f"{label:<10} {len(builds):>5} builds  {elapsed * 1000:8.2f} ms/run")
+    return builds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark build discovery backends on recorded fixtures")
+    parser.add_argument("--listing", help="Recorded HTML of the fully loaded build guides page")
+    parser.add_argument("--sitemap", help="Recorded sitemap XML")
+    parser.add_argument("--runs", type=int, default=20, help="Number of runs per backend")
+    args = parser.parse_args()
+
+    if not args.listing and not args.sitemap:
+        parser.error("at least one of --listing or --sitemap is required")
+
+    logging.disable(logging.INFO)
+    scraper = Scraper(cache_dir=None)
+    results = {}
+
+    if args.listing:
+        with open(args.listing, "r", encoding="utf-8") as f:
+            listing_html = f.read()
+        results["selenium"] = bench("selenium", lambda: scraper._parse_build_cards(listing_html), args.runs)
+
+    if args.sitemap:
+        with open(args.sitemap, "r", encoding="utf-8") as f:
+            sitemap_xml = f.read()
+        results["sitemap"] = bench("sitemap", lambda: scraper._parse_sitemap(sitemap_xml)[0], args.runs)
+
+    if len(results) == 2:
+        listing_urls = {build["url"] for build in results["selenium"]}
+        sitemap_urls = {build["url"] for build in results["sitemap"]}
+        print(f"\nOnly in listing: {len(listing_urls - sitemap_urls)}")
+        for url in sorted(listing_urls - sitemap_urls):
+            print(f"  - {url}")
+        print(f"Only in sitemap: {len(sitemap_urls - listing_urls)}")
+        for url in sorted(sitemap_urls - listing_urls):
+            print(f"  - {url}")
+
+
+if __name__ == "__main__":
+    main()
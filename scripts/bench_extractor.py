@@ -0,0 +1,218 @@
+"""
+Benchmark the equipment extractor on recorded build pages.
+
+Times the previous multi-pass extractor (a copy of it and of its item
+processing is kept below, so the comparison is independent) against the
+single-pass extractor with each available parser, and checks that they
+return the same equipment. lxml does not record source line numbers, so
+with it the Great Uniques list is found by document order alone and some
+pages may legitimately differ.
+
+The default pages are guide_fixture.html, a guide with every kind of
+equipment section, and page_structure.html, a large saved page without
+equipment that shows the cost of parsing. The known uniques are the
+scraper's hand-picked KNOWN_UNIQUES, which keeps the comparison with the old
+catalog meaningful.
+
+
+    python scripts/bench_extractor.py
+    python scripts/bench_extractor.py guide1.html guide2.html --runs 50
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from equipment_extractor import LXML_AVAILABLE, extract_equipment
+from scraper import KNOWN_UNIQUES
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# A guide with Great Uniques, Legendaries & Uniques and gear sections, and a
+# large saved page without equipment that shows the cost of parsing
+DEFAULT_PAGES = [os.path.join(SCRIPTS_DIR, "guide_fixture.html"), os.path.join(SCRIPTS_DIR, "page_structure.html")]
+
+
+def legacy_process_equipment_item(item_text, section_title, known_uniques, equipment):
+    """The item processing before the single-pass rewrite, kept so the comparison is independent."""
+    item_name = "Unknown"
+    item_type = "Unknown"
+    is_unique = False
+
+    for unique in known_uniques:
+        if unique.lower() in item_text.lower():
+            item_name = unique
+            item_type = "Unique/Legendary"
+            is_unique = True
+            break
+
+    if item_name == "Unknown":
+        numbered_match = re.match(r'\d+\.\s+([A-Z][^\(\)\[\]\{\}\d\n]*?)(?:\s+\(|$|\s+\-)', item_text)
+        if numbered_match:
+            item_name = numbered_match.group(1).strip()
+        else:
+            full_item_match = re.search(r'([A-Z][a-z]+(?:\'s|\s+of|\s+the|\s+[A-Z][a-z]+){1,4})', item_text)
+            if full_item_match:
+                item_name = full_item_match.group(1).strip()
+            else:
+                capitalized_match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,4})', item_text)
+                if capitalized_match:
+                    item_name = capitalized_match.group(1).strip()
+
+        if item_name != "Unknown":
+            item_name = re.sub(r'[\.,:;\s]+$', '', item_name)
+
+        if "aspect" in item_text.lower() or "aspect's" in item_text.lower():
+            item_type = "Legendary Aspect"
+        elif "unique" in section_title.lower() or "uniques" in section_title.lower() or "great uniques" in section_title.lower():
+            item_type = "Unique"
+            is_unique = True
+        elif any(weapon_type in item_text.lower() for weapon_type in ["sword", "axe", "mace", "staff", "wand", "bow", "crossbow", "dagger", "rod"]):
+            item_type = "Weapon"
+        elif any(armor_type in item_text.lower() for armor_type in ["helm", "chest", "gloves", "boots", "pants", "shoulders", "mantle"]):
+            item_type = "Armor"
+        elif any(jewelry_type in item_text.lower() for jewelry_type in ["ring", "amulet", "necklace", "signet", "embrace"]):
+            item_type = "Jewelry"
+
+    category = "Unknown"
+    if "must-have" in section_title.lower():
+        category = "Must Have"
+    elif "nice-to-have" in section_title.lower():
+        category = "Nice to Have"
+    elif "great uniques" in section_title.lower():
+        category = "Great Uniques"
+    elif "jackpot" in section_title.lower():
+        category = "Jackpot"
+    elif "build-defining" in section_title.lower():
+        category = "Build Defining"
+    elif "legendaries & uniques" in section_title.lower():
+        category = "Legendaries & Uniques"
+    else:
+        category = section_title
+
+    common_terms = ["This", "The", "These", "Those", "That", "Each", "Every", "Some", "Your", "Their",
+                    "Build", "Best", "Alternative", "Endgame", "Leveling", "Rock Splitter Thorns", "Thrash"]
+    if item_name in common_terms:
+        return
+
+    if item_name != "Unknown" and len(item_name) > 3 and not item_name.startswith("In the") and not item_name.startswith("With the") and not item_name.startswith("Pit"):
+        if not any(e["name"] == item_name for e in equipment):
+            equipment.append({"name": item_name, "type": item_type, "is_unique": is_unique,
+                              "category": category, "description": item_text})
+
+
+def legacy_extract_equipment(page_source, known_uniques):
+    """The extractor before the single-pass rewrite: several full-tree scans per page."""
+    soup = BeautifulSoup(page_source, 'html.parser')
+    equipment = []
+    great_uniques_text = "Great Uniques for this build"
+
+    great_uniques_elements = [elem for elem in soup.find_all() if elem.string and great_uniques_text in elem.string]
+    for section in great_uniques_elements:
+        parent = section.parent
+        while parent and parent.name not in ['article', 'section', 'div', 'body', 'html']:
+            parent = parent.parent
+        if parent:
+            for ol in parent.find_all('ol'):
+                if ol.sourceline > section.sourceline:
+                    for item in ol.find_all('li'):
+                        item_text = item.text.strip()
+                        match = re.match(r'(?:\d+\.\s+)?(.+)', item_text)
+                        if match:
+                            item_name = re.sub(r'[\u200B-\u200F\uFEFF]', '', match.group(1).strip())
+                            item_type = "Unique"
+                            if "rod" in item_name.lower():
+                                item_type = "Weapon"
+                            elif "harmony" in item_name.lower():
+                                item_type = "Weapon"
+                            elif "ring" in item_name.lower() or "signet" in item_name.lower():
+                                item_type = "Jewelry"
+                            elif "mantle" in item_name.lower() or "embrace" in item_name.lower():
+                                item_type = "Armor"
+                            if not any(e["name"] == item_name for e in equipment):
+                                equipment.append({"name": item_name, "type": item_type, "is_unique": True,
+                                                  "category": "Great Uniques", "description": item_text})
+                    break
+
+    if not equipment:
+        for section in soup.find_all(['h3', 'h4', 'strong'], string=lambda text: text and 'great uniques' in text.lower()):
+            current = getattr(section, 'next_sibling', None)
+            while current and current.name not in ['ul', 'ol', 'h1', 'h2', 'h3']:
+                current = getattr(current, 'next_sibling', None)
+            if current and current.name in ['ul', 'ol']:
+                for item in current.find_all('li'):
+                    legacy_process_equipment_item(item.text.strip(), "Great Uniques", known_uniques, equipment)
+
+    def process_section(section, stop_tags):
+        section_title = section.text.strip()
+        current = getattr(section, 'next_sibling', None)
+        while current and current.name not in stop_tags:
+            if current.name in ['ul', 'ol']:
+                for item in current.find_all('li'):
+                    legacy_process_equipment_item(item.text.strip(), section_title, known_uniques, equipment)
+            elif current.name == 'p' and (current.find('strong') or any(unique.lower() in current.text.lower() for unique in known_uniques)):
+                legacy_process_equipment_item(current.text.strip(), section_title, known_uniques, equipment)
+            current = getattr(current, 'next_sibling', None)
+
+    for section in soup.find_all(['h2', 'h3'], string=lambda text: text and ('legendaries' in text.lower() or 'uniques' in text.lower())):
+        process_section(section, ['h1', 'h2'])
+
+    if not equipment:
+        for section in soup.find_all(['h2', 'h3'], string=lambda text: text and any(keyword in text.lower() for keyword in ['gear', 'equipment', 'items', 'jackpot'])):
+            process_section(section, ['h1', 'h2', 'h3'])
+
+    return equipment
+
+
+def bench(label, extract, pages, runs):
+    """Run an extractor over all pages several times and print the average time per page."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        results = [extract(html) for html in pages]
+    elapsed = (time.perf_counter() - start) / (runs * len(pages))
+    items = sum(len(equipment) for equipment in results)
+    print(f"{label:<26} {items:>5} items  {elapsed * 1000:8.2f} ms/page")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the equipment extractor on recorded build pages")
+    parser.add_argument("pages", nargs="*", default=DEFAULT_PAGES, help="Recorded build page HTML files")
+    parser.add_argument("--runs", type=int, default=20, help="Number of runs per extractor")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    pages = []
+    for path in args.pages:
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append(f.read())
+
+    variants = [
+        ("before (multi-pass)", lambda html: legacy_extract_equipment(html, KNOWN_UNIQUES)),
+        ("after html.parser", lambda html: extract_equipment(html, KNOWN_UNIQUES)),
+    ]
+    if LXML_AVAILABLE:
+        variants += [
+            ("after lxml", lambda html: extract_equipment(html, KNOWN_UNIQUES, parser="lxml")),
+        ]
+    else:
+        print("lxml is not installed, skipping the lxml variants")
+
+    baseline = None
+    for label, extract in variants:
+        results = bench(label, extract, pages, args.runs)
+        if baseline is None:
+            baseline = results
+            continue
+        differing = [path for path, old, new in zip(args.pages, baseline, results) if old != new]
+        for path in differing:
+            print(f"  differs from before: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measure how much a refresh's equipment extraction slows down the rest of the process.
+
+A pipeline run extracts a saved guide page many times (fetches are replaced by
+the page itself, so nothing goes over the network) while the main thread runs a
+short loop that sleeps 1 ms per iteration, standing in for the web server. The
+loop's latency percentiles are printed for extraction in threads and in worker
+processes:
+
+    python scripts/bench_parse_latency.py --builds 40 --processes 1
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrape_pipeline import ScrapePipeline
+from scraper import Scraper
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PAGE = os.path.join(SCRIPT_DIR, "guide_fixture.html")
+
+
+def run_pipeline(processes, html, builds):
+    """Run a pipeline over `builds` copies of a page and return the scraper's results."""
+    scraper = Scraper(cache_dir=None, parse_processes=processes)
+    scraper.fetch_page = lambda url, method: (None, html)
+    entries = [{"url": f"https://maxroll.gg/d4/build-guides/bench-{i}", "title": f"Bench {i}"}
+               for i in range(builds)]
+    return ScrapePipeline(scraper).run_sync(lambda: entries)
+
+
+def measure(label, processes, html, builds):
+    """Print the main-thread loop latency while a pipeline extracts the page."""
+    done = threading.Event()
+    results = []
+
+    def refresh():
+        results.extend(run_pipeline(processes, html, builds))
+        done.set()
+
+    thread = threading.Thread(target=refresh)
+    start = time.perf_counter()
+    thread.start()
+    latencies = []
+    while not done.is_set():
+        tick = time.perf_counter()
+        time.sleep(0.001)
+        latencies.append(time.perf_counter() - tick)
+    thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    items = sum(len(build.get("equipment", [])) for build in results)
+    print(f"{label:<10} {len(results):>4} builds {items:>5} items  {elapsed:6.2f} s  "
+          f"p50 {percentile(0.5):6.1f} ms  p99 {percentile(0.99):6.1f} ms  max {latencies[-1] * 1000:6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure main-thread latency while equipment is extracted")
+    parser.add_argument("--page", default=DEFAULT_PAGE, help="Saved guide page to extract")
+    parser.add_argument("--builds", type=int, default=40, help="Number of builds per run")
+    parser.add_argument("--processes", type=int, default=1, help="Number of extraction processes")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with open(args.page, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    measure("threads", 0, html, args.builds)
+    # Start the shared worker pool first, so its start-up is not counted
+    run_pipeline(args.processes, html, 1)
+    measure("processes", args.processes, html, args.builds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Check that a tier aggregate filled out of order matches one computed from scratch.
+
+A refresh records builds in the order they finish, at their position in the
+dataset, and a partial refresh derives the next aggregate from that one. Both
+must render exactly like TierAggregate(builds) built from the published file:
+
+    python scripts/check_tier_order.py --builds all_builds.json --rounds 20
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tier_list import TierAggregate
+
+
+def same_tiers(aggregate, builds):
+    """Whether an aggregate renders exactly like one computed from the builds."""
+    return json.dumps(aggregate.tiers()) == json.dumps(TierAggregate(builds).tiers())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare out-of-order tier aggregates with full rebuilds")
+    parser.add_argument("--builds", default="all_builds.json", help="Builds file to check")
+    parser.add_argument("--rounds", type=int, default=20, help="Number of shuffled fills and merges")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+
+    with open(args.builds, "r", encoding="utf-8") as f:
+        builds = json.load(f)
+    rng = random.Random(args.seed)
+    failures = 0
+
+    for round_number in range(args.rounds):
+        # Fill in completion order, as a refresh does
+        order = list(range(len(builds)))
+        rng.shuffle(order)
+        aggregate = TierAggregate()
+        for position in order:
+            aggregate.add_build(builds[position], position)
+        if not same_tiers(aggregate, builds):
+            print(f"Round {round_number}: shuffled fill differs from the full rebuild")
+            failures += 1
+            continue
+
+        # Then replace a few builds in place, as BuildStore.merge does
+        merged = list(builds)
+        changes = {}
+        for position in rng.sample(range(len(builds)), min(5, len(builds))):
+            build = copy.deepcopy(builds[position])
+            rng.shuffle(build.get("equipment", []))
+            build["equipment"] = build.get("equipment", [])[:rng.randint(0, len(build.get("equipment", [])))]
+            merged[position] = changes[position] = build
+        updated = aggregate.updated([builds[position] for position in changes], changes)
+        if not same_tiers(updated, merged):
+            print(f"Round {round_number}: merge on top of the shuffled fill differs from the full rebuild")
+            failures += 1
+
+    print(f"{args.rounds - failures} of {args.rounds} rounds match the full rebuild")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
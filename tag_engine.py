@@ -0,0 +1,115 @@
+"""
+Tag extraction for build guide titles.
+
+All tag vocabularies (classes, build types, skills and seasons) are compiled
+into one Aho-Corasick automaton, so a title is tagged in a single scan
+instead of one substring search per vocabulary entry. Matches only count on
+word boundaries ("rend" does not tag "Fleshrender", "owl" does not tag
+"Howl"); a change from lower to upper case counts as a boundary and a plural
+"s" is tolerated, so "ChaosEndgame" tags "endgame" and "Minions" tags
+"minion". Because tagging only needs the title, an existing snapshot can be
+re-tagged without scraping anything.
+"""
+
+from typing import Dict, List, Set, Tuple
+
+from item_matcher import ItemMatcher
+
+# Vocabulary kinds
+KIND_CLASS = "class"
+KIND_BUILD_TYPE = "build_type"
+KIND_SKILL = "skill"
+KIND_SEASON = "season"
+
+
+def _case_break(text: str, position: int) -> bool:
+    """Whether a lower-case letter is directly followed by an upper-case one at this position."""
+    return text[position - 1].islower() and text[position].isupper()
+
+
+class TagEngine:
+    """Compiled matcher over every tag vocabulary."""
+
+    def __init__(self, classes: List[str], build_types: List[str], skill_tags: List[str],
+                 season_tags: Dict[str, List[str]]):
+        """
+        Compile the vocabularies.
+
+        Args:
+            classes: Class names, e.g. "Rogue".
+            build_types: Build type tags in order of precedence.
+            skill_tags: Skill and build style tags.
+            season_tags: Season tag -> the tags it adds, any of which also identifies the season.
+        """
+        self.classes = list(classes)
+        self.build_types = list(build_types)
+        self.skill_tags = list(skill_tags)
+        self.season_tags = {season: list(values) for season, values in season_tags.items()}
+
+        # lower-cased phrase -> the (kind, index) entries it stands for
+        self._phrases: Dict[str, List[Tuple[str, int]]] = {}
+        for index, class_name in enumerate(self.classes):
+            self._add(class_name, KIND_CLASS, index)
+        for index, build_type in enumerate(self.build_types):
+            self._add(build_type, KIND_BUILD_TYPE, index)
+        for index, skill_tag in enumerate(self.skill_tags):
+            self._add(skill_tag, KIND_SKILL, index)
+        for index, (season, values) in enumerate(self.season_tags.items()):
+            for phrase in [season] + values:
+                self._add(phrase, KIND_SEASON, index)
+
+        self._matcher = ItemMatcher(self._phrases)
+
+    def _add(self, phrase: str, kind: str, index: int) -> None:
+        entries = self._phrases.setdefault(phrase.lower(), [])
+        if (kind, index) not in entries:
+            entries.append((kind, index))
+
+    def _matches(self, title: str) -> Set[Tuple[str, int]]:
+        """Return the (kind, index) entries whose phrase occurs on word boundaries."""
+        text = title.lower()
+        # Card text often glues words together ("ChaosEndgameRogue"), so a
+        # lower-to-upper case change in the original title also separates words
+        cased = title if len(title) == len(text) else text
+        found = set()
+        for start, end, phrase in self._matcher.find_all(text):
+            if start > 0 and text[start - 1].isalnum() and not _case_break(cased, start):
+                continue
+            if end < len(text) and text[end].isalnum() and not _case_break(cased, end):
+                # Allow a plural "s"
+                if text[end] != 's' or (end + 1 < len(text) and text[end + 1].isalnum()
+                                        and not _case_break(cased, end + 1)):
+                    continue
+            found.update(self._phrases[phrase])
+        return found
+
+    def analyze(self, title: str) -> Tuple[List[str], List[str]]:
+        """
+        Find the classes and tags of a guide title.
+
+        Args:
+            title: The guide title.
+
+        Returns:
+            A tuple of (class names in vocabulary order, tags). Tags are the first
+            matching build type, the lower-cased classes, the skill tags and the
+            tags of every matching season, each in vocabulary order.
+        """
+        found = self._matches(title)
+        classes = [name for index, name in enumerate(self.classes) if (KIND_CLASS, index) in found]
+
+        tags = []
+        for index, build_type in enumerate(self.build_types):
+            if (KIND_BUILD_TYPE, index) in found:
+                tags.append(build_type)
+                break
+        tags.extend(name.lower() for name in classes)
+        tags.extend(tag for index, tag in enumerate(self.skill_tags) if (KIND_SKILL, index) in found)
+        for index, values in enumerate(self.season_tags.values()):
+            if (KIND_SEASON, index) in found:
+                tags.extend(values)
+        return classes, tags
+
+    def tags(self, title: str) -> List[str]:
+        """Return the tags of a guide title."""
+        return self.analyze(title)[1]
@@ -0,0 +1,239 @@
+"""
+Equipment tier list aggregation.
+
+The aggregate counts how many builds use each unique item and groups the
+items into popularity tiers. It is computed once per dataset version and can
+be updated one build at a time while a refresh is adding builds, or derived
+from the previous version when a partial refresh replaces a few builds, so
+the /tier-list endpoint only has to render the precomputed structure.
+
+Every build is added at a position in the dataset. Each item lists its builds
+in dataset order, and items with the same count are ordered by the first
+build using them, so an aggregate derived from the previous version lists
+everything exactly as one computed from scratch.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Minimum number of builds an item must appear in for each tier
+TIER_THRESHOLDS = {
+    'S': 30,  # Items used in 30+ builds
+    'A': 20,  # Items used in 20-29 builds
+    'B': 10,  # Items used in 10-19 builds
+    'C': 5,   # Items used in 5-9 builds
+    'D': 1    # Items used in 1-4 builds
+}
+
+TIER_NAMES = ['S', 'A', 'B', 'C', 'D']
+
+
+def tier_for_count(count: int) -> str:
+    """Return the tier name for an item used in `count` builds."""
+    for tier in TIER_NAMES[:-1]:
+        if count >= TIER_THRESHOLDS[tier]:
+            return tier
+    return TIER_NAMES[-1]
+
+
+def _build_info(build: Dict[str, Any]) -> Dict[str, str]:
+    """Return the build summary listed under each item."""
+    return {
+        'title': build.get('title', ''),
+        'url': build.get('url', ''),
+        'class': build.get('class', 'Unknown')
+    }
+
+
+def _build_key(build_info: Dict[str, str]) -> Tuple[str, str, str]:
+    return (build_info['title'], build_info['url'], build_info['class'])
+
+
+def _counted_items(build: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (name, item) for each equipment item of a build that counts towards the tiers."""
+    for item in build.get('equipment', []):
+        item_name = item.get('name', '').strip()
+        if not item_name or item_name == 'Unknown':
+            continue
+
+        # Only count unique/legendary items
+        if not item.get('is_unique', False) and not 'unique' in item.get('type', '').lower():
+            continue
+
+        yield item_name, item
+
+
+class TierAggregate:
+    """Incrementally maintained equipment usage counts and tier buckets."""
+
+    def __init__(self, builds: Iterable[Dict[str, Any]] = ()):
+        """
+        Create the aggregate.
+
+        Args:
+            builds: Builds to aggregate initially.
+        """
+        self._counts: Dict[str, int] = {}
+        self._details: Dict[str, Dict[str, Any]] = {}
+        # Per-item build keys already listed, replacing the old list scan. Each maps to
+        # ((dataset position, position among the build's items), the build's item).
+        self._seen_builds: Dict[str, Dict[Tuple[str, str, str], Tuple[Tuple[int, int], Dict[str, Any]]]] = {}
+        # Items whose builds changed since their details were last put in dataset order
+        self._changed: Set[str] = set()
+        self._next_position = 0
+        self._tiers: Optional[Dict[str, List[Dict[str, Any]]]] = None
+
+        for build in builds:
+            self.add_build(build)
+
+    def add_build(self, build: Dict[str, Any], position: Optional[int] = None) -> None:
+        """
+        Add one build's unique equipment to the aggregate.
+
+        Args:
+            build: The build dictionary.
+            position: The build's position in the dataset. Defaults to after every
+                build added so far.
+        """
+        if position is None:
+            position = self._next_position
+        self._next_position = max(self._next_position, position + 1)
+        build_info = _build_info(build)
+        build_key = _build_key(build_info)
+
+        for index, (item_name, item) in enumerate(_counted_items(build)):
+            if item_name not in self._counts:
+                self._counts[item_name] = 0
+                self._details[item_name] = {
+                    'name': item_name,
+                    'type': item.get('type', 'Unknown'),
+                    'category': item.get('category', 'Unknown'),
+                    'description': item.get('description', ''),
+                    'is_unique': item.get('is_unique', False),
+                    'builds': []
+                }
+                self._seen_builds[item_name] = {}
+
+            self._counts[item_name] += 1
+
+            if build_key not in self._seen_builds[item_name]:
+                self._seen_builds[item_name][build_key] = ((position, index), item)
+                self._details[item_name]['builds'].append(build_info)
+                self._changed.add(item_name)
+
+        self._tiers = None
+
+    def remove_build(self, build: Dict[str, Any]) -> None:
+        """
+        Remove a build that was added before, e.g. because a newer version replaces it.
+
+        Args:
+            build: The build dictionary as it was added.
+        """
+        build_key = _build_key(_build_info(build))
+
+        for item_name, _ in _counted_items(build):
+            if item_name not in self._counts:
+                continue
+            self._counts[item_name] -= 1
+            if self._counts[item_name] <= 0:
+                del self._counts[item_name]
+                del self._details[item_name]
+                del self._seen_builds[item_name]
+                self._changed.discard(item_name)
+                continue
+
+            if build_key in self._seen_builds[item_name]:
+                del self._seen_builds[item_name][build_key]
+                details = self._details[item_name]
+                details['builds'] = [info for info in details['builds'] if _build_key(info) != build_key]
+                self._changed.add(item_name)
+
+        self._tiers = None
+
+    def updated(self, removed: Iterable[Dict[str, Any]], added: Dict[int, Dict[str, Any]]) -> "TierAggregate":
+        """
+        Return a new aggregate with some builds removed and others added.
+
+        Only the items of those builds are copied; everything else is shared with
+        this aggregate, which stays unchanged for whoever is still reading it.
+
+        Args:
+            removed: Builds of this aggregate to take out.
+            added: Dataset position -> build to add there, e.g. the new version of
+                a removed build at that build's position.
+
+        Returns:
+            The updated aggregate.
+        """
+        removed = list(removed)
+        self.tiers()
+        aggregate = TierAggregate()
+        aggregate._counts = dict(self._counts)
+        aggregate._details = dict(self._details)
+        aggregate._seen_builds = dict(self._seen_builds)
+        aggregate._next_position = self._next_position
+        for build in removed + list(added.values()):
+            for item_name, _ in _counted_items(build):
+                if item_name in self._details and aggregate._details[item_name] is self._details[item_name]:
+                    details = dict(self._details[item_name])
+                    details['builds'] = list(details['builds'])
+                    aggregate._details[item_name] = details
+                    aggregate._seen_builds[item_name] = dict(self._seen_builds[item_name])
+
+        for build in removed:
+            aggregate.remove_build(build)
+        for position, build in sorted(added.items()):
+            aggregate.add_build(build, position)
+        return aggregate
+
+    def _order_builds(self, item_name: str) -> None:
+        """
+        Put an item's builds in dataset order and take its details from the first
+        of them, as if the aggregate had been computed from scratch.
+        """
+        seen = self._seen_builds[item_name]
+        details = self._details[item_name]
+        details['builds'].sort(key=lambda info: seen[_build_key(info)][0])
+        if details['builds']:
+            item = seen[_build_key(details['builds'][0])][1]
+            details['type'] = item.get('type', 'Unknown')
+            details['category'] = item.get('category', 'Unknown')
+            details['description'] = item.get('description', '')
+            details['is_unique'] = item.get('is_unique', False)
+
+    def _first_position(self, item_name: str) -> Tuple[int, int]:
+        """Position of the item in the first build listing it."""
+        builds = self._details[item_name]['builds']
+        if not builds:
+            # Only counted through builds sharing the key of a removed one
+            return (self._next_position, 0)
+        return self._seen_builds[item_name][_build_key(builds[0])][0]
+
+    @property
+    def total_items(self) -> int:
+        """Number of distinct items in the aggregate."""
+        return len(self._counts)
+
+    def tiers(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the items grouped by tier, most used first within each tier.
+
+        Items with the same count come in the order of the first build using them.
+
+        Returns:
+            A dictionary mapping tier names to lists of {'name', 'count', 'details'}.
+        """
+        if self._tiers is None:
+            for name in self._changed:
+                self._order_builds(name)
+            self._changed.clear()
+            sorted_equipment = sorted(self._counts.items(), key=lambda x: (-x[1], self._first_position(x[0])))
+            tiers: Dict[str, List[Dict[str, Any]]] = {tier: [] for tier in TIER_NAMES}
+            for name, count in sorted_equipment:
+                tiers[tier_for_count(count)].append({
+                    'name': name,
+                    'count': count,
+                    'details': self._details[name]
+                })
+            self._tiers = tiers
+        return self._tiers